@@ -0,0 +1,343 @@
+"""
+Benchmarks por etapa del pipeline de generación.
+
+Mide cada etapa por separado en varios tamaños y reporta filas/segundo y el
+pico de memoria residente (RSS). Cada medición corre en un proceso nuevo para
+que el pico de RSS de una etapa no se mezcle con el de las anteriores.
+
+    python -m benchmarks.suite --salida actual.json
+    python -m benchmarks.suite --salida actual.json --referencia base.json --umbral 0.2
+
+Con --referencia el comando termina con código 1 si alguna etapa bajó su
+rendimiento más que el umbral (fracción) respecto a la referencia, o si la
+sobrecarga de la telemetría (etapa "Telemetria") subió más que
+--umbral-sobrecarga.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+import numpy as np
+
+from medicDataGenerator.medicDataGenerator import (
+    generar_datos_pacientes, guardar_en_csv, generar_signos_vitales, peso_según_edad_genero,
+    edad_ALL, obtener_fake)
+from medicDataGenerator.vectorizado import (
+    generos, generar_generos, generar_edades, generar_pesos, generar_signos_vitales_lote,
+    edad_ALL_lote, iterar_lotes_pacientes)
+from medicDataGenerator.nombres import generar_nombres, cargar_nombres
+from medicDataGenerator.identificadores import generar_uuids
+from medicDataGenerator.escritores import guardar_lotes_en_csv
+from medicDataGenerator.codificacion_csv import codificar_lote
+from medicDataGenerator.telemetria import Telemetria
+
+tamanos_por_defecto = (10_000, 100_000, 1_000_000)
+
+
+def _demografia(filas):
+    rng = np.random.default_rng(0)
+    return rng, generar_generos(filas, rng), generar_edades(filas, rng)
+
+
+# Cada etapa se llama como la función que mide, prepara sus entradas (fuera
+# de la medición) y retorna la función a medir; directorio es una carpeta
+# temporal para las etapas que escriben archivos. Las funciones por lotes
+# tienen al lado su línea base fila a fila (las funciones escalares, Faker,
+# uuid.uuid4, csv.DictWriter), medida con el mismo número de filas.
+def _etapa_generar_datos_pacientes(filas, directorio):
+    return lambda: generar_datos_pacientes(filas, rng=0)
+
+
+def _etapa_generar_signos_vitales_lote(filas, directorio):
+    rng, _, edades = _demografia(filas)
+    return lambda: generar_signos_vitales_lote(edades, rng)
+
+
+def _etapa_generar_signos_vitales(filas, directorio):
+    _, _, edades = _demografia(filas)
+    edades = edades.tolist()
+    return lambda: [generar_signos_vitales(edad, 0) for edad in edades]
+
+
+def _etapa_generar_pesos(filas, directorio):
+    rng, codigos, edades = _demografia(filas)
+    return lambda: generar_pesos(edades, codigos, rng)
+
+
+def _etapa_peso_según_edad_genero(filas, directorio):
+    _, codigos, edades = _demografia(filas)
+    pares = list(zip(edades.tolist(), generos[codigos].tolist()))
+    return lambda: [peso_según_edad_genero(edad, genero) for edad, genero in pares]
+
+
+def _etapa_edad_ALL_lote(filas, directorio):
+    rng = np.random.default_rng(0)
+    return lambda: edad_ALL_lote(filas, rng)
+
+
+def _etapa_edad_ALL(filas, directorio):
+    np.random.seed(0)
+    return lambda: edad_ALL(filas)
+
+
+def _etapa_generar_nombres(filas, directorio):
+    rng, codigos, _ = _demografia(filas)
+    cargar_nombres()
+    return lambda: generar_nombres(codigos, rng)
+
+
+def _etapa_faker_nombres(filas, directorio):
+    # Línea base: nombre (según el género) y apellido de Faker por fila
+    _, codigos, _ = _demografia(filas)
+    fake = obtener_fake()
+    fake.seed_instance(0)
+    codigos = codigos.tolist()
+
+    def nombres():
+        return [(fake.first_name_male() if codigo == 0 else fake.first_name_female(),
+                 fake.last_name()) for codigo in codigos]
+    return nombres
+
+
+def _etapa_generar_uuids(filas, directorio):
+    rng = np.random.default_rng(0)
+    return lambda: generar_uuids(filas, rng)
+
+
+def _etapa_uuid4(filas, directorio):
+    # Línea base: un uuid.uuid4() por fila
+    return lambda: [str(uuid.uuid4()) for _ in range(filas)]
+
+
+def _etapa_guardar_en_csv(filas, directorio):
+    datos = generar_datos_pacientes(filas, rng=0)
+    ruta = os.path.join(directorio, "datos.csv")
+    return lambda: guardar_en_csv(datos, ruta)
+
+
+def _etapa_guardar_lotes_en_csv(filas, directorio):
+    lotes = list(iterar_lotes_pacientes(filas, rng=0))
+    ruta = os.path.join(directorio, "lotes.csv")
+    return lambda: guardar_lotes_en_csv(lotes, ruta)
+
+
+def _etapa_telemetria(filas, directorio):
+    # Generación por lotes de 10000 filas con y sin Telemetria, alternadas para
+    # que las compare el mismo estado de la máquina. La etapa reporta el
+    # tiempo con Telemetria y la sobrecarga (con / sin - 1).
+    cargar_nombres()
+
+    def generar(telemetria):
+        inicio = time.perf_counter()
+        for _ in iterar_lotes_pacientes(filas, 10000, rng=0, fecha_referencia="2025-01-01",
+                                        telemetria=telemetria):
+            pass
+        return time.perf_counter() - inicio
+
+    def medir():
+        sin, con = [], []
+        for _ in range(3):
+            sin.append(generar(None))
+            con.append(generar(Telemetria()))
+        return {"segundos": min(con), "sobrecarga": min(con) / min(sin) - 1}
+    return medir
+
+
+def _etapa_dictwriter(filas, directorio):
+    # Línea base: el guardar_en_csv anterior, fila por fila con csv.DictWriter
+    datos = generar_datos_pacientes(filas, rng=0)
+    filas_dict = list(datos)
+    ruta = os.path.join(directorio, "dictwriter.csv")
+
+    def escribir():
+        with open(ruta, mode='w', newline='', encoding='utf-8') as archivo:
+            writer = csv.DictWriter(archivo, fieldnames=list(filas_dict[0]))
+            writer.writeheader()
+            writer.writerows(filas_dict)
+    return escribir
+
+
+def _etapa_codificar_lote(filas, directorio):
+    lote = next(iterar_lotes_pacientes(filas, filas, rng=0))
+    return lambda: codificar_lote(lote)
+
+
+etapas = {
+    "generar_datos_pacientes": _etapa_generar_datos_pacientes,
+    "generar_signos_vitales_lote": _etapa_generar_signos_vitales_lote,
+    "generar_signos_vitales": _etapa_generar_signos_vitales,
+    "generar_pesos": _etapa_generar_pesos,
+    "peso_según_edad_genero": _etapa_peso_según_edad_genero,
+    "edad_ALL_lote": _etapa_edad_ALL_lote,
+    "edad_ALL": _etapa_edad_ALL,
+    "generar_nombres": _etapa_generar_nombres,
+    "Faker first_name/last_name": _etapa_faker_nombres,
+    "generar_uuids": _etapa_generar_uuids,
+    "uuid.uuid4": _etapa_uuid4,
+    "guardar_en_csv": _etapa_guardar_en_csv,
+    "guardar_lotes_en_csv": _etapa_guardar_lotes_en_csv,
+    "csv.DictWriter": _etapa_dictwriter,
+    "codificar_lote": _etapa_codificar_lote,
+    "Telemetria": _etapa_telemetria,
+}
+
+
+def _rss_pico_mb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def medir_etapa(etapa, filas, repeticiones=1):
+    """
+    Mide una etapa en el proceso actual; retorna un diccionario con el
+    resultado. Si la función de la etapa retorna un diccionario (como
+    "Telemetria"), sus "segundos" reemplazan los medidos y el resto de sus
+    valores se agrega al resultado.
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        funcion = etapas[etapa](filas, directorio)
+        rss_inicial = _rss_pico_mb()
+        mediciones = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            extra = funcion()
+            segundos = time.perf_counter() - inicio
+            extra = dict(extra) if isinstance(extra, dict) else {}
+            mediciones.append((extra.pop("segundos", segundos), extra))
+        segundos, extra = min(mediciones, key=lambda medicion: medicion[0])
+        rss_pico = _rss_pico_mb()
+    return {
+        "etapa": etapa,
+        "filas": filas,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos > 0 else float("inf"),
+        "rss_pico_mb": round(rss_pico, 1),
+        "rss_incremento_mb": round(rss_pico - rss_inicial, 1),
+        **extra,
+    }
+
+
+def ejecutar_suite(nombres_etapas=None, tamanos=tamanos_por_defecto, repeticiones=1,
+                   aislado=True):
+    """
+    Ejecuta las etapas indicadas (todas por defecto) en cada tamaño. Con
+    aislado=True cada medición corre en un proceso nuevo.
+    """
+    nombres_etapas = list(nombres_etapas or etapas)
+    trabajos = [(etapa, filas) for filas in tamanos for etapa in nombres_etapas]
+    if not aislado:
+        resultados = [medir_etapa(etapa, filas, repeticiones) for etapa, filas in trabajos]
+    else:
+        resultados = []
+        contexto = get_context("spawn")
+        for etapa, filas in trabajos:
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+                resultados.append(pool.submit(medir_etapa, etapa, filas, repeticiones).result())
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, referencia, umbral=0.2, umbral_sobrecarga=0.02):
+    """
+    Compara dos ejecuciones de ejecutar_suite y retorna las regresiones: pares
+    (etapa, filas) cuyo rendimiento bajó más de umbral (fracción) respecto a
+    la referencia, o cuya sobrecarga (la de la telemetría) subió más de
+    umbral_sobrecarga; estas últimas tienen la clave "sobrecarga". Las
+    combinaciones que faltan en alguna de las dos se ignoran.
+    """
+    base = {(r["etapa"], r["filas"]): r for r in referencia["resultados"]}
+    regresiones = []
+    for resultado in actual["resultados"]:
+        anterior = base.get((resultado["etapa"], resultado["filas"]))
+        if anterior is None:
+            continue
+        cambio = resultado["filas_por_segundo"] / anterior["filas_por_segundo"] - 1
+        if cambio < -umbral:
+            regresiones.append({
+                "etapa": resultado["etapa"],
+                "filas": resultado["filas"],
+                "filas_por_segundo": resultado["filas_por_segundo"],
+                "referencia": anterior["filas_por_segundo"],
+                "cambio": cambio,
+            })
+        if "sobrecarga" in resultado and "sobrecarga" in anterior:
+            aumento = resultado["sobrecarga"] - anterior["sobrecarga"]
+            if aumento > umbral_sobrecarga:
+                regresiones.append({
+                    "etapa": resultado["etapa"],
+                    "filas": resultado["filas"],
+                    "sobrecarga": resultado["sobrecarga"],
+                    "referencia": anterior["sobrecarga"],
+                    "cambio": aumento,
+                })
+    return regresiones
+
+
+def imprimir(resultados):
+    print(f"{'etapa':<30}{'filas':>10}{'filas/s':>16}{'RSS pico (MB)':>16}")
+    for r in resultados["resultados"]:
+        sobrecarga = f"  sobrecarga {r['sobrecarga']:+.1%}" if "sobrecarga" in r else ""
+        print(f"{r['etapa']:<30}{r['filas']:>10}{r['filas_por_segundo']:>16,.0f}"
+              f"{r['rss_pico_mb']:>16.1f}{sobrecarga}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Benchmarks por etapa del generador.")
+    parser.add_argument("--etapas", nargs="+", choices=list(etapas), default=None)
+    parser.add_argument("--tamanos", nargs="+", type=int, default=list(tamanos_por_defecto))
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--referencia", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="caída máxima de filas/s permitida (por defecto 0.2 = 20%%)")
+    parser.add_argument("--umbral-sobrecarga", type=float, default=0.02,
+                        help="aumento máximo permitido de la sobrecarga de la telemetría "
+                             "(por defecto 0.02 = 2 puntos porcentuales)")
+    parser.add_argument("--en-proceso", action="store_true",
+                        help="medir en el proceso actual en lugar de uno nuevo por medición")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar_suite(args.etapas, args.tamanos, args.repeticiones,
+                                aislado=not args.en_proceso)
+    imprimir(resultados)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.umbral,
+                                   args.umbral_sobrecarga)
+        for r in regresiones:
+            if "sobrecarga" in r:
+                print(f"REGRESIÓN {r['etapa']} ({r['filas']} filas): sobrecarga "
+                      f"{r['sobrecarga']:+.1%} vs {r['referencia']:+.1%}")
+                continue
+            print(f"REGRESIÓN {r['etapa']} ({r['filas']} filas): "
+                  f"{r['filas_por_segundo']:,.0f} filas/s vs {r['referencia']:,.0f} "
+                  f"({r['cambio']:+.0%})")
+        if regresiones:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+import argparse
+import contextlib
+from datetime import date
+
+# Formatos de salida (ver escritores.escritores)
+formatos = ["csv", "parquet", "arrow", "npz"]
+# Compresiones del CSV y su extensión (ver codificacion_csv)
+compresiones = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m medicDataGenerator",
+        description="Genera un conjunto de datos sintético de consultas de pacientes.")
+    parser.add_argument("--rows", type=int, default=100000,
+                        help="número de pacientes a generar (por defecto 100000)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semilla para obtener un resultado reproducible, idéntico byte "
+                             "a byte; sin --reference-date las fechas se cuentan desde hoy, "
+                             "así que el resultado cambia de un día a otro")
+    parser.add_argument("--out", default=None,
+                        help="archivo de salida (por defecto consultas_pacientes.<formato>)")
+    parser.add_argument("--format", choices=formatos, default="csv",
+                        help="formato del archivo de salida (por defecto csv)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="número de procesos de generación (por defecto 1)")
+    parser.add_argument("--batch-size", type=int, default=100000,
+                        help="filas por lote en cada proceso (por defecto 100000)")
+    parser.add_argument("--row-group-size", type=int, default=1_000_000,
+                        help="filas por grupo en parquet y arrow (por defecto 1000000)")
+    parser.add_argument("--reference-date", type=_fecha, default=None,
+                        help="día AAAA-MM-DD desde el que se cuentan las consultas "
+                             "(por defecto hoy)")
+    parser.add_argument("--compression", choices=list(compresiones), default=None,
+                        help="comprimir el CSV con gzip o zstd (agrega .gz o .zst al "
+                             "nombre por defecto)")
+    parser.add_argument("--spec", default=None,
+                        help="especificación JSON o YAML de las columnas (ver especificacion.py); "
+                             "solo con --format csv y un proceso, sin resumen")
+    parser.add_argument("--no-summary", action="store_true",
+                        help="no guardar el resumen <archivo>.resumen.json junto a los datos")
+    parser.add_argument("--metrics", default=None,
+                        help="archivo en el que se escribe una línea JSON de telemetría por lote "
+                             "y una final con el tiempo de cada etapa (ver telemetria.py)")
+    return parser
+
+
+def _fecha(texto):
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {texto!r} (use AAAA-MM-DD)")
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    if args.rows < 0 or args.workers < 1 or args.batch_size < 1 or args.row_group_size < 1:
+        construir_parser().error("--rows debe ser >= 0; --workers, --batch-size y "
+                                 "--row-group-size >= 1")
+    if args.compression and args.format != "csv":
+        construir_parser().error("--compression solo se usa con --format csv")
+    if args.spec and (args.format != "csv" or args.workers != 1):
+        construir_parser().error("--spec solo se usa con --format csv y --workers 1")
+    salida = args.out or f"consultas_pacientes.{args.format}"
+    opciones = {}
+    if args.compression:
+        salida = args.out or salida + compresiones[args.compression]
+        opciones["compresion"] = args.compression
+    if args.format in ("parquet", "arrow"):
+        opciones["filas_por_grupo"] = args.row_group_size
+
+    # Los módulos de generación (NumPy, Faker) se importan solo después de
+    # validar los argumentos, para que --help responda de inmediato.
+    with contextlib.ExitStack() as pila:
+        telemetria = None
+        if args.metrics:
+            from medicDataGenerator.telemetria import Telemetria
+
+            registro = pila.enter_context(open(args.metrics, "w", encoding="utf-8"))
+            telemetria = Telemetria(registro=registro)
+        if args.spec:
+            from medicDataGenerator.especificacion import compilar
+
+            try:
+                plan = compilar(args.spec)
+            except (OSError, ValueError) as error:
+                construir_parser().error(f"especificación inválida: {error}")
+            plan.guardar_csv(args.rows, salida, rng=args.seed, tamano_lote=args.batch_size,
+                             fecha_referencia=args.reference_date, telemetria=telemetria,
+                             **opciones)
+        else:
+            from medicDataGenerator.paralelo import generar_en_paralelo
+
+            generar_en_paralelo(args.rows, salida, semilla=args.seed,
+                                trabajadores=args.workers, tamano_lote=args.batch_size,
+                                fecha_referencia=args.reference_date, formato=args.format,
+                                resumen=not args.no_summary, telemetria=telemetria,
+                                **opciones)
+        if telemetria is not None:
+            telemetria.terminar()
+    print(f"Archivo {args.format.upper()} generado exitosamente.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,541 @@
+"""
+Codificación de CSV por columnas.
+
+csv.writer y csv.DictWriter formatean cada celda con llamadas de Python. Aquí
+cada columna de un lote se convierte de una vez en una matriz de bytes UTF-8
+(una fila por registro, rellenada con ceros): los enteros y los reales se
+pasan a dígitos con aritmética de arreglos, las categorías se codifican una
+sola vez y se copian por índice y los textos se convierten de puntos de
+código a UTF-8 sin recorrerlos. Las matrices de todas las columnas se unen
+con las comas y los fines de línea y se quitan los ceros de relleno, de modo
+que cada lote se escribe con una sola llamada a write. codificar_ndjson
+arma de la misma forma una línea JSON por fila.
+
+El resultado es idéntico byte a byte al de csv.writer con sus opciones por
+defecto (comillas mínimas y fin de línea "\\r\\n"): los reales sin decimales
+indicados se escriben como repr(), con un camino rápido cuando ya están
+redondeados a un decimal (Altura, Peso, Temperatura...).
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+
+from medicDataGenerator.telemetria import medidor
+
+# Compresiones según la extensión del archivo
+extensiones_compresion = {".gz": "gzip", ".zst": "zstd"}
+fin_de_linea = b"\r\n"
+
+# Bytes que obligan a poner comillas (QUOTE_MINIMAL de csv.writer)
+_especiales = np.frombuffer(b',"\r\n', dtype=np.uint8)
+# Filas que se arman juntas en codificar_lote
+_filas_por_bloque = 1024
+_potencias = np.array([10 ** k for k in range(20)], dtype=np.uint64)
+# Prefijo del primer byte UTF-8 según el número de bytes del carácter
+_prefijos_utf8 = np.array([0, 0, 0xC0, 0xE0, 0xF0], dtype=np.uint32)
+
+
+# -----------------------------
+# Columnas -> matrices de bytes
+# -----------------------------
+# Cada columna se convierte en una matriz uint8 (n, ancho) con el texto de
+# cada valor y ceros de relleno (al final o intercalados); los ceros se
+# quitan al armar el lote. Un campo CSV nunca contiene el byte 0.
+
+def _digitos(absoluto, negativo, decimales=0):
+    """
+    Texto de absoluto / 10**decimales con exactamente decimales cifras
+    decimales (y '-' donde negativo), como matriz de bytes.
+    """
+    n = len(absoluto)
+    negativo = negativo.astype(np.int64)
+    entero = absoluto // _potencias[decimales]
+    cifras = 1 + np.searchsorted(_potencias[1:], entero, side="right")
+    longitudes = negativo + cifras + (decimales + 1 if decimales else 0)
+    matriz = np.zeros((n, int(longitudes.max()) if n else 0), dtype=np.uint8)
+    for j in range(matriz.shape[1]):
+        posicion = j - negativo  # posición dentro del número, sin el signo
+        exponente = cifras + decimales - posicion - (posicion < cifras)
+        digito = (absoluto // _potencias[np.clip(exponente, 0, 19)]) % 10
+        caracter = np.where(posicion == cifras, ord("."), digito + ord("0"))
+        matriz[:, j] = np.where(j < longitudes, caracter, 0)
+    matriz[negativo.astype(bool), 0] = ord("-")
+    return matriz
+
+
+def _con_tabla(enteros, formatear, rango_maximo=1 << 16):
+    """
+    Para valores enteros de rango pequeño (edades, décimas, días) formatea
+    una sola vez cada valor del rango con formatear y copia las filas por
+    índice; si el rango es más grande, formatea todos los valores.
+    """
+    if len(enteros):
+        minimo, maximo = int(enteros.min()), int(enteros.max())
+        if maximo - minimo < rango_maximo:
+            tabla = _recortar(formatear(np.arange(minimo, maximo + 1, dtype=np.int64)))
+            return tabla[enteros - minimo]
+    return formatear(enteros)
+
+
+def _recortar(tabla):
+    """Quita las columnas de relleno que sobran al final de una tabla pequeña."""
+    usadas = np.flatnonzero(tabla.any(axis=0))
+    return tabla[:, :usadas[-1] + 1 if len(usadas) else 0]
+
+
+def _enteros(valores, decimales=0):
+    return _digitos(np.abs(valores).view(np.uint64), valores < 0, decimales)
+
+
+def _codificar_reales(valores, decimales=None):
+    valores = np.asarray(valores, dtype=np.float64)
+    if decimales is None:
+        # repr() de un real redondeado a un decimal tiene siempre un decimal
+        finitos = np.isfinite(valores).all() and (np.abs(valores) < 1e15).all()
+        if not (finitos and (np.round(valores, 1) == valores).all()):
+            return _codificar_textos(np.array([repr(v) for v in valores.tolist()], dtype=str))
+        decimales = 1
+    escalados = np.rint(valores * 10.0 ** decimales).astype(np.int64)
+    if np.signbit(valores[escalados == 0]).any():
+        # -0.0 se escribe con signo: no cabe en la tabla por valor entero
+        return _digitos(np.abs(escalados).view(np.uint64), np.signbit(valores), decimales)
+    return _con_tabla(escalados, lambda enteros: _enteros(enteros, decimales))
+
+
+def _codificar_fechas(valores):
+    from medicDataGenerator.vectorizado import formatear_fechas
+
+    def formatear(dias):
+        return _codificar_textos(formatear_fechas(dias.astype("datetime64[D]")))
+
+    return _con_tabla(np.asarray(valores, dtype="datetime64[D]").astype(np.int64), formatear)
+
+
+def _utf8(puntos):
+    """
+    UTF-8 de una matriz de puntos de código: cada carácter ocupa tantas
+    posiciones como bytes tenga el más largo, con ceros en las que sobran.
+    """
+    if puntos.max() < 0x800:
+        # Caso habitual (letras con tilde, ñ): uno o dos bytes por carácter
+        ascii = puntos < 0x80
+        matriz = np.empty(puntos.shape + (2,), dtype=np.uint8)
+        matriz[..., 0] = np.where(ascii, puntos, 0xC0 | (puntos >> 6))
+        matriz[..., 1] = np.where(ascii, 0, 0x80 | (puntos & 0x3F))
+        return matriz.reshape(len(puntos), -1)
+    bytes_por_caracter = (1 + (puntos >= 0x80).astype(np.uint32) + (puntos >= 0x800)
+                          + (puntos >= 0x10000))
+    matriz = np.empty(puntos.shape + (4,), dtype=np.uint8)
+    for k in range(4):
+        # Bits del byte k: los 6 que le tocan (o todos los restantes en el primero)
+        restantes = np.maximum(bytes_por_caracter, k + 1) - np.uint32(1 + k)
+        bits = puntos >> (6 * restantes)
+        if k == 0:
+            matriz[..., 0] = _prefijos_utf8[bytes_por_caracter] | bits
+        else:
+            matriz[..., k] = np.where(bytes_por_caracter > k, 0x80 | (bits & 0x3F), 0)
+    return matriz.reshape(len(puntos), -1)
+
+
+def _entre_comillas(texto):
+    return '"' + texto.replace('"', '""') + '"'
+
+
+def _filas_con_comillas(matriz):
+    """Filas que contienen algún byte especial (None si no hay ninguna)."""
+    if not any((matriz == especial).any() for especial in _especiales):
+        return None
+    return np.isin(matriz, _especiales).any(axis=1)
+
+
+def _codificar_textos(valores, revisar_comillas=True):
+    valores = np.ascontiguousarray(valores)
+    if valores.dtype.kind != "U":
+        valores = valores.astype(str)
+    puntos = valores.view(np.uint32).reshape(len(valores), valores.dtype.itemsize // 4)
+    if puntos.size and puntos.max() >= 0x80:
+        matriz = _utf8(puntos)
+    else:
+        matriz = puntos.astype(np.uint8)  # ASCII: cada punto de código es un byte
+    # Los caracteres especiales son ASCII: en UTF-8 aparecen como el mismo byte
+    filas = _filas_con_comillas(matriz) if revisar_comillas and matriz.size else None
+    if filas is not None:
+        objetos = valores.astype(object)
+        objetos[filas] = [_entre_comillas(v) for v in objetos[filas]]
+        return _codificar_textos(objetos.astype(str), revisar_comillas=False)
+    return matriz
+
+
+def _codificar_bytes(valores):
+    # Texto ya codificado en UTF-8: los bytes se usan tal cual
+    valores = np.ascontiguousarray(valores)
+    matriz = valores.view(np.uint8).reshape(len(valores), valores.dtype.itemsize)
+    if matriz.size and _filas_con_comillas(matriz) is not None:
+        return _codificar_textos(np.char.decode(valores, "utf-8"))
+    return matriz
+
+
+def tabla_categorias(categorias):
+    """Matriz de bytes de cada categoría, para copiarla por código."""
+    return _recortar(_codificar_textos(np.asarray(categorias)))
+
+
+def _texto_csv(valor):
+    # Las mismas conversiones de csv.writer: None -> '', float -> repr, resto -> str
+    if valor is None:
+        return ""
+    return repr(valor) if isinstance(valor, float) else str(valor)
+
+
+def codificar_columna(valores, decimales=None, categorias=None):
+    """
+    Convierte una columna en una matriz uint8 de forma (n, ancho): la fila i
+    tiene el texto CSV (UTF-8, con comillas si hacen falta) del valor i y
+    ceros de relleno. decimales fija las cifras decimales de una columna
+    real. Si valores son códigos enteros de una columna categórica,
+    categorias (arreglo de valores posibles) da el texto de cada código:
+    cada categoría se codifica una vez y sus bytes se copian por índice. Un
+    arreglo de bytes (dtype 'S') se toma como texto ya codificado en UTF-8.
+    """
+    valores = np.asarray(valores)
+    tipo = valores.dtype.kind
+    if categorias is not None and tipo in "iu":
+        return tabla_categorias(categorias)[valores]
+    if tipo == "b":
+        return tabla_categorias(["False", "True"])[valores.astype(np.intp)]
+    if tipo in "iu":
+        return _con_tabla(valores.astype(np.int64), _enteros)
+    if tipo == "f":
+        return _codificar_reales(valores, decimales)
+    if tipo == "M":
+        return _codificar_fechas(valores)
+    if tipo == "U":
+        return _codificar_textos(valores)
+    if tipo == "S":
+        return _codificar_bytes(valores)
+    return _codificar_textos(np.array([_texto_csv(v) for v in valores.tolist()], dtype=str))
+
+
+def _unir_filas(partes, n, con_inicios=False):
+    # Por bloques de filas que caben en caché: las matrices lado a lado y sin
+    # los ceros de relleno quedan como las filas seguidas
+    trozos, largos = [], []
+    for desde in range(0, n, _filas_por_bloque):
+        filas = np.concatenate([parte[desde:desde + _filas_por_bloque] for parte in partes], axis=1)
+        trozos.append(filas.tobytes().translate(None, b"\0"))
+        if con_inicios:
+            largos.append(np.count_nonzero(filas, axis=1))
+    bufer = b"".join(trozos)
+    if not con_inicios:
+        return bufer
+    inicios = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        np.cumsum(np.concatenate(largos), out=inicios[1:])
+    return bufer, inicios
+
+
+def _constante(texto, n):
+    return np.broadcast_to(np.frombuffer(texto, dtype=np.uint8), (n, len(texto)))
+
+
+def codificar_lote(lote, columnas=None, decimales=None, categorias=None, con_inicios=False):
+    """
+    Filas CSV de un lote {columna: arreglo}, como bytes. Con con_inicios=True
+    retorna además inicios, con inicios[i] la posición de la fila i e
+    inicios[-1] el largo total, para repartir las filas sin volver a
+    codificarlas.
+    """
+    columnas = list(lote) if columnas is None else columnas
+    decimales, categorias = decimales or {}, categorias or {}
+    n = len(lote[columnas[0]]) if columnas else 0
+    partes = []
+    for campo in columnas:
+        partes.append(codificar_columna(lote[campo], decimales.get(campo), categorias.get(campo)))
+        partes.append(_constante(b",", n))
+    if len(columnas) == 1:
+        # csv.writer escribe '""' para una fila con un único campo vacío
+        vacios = ~partes[0].any(axis=1)
+        if vacios.any():
+            partes[0] = np.pad(partes[0], ((0, 0), (0, max(0, 2 - partes[0].shape[1]))))
+            partes[0][vacios, :2] = ord('"')
+    partes[-1:] = [_constante(fin_de_linea, n)]
+    return _unir_filas(partes, n, con_inicios)
+
+
+# -----------------------------
+# NDJSON
+# -----------------------------
+def _escapar_json(matriz, valores):
+    # Comillas, barras invertidas y caracteres de control necesitan escape en JSON
+    escapar = ((matriz == ord('"')) | (matriz == ord("\\")) | ((matriz < 0x20) & (matriz != 0)))
+    filas = escapar.any(axis=1)
+    if not filas.any():
+        return matriz
+    objetos = valores.astype(object)
+    objetos[filas] = [json.dumps(v, ensure_ascii=False)[1:-1] for v in objetos[filas]]
+    return _codificar_textos(objetos.astype(str), revisar_comillas=False)
+
+
+def codificar_columna_json(valores, categorias=None):
+    """Como codificar_columna, pero con el valor JSON de cada fila."""
+    valores = np.asarray(valores)
+    tipo = valores.dtype.kind
+    if categorias is not None and tipo in "iu":
+        textos = [json.dumps(str(c), ensure_ascii=False) for c in categorias]
+        return _recortar(_codificar_textos(np.array(textos), revisar_comillas=False))[valores]
+    if tipo == "b":
+        return tabla_categorias(["false", "true"])[valores.astype(np.intp)]
+    if tipo in "iuf":
+        # Los números no llevan comillas en CSV: el texto es el mismo
+        return codificar_columna(valores)
+    if tipo == "M":
+        matriz = _codificar_fechas(valores)
+    elif tipo == "S":
+        valores = np.char.decode(valores, "utf-8")
+        matriz = _escapar_json(_codificar_textos(valores, revisar_comillas=False), valores)
+    elif tipo == "U":
+        matriz = _escapar_json(_codificar_textos(valores, revisar_comillas=False), valores)
+    else:
+        textos = [json.dumps(v, ensure_ascii=False) for v in valores.tolist()]
+        return _codificar_textos(np.array(textos, dtype=str), revisar_comillas=False)
+    comillas = _constante(b'"', len(valores))
+    return np.concatenate([comillas, matriz, comillas], axis=1)
+
+
+def codificar_ndjson(lote, columnas=None, categorias=None):
+    """
+    Un objeto JSON por fila ({columna: valor}, en el orden de columnas),
+    separados por saltos de línea, igual que json.dumps(fila,
+    ensure_ascii=False) con las fechas como texto ISO.
+    """
+    columnas = list(lote) if columnas is None else columnas
+    categorias = categorias or {}
+    n = len(lote[columnas[0]]) if columnas else 0
+    partes = []
+    for i, campo in enumerate(columnas):
+        clave = json.dumps(campo, ensure_ascii=False).encode("utf-8")
+        partes.append(_constante((b"{" if i == 0 else b", ") + clave + b": ", n))
+        partes.append(codificar_columna_json(lote[campo], categorias.get(campo)))
+    partes.append(_constante(b"}\n" if columnas else b"{}\n", n))
+    return _unir_filas(partes, n)
+
+
+def encabezado(columnas):
+    """Línea de encabezado, escrita con csv.writer para conservar sus comillas."""
+    texto = io.StringIO()
+    csv.writer(texto).writerow(columnas)
+    return texto.getvalue().encode("utf-8")
+
+
+def columnas_desde_filas(filas, campos):
+    """
+    Convierte una lista de diccionarios en {campo: arreglo}. Una columna cuyos
+    valores no son todos int, todos float o todos str queda como arreglo de
+    objetos y se escribe con las conversiones de csv.writer.
+    """
+    if not filas:
+        return {campo: np.array([], dtype=str) for campo in campos}
+    valores = zip(*map(itemgetter(*campos), filas)) if len(campos) > 1 \
+        else [[fila[campos[0]] for fila in filas]]
+    columnas = {}
+    for campo, columna in zip(campos, valores):
+        tipos = set(map(type, columna))
+        tipo = {int: np.int64, float: np.float64, str: str}.get(tipos.pop()) \
+            if len(tipos) == 1 else None
+        try:
+            columnas[campo] = np.array(columna, dtype=tipo or object)
+        except OverflowError:
+            columnas[campo] = np.array(columna, dtype=object)
+    return columnas
+
+
+# -----------------------------
+# Archivos
+# -----------------------------
+def separar_extension(nombre_archivo):
+    """('datos', '.csv.gz') para 'datos.csv.gz': la extensión incluye la de compresión."""
+    raiz, extension = os.path.splitext(nombre_archivo)
+    if extension.lower() in extensiones_compresion:
+        raiz, interna = os.path.splitext(raiz)
+        extension = interna + extension
+    return raiz, extension
+
+
+def compresion_de(nombre_archivo):
+    """Compresión que corresponde a la extensión del archivo (None si no tiene)."""
+    return extensiones_compresion.get(os.path.splitext(nombre_archivo)[1].lower())
+
+
+def _importar_zstandard():
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError("La compresión zstd requiere zstandard "
+                          "(pip install zstandard)") from error
+    return zstandard
+
+
+class ArchivoConHuella(io.RawIOBase):
+    """Archivo binario que agrega a huella (un hashlib) los bytes que se escriben en él."""
+
+    def __init__(self, archivo, huella):
+        self.archivo, self.huella = archivo, huella
+        self.name = archivo.name
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self.huella.update(datos)
+        return self.archivo.write(datos)
+
+    def flush(self):
+        self.archivo.flush()
+
+    def close(self):
+        if not self.closed:
+            try:
+                super().close()
+            finally:
+                self.archivo.close()
+
+
+def abrir_salida(nombre_archivo, compresion=None, nivel=None, anexar=False, huella=None):
+    """
+    Abre nombre_archivo para escribir bytes, con compresión "gzip" o "zstd"
+    (por defecto la que indique la extensión: .gz o .zst). Con anexar=True
+    se escribe al final del archivo; en los comprimidos se agrega un miembro
+    (o marco) nuevo, que los lectores leen a continuación de los anteriores.
+    huella (por ejemplo hashlib.sha256()) recibe los bytes que llegan al
+    disco, ya comprimidos, sin volver a leer el archivo.
+    """
+    compresion = compresion or compresion_de(nombre_archivo)
+    modo = "ab" if anexar else "wb"
+    if compresion not in (None, "gzip", "zstd"):
+        raise ValueError(f"compresión desconocida: {compresion!r} "
+                         f"(opciones: {', '.join(extensiones_compresion.values())})")
+    destino = open(nombre_archivo, modo, buffering=1 << 20)
+    if huella is not None:
+        destino = ArchivoConHuella(destino, huella)
+    if compresion is None:
+        return destino
+    if compresion == "gzip":
+        # mtime=0: el encabezado no lleva la hora, así la salida de una misma
+        # semilla es idéntica byte a byte
+        archivo = gzip.GzipFile(nombre_archivo, modo, 6 if nivel is None else nivel,
+                                fileobj=destino, mtime=0)
+        # Como en gzip.open: al cerrar el GzipFile se cierra también el archivo
+        archivo.myfileobj = destino
+        return archivo
+    if compresion == "zstd":
+        zstandard = _importar_zstandard()
+        compresor = zstandard.ZstdCompressor(level=3 if nivel is None else nivel)
+        return compresor.stream_writer(destino)
+
+
+def abrir_entrada(nombre_archivo, compresion=None):
+    """Abre para leer bytes un archivo escrito con abrir_salida."""
+    compresion = compresion or compresion_de(nombre_archivo)
+    if compresion is None:
+        return open(nombre_archivo, "rb")
+    if compresion == "gzip":
+        return gzip.open(nombre_archivo, "rb")
+    if compresion == "zstd":
+        lector = _importar_zstandard().ZstdDecompressor().stream_reader(open(nombre_archivo, "rb"))
+        return io.BufferedReader(lector)
+    raise ValueError(f"compresión desconocida: {compresion!r} "
+                     f"(opciones: {', '.join(extensiones_compresion.values())})")
+
+
+def ruta_fragmento(nombre_archivo, indice):
+    raiz, extension = separar_extension(nombre_archivo)
+    return f"{raiz}.fragmento-{indice:04d}{extension}"
+
+
+def escribir_csv(lotes, nombre_archivo, columnas=None, decimales=None, categorias=None,
+                 compresion=None, nivel=None, fragmentos=1, anexar=False, telemetria=None,
+                 huella=None):
+    """
+    Escribe en CSV los lotes de columnas {columna: arreglo} a medida que
+    llegan, codificando cada lote entero con codificar_lote. columnas fija el
+    orden (por defecto el del primer lote); decimales y categorias se pasan a
+    codificar_columna por columna. compresion ("gzip", "zstd" o None = según
+    la extensión) y nivel se pasan a abrir_salida.
+
+    Cada lote se escribe (y comprime) en un hilo mientras se codifica el
+    siguiente; zlib y zstd liberan el GIL. Con fragmentos > 1 se escriben a
+    la vez fragmentos archivos <raiz>.fragmento-NNNN<ext>, cada uno con su
+    encabezado y una parte igual de las filas de cada lote. Con anexar=True
+    las filas se agregan al final de los archivos, que solo llevan encabezado
+    si no existían o estaban vacíos. huella (un hashlib, solo con un
+    archivo) recibe los bytes escritos, con anexar=True solo los agregados:
+    guardar_resumen la usa en lugar de volver a leer el archivo. Con una telemetria se miden las etapas
+    "codificar" y "escribir" (esta, sumada entre los hilos, incluye la
+    compresión). Retorna el número de filas escritas.
+    """
+    if fragmentos < 1:
+        raise ValueError("fragmentos debe ser >= 1")
+    if huella is not None and fragmentos > 1:
+        raise ValueError("huella solo se calcula al escribir un solo archivo")
+    rutas = ([nombre_archivo] if fragmentos == 1
+             else [ruta_fragmento(nombre_archivo, i) for i in range(fragmentos)])
+    lotes = iter(lotes)
+    primero = next(lotes, None)
+    if columnas is None:
+        columnas = list(primero) if primero is not None else []
+    lotes = itertools.chain([primero] if primero is not None else [], lotes)
+    con_encabezado = [not anexar or not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+                      for ruta in rutas]
+    archivos = [abrir_salida(ruta, compresion, nivel, anexar, huella) for ruta in rutas]
+    medir = medidor(telemetria)
+    escribir = _escribir if telemetria is None else _escribir_midiendo
+    filas = pendientes_filas = 0
+    try:
+        with ThreadPoolExecutor(max_workers=fragmentos) as hilos:
+            pendientes = [hilos.submit(escribir, archivo, encabezado(columnas))
+                          for archivo, nuevo in zip(archivos, con_encabezado) if nuevo]
+            for lote in lotes:
+                n = len(lote[columnas[0]]) if columnas else 0
+                with medir("codificar", n):
+                    if fragmentos == 1:
+                        trozos = [codificar_lote(lote, columnas, decimales, categorias)]
+                    else:
+                        bufer, inicios = codificar_lote(lote, columnas, decimales, categorias,
+                                                        con_inicios=True)
+                        cortes = inicios[[n * i // fragmentos for i in range(fragmentos + 1)]]
+                        vista = memoryview(bufer)
+                        trozos = [vista[desde:hasta] for desde, hasta in zip(cortes, cortes[1:])]
+                _esperar(pendientes, telemetria, pendientes_filas)
+                pendientes = [hilos.submit(escribir, archivo, trozo)
+                              for archivo, trozo in zip(archivos, trozos)]
+                filas += n
+                pendientes_filas = n
+            _esperar(pendientes, telemetria, pendientes_filas)
+    finally:
+        for archivo in archivos:
+            archivo.close()
+    return filas
+
+
+def _escribir(archivo, datos):
+    archivo.write(datos)
+
+
+def _escribir_midiendo(archivo, datos):
+    inicio = time.perf_counter()
+    archivo.write(datos)
+    return time.perf_counter() - inicio
+
+
+def _esperar(pendientes, telemetria, filas):
+    segundos = sum(futuro.result() or 0.0 for futuro in pendientes)
+    if telemetria is not None and pendientes:
+        telemetria.agregar("escribir", segundos, filas)
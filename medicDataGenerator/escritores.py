@@ -0,0 +1,254 @@
+import hashlib
+import zipfile
+
+import numpy as np
+
+from medicDataGenerator.vectorizado import (
+    columnas_pacientes, categorias_pacientes, columnas_enteras, columnas_reales,
+    columnas_fecha, codificar_categoria)
+from medicDataGenerator.resumen import (
+    ResumenPacientes, lotes_con_resumen, guardar_resumen, resumen_anterior)
+from medicDataGenerator.codificacion_csv import escribir_csv
+from medicDataGenerator.telemetria import lotes_medidos
+
+
+def guardar_lotes_en_csv(lotes, nombre_archivo="consultas_pacientes.csv", compresion=None,
+                         fragmentos=1, telemetria=None, huella=None, anexar=False):
+    """
+    Escribe en CSV los lotes de columnas producidos por iterar_lotes_pacientes
+    a medida que llegan, sin acumularlos en memoria. Retorna el número de filas
+    escritas. El archivo tiene el mismo encabezado que guardar_en_csv y cada
+    lote se codifica por columnas (ver codificacion_csv), con el mismo
+    resultado que csv.writer. compresion ("gzip" o "zstd", por defecto según
+    la extensión .gz o .zst), fragmentos, telemetria, huella y anexar se
+    pasan a escribir_csv.
+    """
+    return escribir_csv(lotes, nombre_archivo, columnas_pacientes,
+                        categorias=categorias_pacientes, compresion=compresion,
+                        fragmentos=fragmentos, telemetria=telemetria, huella=huella,
+                        anexar=anexar)
+
+
+# -----------------------------
+# Parquet y Arrow IPC (requieren pyarrow)
+# -----------------------------
+def _importar_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("Los formatos parquet y arrow requieren pyarrow "
+                          "(pip install pyarrow)") from error
+    return pyarrow
+
+
+def esquema_arrow():
+    """
+    Esquema Arrow de los datos: las columnas categóricas van codificadas como
+    diccionario y las fechas como date32.
+    """
+    pa = _importar_pyarrow()
+    campos = []
+    for campo in columnas_pacientes:
+        if campo in categorias_pacientes:
+            tipo = pa.dictionary(pa.int8(), pa.string())
+        elif campo in columnas_enteras:
+            tipo = pa.int64()
+        elif campo in columnas_reales:
+            tipo = pa.float64()
+        elif campo in columnas_fecha:
+            tipo = pa.date32()
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(campo, tipo))
+    return pa.schema(campos)
+
+
+def _tabla_arrow(lote, esquema):
+    pa = _importar_pyarrow()
+    arreglos = []
+    for campo in esquema:
+        valores = lote[campo.name]
+        if campo.name in categorias_pacientes:
+            # Diccionario fijo (el mismo en todos los lotes), índices = códigos
+            categorias = categorias_pacientes[campo.name]
+            arreglos.append(pa.DictionaryArray.from_arrays(
+                pa.array(codificar_categoria(valores, categorias), pa.int8()),
+                pa.array(categorias, pa.string())))
+        else:
+            arreglos.append(pa.array(valores, campo.type))
+    return pa.Table.from_arrays(arreglos, schema=esquema)
+
+
+def _reagrupar(lotes, esquema, filas_por_grupo):
+    """Convierte los lotes en tablas Arrow de exactamente filas_por_grupo filas (salvo la última)."""
+    pa = _importar_pyarrow()
+    pendientes, en_espera = [], 0
+    for lote in lotes:
+        tabla = _tabla_arrow(lote, esquema)
+        pendientes.append(tabla)
+        en_espera += tabla.num_rows
+        while en_espera >= filas_por_grupo:
+            tabla = pa.concat_tables(pendientes)
+            yield tabla.slice(0, filas_por_grupo)
+            pendientes = [tabla.slice(filas_por_grupo)]
+            en_espera -= filas_por_grupo
+    if en_espera:
+        yield pa.concat_tables(pendientes)
+
+
+def guardar_lotes_en_parquet(lotes, nombre_archivo="consultas_pacientes.parquet",
+                             filas_por_grupo=1_000_000, compresion="zstd"):
+    """
+    Escribe los lotes en un archivo Parquet con grupos de filas_por_grupo
+    filas, independientemente del tamaño de los lotes de entrada. Retorna el
+    número de filas escritas.
+    """
+    import pyarrow.parquet as pq
+
+    esquema = esquema_arrow()
+    filas = 0
+    with pq.ParquetWriter(nombre_archivo, esquema, compression=compresion) as escritor:
+        for tabla in _reagrupar(lotes, esquema, filas_por_grupo):
+            escritor.write_table(tabla, row_group_size=filas_por_grupo)
+            filas += tabla.num_rows
+    return filas
+
+
+def guardar_lotes_en_arrow(lotes, nombre_archivo="consultas_pacientes.arrow",
+                           filas_por_grupo=1_000_000):
+    """Escribe los lotes en un archivo Arrow IPC con record batches de filas_por_grupo filas."""
+    pa = _importar_pyarrow()
+    esquema = esquema_arrow()
+    filas = 0
+    with pa.OSFile(nombre_archivo, 'wb') as destino, pa.ipc.new_file(destino, esquema) as escritor:
+        for tabla in _reagrupar(lotes, esquema, filas_por_grupo):
+            escritor.write_table(tabla, max_chunksize=filas_por_grupo)
+            filas += tabla.num_rows
+    return filas
+
+
+def _columnas_desde_arrow(tabla):
+    lote = {}
+    for campo in columnas_pacientes:
+        columna = tabla.column(campo)
+        if campo in categorias_pacientes:
+            codigos = columna.combine_chunks().indices.to_numpy(zero_copy_only=False)
+            lote[campo] = categorias_pacientes[campo][codigos]
+        elif campo in columnas_enteras or campo in columnas_reales:
+            lote[campo] = columna.to_numpy()
+        elif campo in columnas_fecha:
+            lote[campo] = columna.to_numpy(zero_copy_only=False).astype("datetime64[D]")
+        else:
+            lote[campo] = columna.to_numpy(zero_copy_only=False).astype(str)
+    return lote
+
+
+# -----------------------------
+# NPZ comprimido
+# -----------------------------
+def guardar_lotes_en_npz(lotes, nombre_archivo="consultas_pacientes.npz"):
+    """
+    Escribe los lotes en un NPZ comprimido sin juntarlos en memoria: cada lote
+    queda en sus propios miembros "lote_NNNNNN/<columna>" y las columnas
+    categóricas se guardan como códigos int8, con sus valores en
+    "categorias/<columna>"; las fechas quedan como datetime64[D]. Se lee de vuelta con leer_lotes_npz.
+    """
+    filas = 0
+    with zipfile.ZipFile(nombre_archivo, 'w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        def escribir(nombre, arreglo):
+            with archivo.open(nombre + ".npy", 'w', force_zip64=True) as miembro:
+                np.lib.format.write_array(miembro, np.ascontiguousarray(arreglo),
+                                          allow_pickle=False)
+
+        for campo, categorias in categorias_pacientes.items():
+            escribir(f"categorias/{campo}", categorias)
+        for k, lote in enumerate(lotes):
+            for campo in columnas_pacientes:
+                valores = lote[campo]
+                if campo in categorias_pacientes:
+                    valores = codificar_categoria(valores, categorias_pacientes[campo])
+                escribir(f"lote_{k:06d}/{campo}", valores)
+            filas += len(lote[columnas_pacientes[0]])
+    return filas
+
+
+def leer_lotes_npz(nombre_archivo):
+    with np.load(nombre_archivo, allow_pickle=False) as archivo:
+        lotes = sorted({clave.split("/")[0] for clave in archivo.files
+                        if clave.startswith("lote_")})
+        categorias = {campo: archivo[f"categorias/{campo}"] for campo in categorias_pacientes}
+        for nombre_lote in lotes:
+            lote = {campo: archivo[f"{nombre_lote}/{campo}"] for campo in columnas_pacientes}
+            for campo, valores in categorias.items():
+                lote[campo] = valores[lote[campo]]
+            yield lote
+
+
+# -----------------------------
+# Registro de formatos
+# -----------------------------
+escritores = {
+    "csv": guardar_lotes_en_csv,
+    "parquet": guardar_lotes_en_parquet,
+    "arrow": guardar_lotes_en_arrow,
+    "npz": guardar_lotes_en_npz,
+}
+
+
+def guardar_lotes(lotes, nombre_archivo, formato="csv", resumen=True, parametros=None,
+                  telemetria=None, semilla_resumen=0, **opciones):
+    """
+    Escribe los lotes con el escritor registrado para formato; retorna las
+    filas escritas. Con resumen=True el resumen de los datos se acumula
+    mientras se escriben y se guarda en <archivo>.resumen.json, junto con
+    los parametros de generación (ver resumen.guardar_resumen). El CSV
+    calcula el sha256 del resumen mientras se escribe; los demás formatos se
+    vuelven a leer. semilla_resumen es la de las claves de la muestra del
+    resumen: las partes de un mismo conjunto deben usar semillas distintas
+    para que combinar() muestree de forma uniforme. Con una telemetria el CSV mide sus etapas y los demás
+    formatos, "escribir".
+    """
+    if formato not in escritores:
+        raise ValueError(f"formato desconocido: {formato!r} (opciones: {', '.join(escritores)})")
+    if opciones.get("fragmentos", 1) > 1:
+        # Los fragmentos son archivos aparte: no hay un archivo al que asociar el resumen
+        resumen = False
+    if telemetria is not None:
+        if formato == "csv":
+            opciones["telemetria"] = telemetria
+        else:
+            lotes = lotes_medidos(lotes, telemetria, "escribir")
+    if not resumen:
+        return escritores[formato](lotes, nombre_archivo, **opciones)
+    acumulado = ResumenPacientes(semilla_resumen)
+    huella = anterior = None
+    if opciones.get("anexar"):
+        # El resumen cubre también las filas anteriores; el sha256 del
+        # archivo completo lo calcula guardar_resumen
+        anterior = resumen_anterior(nombre_archivo)
+    elif formato == "csv":
+        huella = opciones["huella"] = hashlib.sha256()
+    filas = escritores[formato](lotes_con_resumen(lotes, acumulado, telemetria), nombre_archivo,
+                                **opciones)
+    guardar_resumen(acumulado if anterior is None else anterior.combinar(acumulado),
+                    nombre_archivo, parametros, huella.hexdigest() if huella is not None else None)
+    return filas
+
+
+def leer_lotes(nombre_archivo, formato, tamano_lote=100000):
+    """Lee como lotes de columnas un archivo escrito con guardar_lotes (formatos binarios)."""
+    if formato == "npz":
+        yield from leer_lotes_npz(nombre_archivo)
+    elif formato == "parquet":
+        import pyarrow.parquet as pq
+        pa = _importar_pyarrow()
+        for lote in pq.ParquetFile(nombre_archivo).iter_batches(batch_size=tamano_lote):
+            yield _columnas_desde_arrow(pa.Table.from_batches([lote]))
+    elif formato == "arrow":
+        pa = _importar_pyarrow()
+        with pa.memory_map(nombre_archivo) as origen:
+            lector = pa.ipc.open_file(origen)
+            for i in range(lector.num_record_batches):
+                yield _columnas_desde_arrow(pa.Table.from_batches([lector.get_batch(i)]))
+    else:
+        raise ValueError(f"formato sin lector: {formato!r}")
@@ -0,0 +1,562 @@
+"""
+Especificación declarativa de un conjunto de datos.
+
+El conjunto se describe con un diccionario (o un archivo JSON o YAML) con la
+lista de sus columnas, en el orden de salida:
+
+    {"columnas": [
+        {"nombre": "Género", "tipo": "categoria", "valores": ["Masculino", "Femenino"]},
+        {"nombre": "Edad", "tipo": "entero", "min": 0, "max": 100},
+        {"nombre": "Altura (cm)", "tipo": "normal", "decimales": 1,
+         "media": {"reglas": [{"si": {"Género": "Masculino"}, "valor": 171}], "defecto": 158},
+         "desv": 7},
+        {"nombre": "Evaluación", "tipo": "clasificacion", "defecto": "Normal",
+         "reglas": [{"si": {"Edad": [0, 11]}, "valor": "Niño"}]}
+    ]}
+
+Tipos de columna (parámetros entre paréntesis):
+
+- uuid: UUID versión 4.
+- categoria (valores, probabilidades opcional): valores uniformes o con esas probabilidades.
+- nombre (genero, locale) y apellido (locale): nombres de Faker; genero es una
+  columna categórica con valores de parametros.generos.
+- entero (min, max): entero uniforme entre min y max inclusive.
+- uniforme (min, max), normal (media, desv) y mezcla (componentes: lista de
+  {peso, media, desv}): reales.
+- bernoulli (p, valores = ["No", "Sí"]): el segundo valor con probabilidad p.
+- fecha (desde, hasta, base opcional): base (por defecto la fecha de
+  referencia) más un número entero de días entre desde y hasta inclusive.
+- clasificacion (reglas, defecto): el valor de la primera regla que se
+  cumple, o defecto. Sirve para las columnas derivadas (evaluaciones).
+
+Las columnas numéricas aceptan además ajustes (lista de {si, suma}: se suma
+donde se cumple la condición), decimales (redondeo) y limites ([mínimo,
+máximo], cualquiera puede ser null), que se aplican en ese orden. Todo
+parámetro numérico puede ser un número o {"reglas": [{si, valor}], "defecto"}.
+
+Una condición (si) es un diccionario {columna: prueba} que se cumple cuando
+se cumplen todas sus pruebas; la clave "o" toma una lista de condiciones de
+las que basta una. Una prueba es un valor (igualdad), una lista [a, b]
+(rango inclusive; en columnas categóricas, pertenencia a la lista) o un
+diccionario de operadores {"<": 36, ">=": 12} ("<", "<=", ">", ">=", "==", "!=").
+
+compilar() valida la especificación y la convierte en un PlanGeneracion: un
+paso vectorizado por columna, ordenados según sus dependencias, que generan
+un lote entero con operaciones de arreglos. Las columnas categóricas se
+generan como códigos y solo se convierten en texto al entregarlas (o nunca,
+al escribir CSV con codificacion_csv).
+"""
+import json
+import os
+
+import numpy as np
+
+from medicDataGenerator.medicDataGenerator import tipos_sangre, probabilidades, tipos_visita
+from medicDataGenerator.parametros import (
+    generos, edad_maxima, altura_por_genero, peso_por_edad_genero, peso_por_defecto,
+    rango_temperatura, rangos_fc, rangos_fr, rangos_sistolica, rangos_diastolica,
+    ajuste_temperatura, prob_fumador_por_edad_genero, prob_alcohol_por_edad_genero,
+    picos_edad_ALL)
+from medicDataGenerator import evaluaciones
+from medicDataGenerator.identificadores import generar_uuids
+from medicDataGenerator.nombres import generar_nombres_de_pila, generar_apellidos
+from medicDataGenerator.vectorizado import dia_referencia, dias_ventana_consulta
+from medicDataGenerator.codificacion_csv import escribir_csv
+from medicDataGenerator.telemetria import medidor
+
+_operadores = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+               "==": np.equal, "!=": np.not_equal}
+
+# Tipos cuyos valores son reales o enteros (admiten ajustes, decimales y limites)
+tipos_numericos = {"entero", "uniforme", "normal", "mezcla"}
+
+
+# -----------------------------
+# Lectura
+# -----------------------------
+def _importar_yaml():
+    try:
+        import yaml
+    except ImportError as error:
+        raise ImportError("Las especificaciones YAML requieren PyYAML "
+                          "(pip install pyyaml)") from error
+    return yaml
+
+
+def cargar_especificacion(ruta):
+    """Lee una especificación de un archivo JSON o YAML (.yaml o .yml)."""
+    with open(ruta, encoding="utf-8") as archivo:
+        if os.path.splitext(ruta)[1].lower() in (".yaml", ".yml"):
+            return _importar_yaml().safe_load(archivo)
+        return json.load(archivo)
+
+
+# -----------------------------
+# Compilación
+# -----------------------------
+class _Lote:
+    """Columnas de un lote en construcción; las máscaras se calculan una vez por lote."""
+
+    def __init__(self, n, rng, fecha_referencia, codificado):
+        self.n, self.rng = n, rng
+        self.fecha_referencia = fecha_referencia
+        self.codificado = codificado
+        self.columnas = {}
+        self._mascaras = {}
+
+    def mascara(self, clave, evaluar):
+        if clave not in self._mascaras:
+            self._mascaras[clave] = evaluar(self)
+        return self._mascaras[clave]
+
+
+class _Compilador:
+    """Estado de la compilación de una columna: sus dependencias y las categorías conocidas."""
+
+    def __init__(self, especificaciones, categorias):
+        self.especificaciones = especificaciones
+        self.categorias = categorias
+        self.dependencias = set()
+
+    def usar(self, columna):
+        if columna not in self.especificaciones:
+            raise ValueError(f"columna desconocida: {columna!r}")
+        self.dependencias.add(columna)
+        return self.categorias.get(columna)
+
+    def condicion(self, condicion):
+        """Función lote -> máscara booleana de la condición."""
+        if not isinstance(condicion, dict):
+            raise ValueError(f"condición inválida: {condicion!r}")
+        pruebas = []
+        for columna, prueba in condicion.items():
+            if columna == "o":
+                pruebas.append(self._alguna([self.condicion(c) for c in prueba]))
+            else:
+                pruebas.append(self._prueba(columna, prueba))
+        clave = json.dumps(condicion, sort_keys=True)
+
+        def evaluar(lote):
+            mascara = np.ones(lote.n, dtype=bool)
+            for prueba in pruebas:
+                mascara &= prueba(lote)
+            return mascara
+        return lambda lote: lote.mascara(clave, evaluar)
+
+    def _alguna(self, alternativas):
+        def evaluar(lote):
+            mascara = np.zeros(lote.n, dtype=bool)
+            for alternativa in alternativas:
+                mascara |= alternativa(lote)
+            return mascara
+        return evaluar
+
+    def _prueba(self, columna, prueba):
+        categorias = self.usar(columna)
+        if categorias is not None:
+            # Las categóricas se comparan por código
+            valores = prueba if isinstance(prueba, list) else [prueba]
+            if isinstance(prueba, dict) or not all(v in categorias for v in valores):
+                raise ValueError(f"prueba inválida para la columna categórica {columna!r}: "
+                                 f"{prueba!r} (valores: {categorias})")
+            codigos = [categorias.index(v) for v in valores]
+            return lambda lote: np.isin(lote.columnas[columna], codigos)
+        if isinstance(prueba, list):
+            if len(prueba) != 2:
+                raise ValueError(f"un rango es [mínimo, máximo]: {prueba!r}")
+            prueba = {">=": prueba[0], "<=": prueba[1]}
+        elif not isinstance(prueba, dict):
+            prueba = {"==": prueba}
+        for operador in prueba:
+            if operador not in _operadores:
+                raise ValueError(f"operador desconocido: {operador!r} "
+                                 f"(opciones: {', '.join(_operadores)})")
+
+        def evaluar(lote):
+            valores = lote.columnas[columna]
+            mascara = np.ones(lote.n, dtype=bool)
+            for operador, limite in prueba.items():
+                mascara &= _operadores[operador](valores, limite)
+            return mascara
+        return evaluar
+
+    def parametro(self, valor, nombre):
+        """Función lote -> escalar o arreglo del parámetro nombre."""
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            return lambda lote: valor
+        if isinstance(valor, dict) and "reglas" in valor:
+            condiciones = [self.condicion(regla["si"]) for regla in valor["reglas"]]
+            valores = [regla["valor"] for regla in valor["reglas"]]
+            defecto = valor.get("defecto", 0)
+            return lambda lote: np.select([c(lote) for c in condiciones], valores, defecto)
+        raise ValueError(f"parámetro {nombre!r} inválido: {valor!r}")
+
+
+def _requerir(especificacion, *claves):
+    for clave in claves:
+        if clave not in especificacion:
+            raise ValueError(f"a la columna {especificacion['nombre']!r} "
+                             f"({especificacion['tipo']}) le falta {clave!r}")
+    return [especificacion[clave] for clave in claves]
+
+
+def categorias_columna(especificacion):
+    """Valores posibles de una columna categórica, en el orden de sus códigos (None si no lo es)."""
+    tipo = especificacion.get("tipo")
+    if tipo == "categoria":
+        return [str(v) for v in especificacion.get("valores", [])]
+    if tipo == "bernoulli":
+        return [str(v) for v in especificacion.get("valores", ["No", "Sí"])]
+    if tipo == "clasificacion":
+        valores = [str(especificacion.get("defecto", ""))]
+        for regla in especificacion.get("reglas", []):
+            if str(regla.get("valor")) not in valores:
+                valores.append(str(regla.get("valor")))
+        return valores
+    return None
+
+
+def _codigos_genero(compilador, columna):
+    # Los nombres de Faker se eligen con los códigos de parametros.generos
+    categorias = compilador.usar(columna)
+    if categorias is None or not set(categorias) <= set(generos):
+        raise ValueError(f"la columna de género {columna!r} debe ser categórica "
+                         f"con valores de {generos}")
+    mapa = np.array([generos.index(v) for v in categorias])
+    return lambda lote: mapa[lote.columnas[columna]]
+
+
+def _tipo_codigos(cantidad):
+    """Entero sin signo más pequeño que guarda los códigos 0..cantidad-1."""
+    return np.min_scalar_type(max(cantidad - 1, 0))
+
+
+def _compilar_columna(especificacion, compilador):
+    """Función lote -> arreglo de la columna (códigos en las categóricas)."""
+    tipo = especificacion["tipo"]
+    parametro = compilador.parametro
+
+    if tipo == "uuid":
+        return lambda lote: generar_uuids(lote.n, lote.rng, como_bytes=lote.codificado)
+    if tipo == "categoria":
+        [valores] = _requerir(especificacion, "valores")
+        if not valores:
+            raise ValueError(f"la columna {especificacion['nombre']!r} no tiene valores")
+        tipo_codigos = _tipo_codigos(len(valores))
+        if "probabilidades" not in especificacion:
+            return lambda lote: lote.rng.integers(0, len(valores), size=lote.n).astype(tipo_codigos)
+        prob = np.asarray(especificacion["probabilidades"], dtype=float)
+        if len(prob) != len(valores) or (prob < 0).any():
+            raise ValueError(f"probabilidades inválidas en {especificacion['nombre']!r}")
+        prob = prob / prob.sum()
+        return lambda lote: lote.rng.choice(len(valores), size=lote.n, p=prob).astype(tipo_codigos)
+    if tipo == "nombre":
+        [columna] = _requerir(especificacion, "genero")
+        codigos = _codigos_genero(compilador, columna)
+        locale = especificacion.get("locale", "es_ES")
+        return lambda lote: generar_nombres_de_pila(codigos(lote), lote.rng, locale)
+    if tipo == "apellido":
+        locale = especificacion.get("locale", "es_ES")
+        return lambda lote: generar_apellidos(lote.n, lote.rng, locale)
+    if tipo == "entero":
+        minimo, maximo = (parametro(v, k) for k, v in
+                          zip(("min", "max"), _requerir(especificacion, "min", "max")))
+        return lambda lote: lote.rng.integers(minimo(lote), maximo(lote), size=lote.n,
+                                              endpoint=True)
+    if tipo == "uniforme":
+        minimo, maximo = (parametro(v, k) for k, v in
+                          zip(("min", "max"), _requerir(especificacion, "min", "max")))
+        return lambda lote: lote.rng.uniform(minimo(lote), maximo(lote), size=lote.n)
+    if tipo == "normal":
+        media, desv = (parametro(v, k) for k, v in
+                       zip(("media", "desv"), _requerir(especificacion, "media", "desv")))
+        return lambda lote: lote.rng.normal(media(lote), desv(lote), size=lote.n)
+    if tipo == "mezcla":
+        [componentes] = _requerir(especificacion, "componentes")
+        pesos = np.array([c["peso"] for c in componentes], dtype=float)
+        medias = np.array([c["media"] for c in componentes], dtype=float)
+        desvs = np.array([c["desv"] for c in componentes], dtype=float)
+        pesos = pesos / pesos.sum()
+
+        def mezcla(lote):
+            componente = lote.rng.choice(len(pesos), size=lote.n, p=pesos)
+            return lote.rng.normal(medias[componente], desvs[componente])
+        return mezcla
+    if tipo == "bernoulli":
+        p = parametro(_requerir(especificacion, "p")[0], "p")
+        return lambda lote: (lote.rng.random(lote.n) < p(lote)).astype(np.uint8)
+    if tipo == "fecha":
+        desde, hasta = (parametro(v, k) for k, v in
+                        zip(("desde", "hasta"), _requerir(especificacion, "desde", "hasta")))
+        base = especificacion.get("base")
+        if base is not None and compilador.usar(base) is not None:
+            raise ValueError(f"la base de {especificacion['nombre']!r} debe ser una fecha")
+
+        def fecha(lote):
+            dias = lote.rng.integers(desde(lote), hasta(lote), size=lote.n, endpoint=True)
+            inicio = lote.fecha_referencia if base is None else lote.columnas[base]
+            return inicio + dias.astype("timedelta64[D]")
+        return fecha
+    if tipo == "clasificacion":
+        [reglas] = _requerir(especificacion, "reglas")
+        categorias = categorias_columna(especificacion)
+        condiciones = [compilador.condicion(regla["si"]) for regla in reglas]
+        codigos = [categorias.index(str(regla["valor"])) for regla in reglas]
+        tipo_codigos = _tipo_codigos(len(categorias))
+        return lambda lote: np.select([c(lote) for c in condiciones], codigos,
+                                      0).astype(tipo_codigos)
+    raise ValueError(f"tipo de columna desconocido: {tipo!r} en {especificacion['nombre']!r}")
+
+
+def _compilar_numerica(especificacion, compilador, generar):
+    """Agrega a generar los ajustes, el redondeo y los límites de la columna."""
+    ajustes = [(compilador.condicion(a["si"]), a["suma"]) for a in especificacion.get("ajustes", [])]
+    decimales = especificacion.get("decimales")
+    minimo, maximo = especificacion.get("limites", [None, None])
+    if not ajustes and decimales is None and minimo is None and maximo is None:
+        return generar
+
+    def ajustar(lote):
+        valores = generar(lote)
+        for condicion, suma in ajustes:
+            valores = valores + np.where(condicion(lote), suma, 0)
+        if decimales is not None:
+            valores = np.round(valores, decimales)
+        if minimo is not None or maximo is not None:
+            valores = np.clip(valores, minimo, maximo)
+        return valores
+    return ajustar
+
+
+def _ordenar(nombres, dependencias):
+    """Orden de generación: cada columna después de sus dependencias, si no en el orden dado."""
+    orden, visitando, listas = [], set(), set()
+
+    def visitar(nombre):
+        if nombre in listas:
+            return
+        if nombre in visitando:
+            raise ValueError(f"dependencia circular en la columna {nombre!r}")
+        visitando.add(nombre)
+        for dependencia in sorted(dependencias[nombre], key=nombres.index):
+            visitar(dependencia)
+        visitando.discard(nombre)
+        listas.add(nombre)
+        orden.append(nombre)
+
+    for nombre in nombres:
+        visitar(nombre)
+    return orden
+
+
+class PlanGeneracion:
+    """
+    Especificación compilada: genera lotes de columnas {columna: arreglo} con
+    un paso vectorizado por columna. Ver compilar().
+    """
+
+    def __init__(self, especificacion):
+        columnas = especificacion.get("columnas") if isinstance(especificacion, dict) else None
+        if not columnas:
+            raise ValueError("la especificación debe tener una lista 'columnas'")
+        especificaciones = {}
+        for columna in columnas:
+            if "nombre" not in columna or "tipo" not in columna:
+                raise ValueError(f"cada columna necesita 'nombre' y 'tipo': {columna!r}")
+            if columna["nombre"] in especificaciones:
+                raise ValueError(f"columna repetida: {columna['nombre']!r}")
+            especificaciones[columna["nombre"]] = columna
+
+        self.especificacion = especificacion
+        self.columnas = list(especificaciones)
+        self.categorias = {nombre: categorias_columna(columna)
+                           for nombre, columna in especificaciones.items()
+                           if categorias_columna(columna) is not None}
+        pasos, dependencias = {}, {}
+        for nombre, columna in especificaciones.items():
+            compilador = _Compilador(especificaciones, self.categorias)
+            paso = _compilar_columna(columna, compilador)
+            if columna["tipo"] in tipos_numericos:
+                paso = _compilar_numerica(columna, compilador, paso)
+            pasos[nombre], dependencias[nombre] = paso, compilador.dependencias
+        self.orden = _ordenar(self.columnas, dependencias)
+        self._pasos = [(nombre, pasos[nombre]) for nombre in self.orden]
+        self.categorias = {nombre: np.array(valores) for nombre, valores in self.categorias.items()}
+
+    def generar(self, n, rng=None, fecha_referencia=None, codificado=False, telemetria=None):
+        """
+        Genera un lote de n filas como {columna: arreglo}, en el orden de la
+        especificación. Con codificado=True las columnas categóricas quedan
+        como códigos de self.categorias y los UUID como bytes ('S36'). Con
+        una telemetria cada columna se mide como una etapa.
+        """
+        lote = _Lote(n, np.random.default_rng(rng), dia_referencia(fecha_referencia), codificado)
+        medir = medidor(telemetria)
+        for nombre, paso in self._pasos:
+            with medir(nombre, n):
+                lote.columnas[nombre] = paso(lote)
+        if not codificado:
+            for nombre, valores in self.categorias.items():
+                lote.columnas[nombre] = valores[lote.columnas[nombre]]
+        return {nombre: lote.columnas[nombre] for nombre in self.columnas}
+
+    def iterar_lotes(self, num, tamano_lote=100000, rng=None, fecha_referencia=None,
+                     codificado=False, telemetria=None):
+        """Genera num filas en lotes de tamano_lote (ver vectorizado.iterar_lotes_pacientes)."""
+        if tamano_lote <= 0:
+            raise ValueError("tamano_lote debe ser positivo")
+        rng = np.random.default_rng(rng)
+        fecha_referencia = dia_referencia(fecha_referencia)
+        for desplazamiento in range(0, num, tamano_lote):
+            filas = min(tamano_lote, num - desplazamiento)
+            yield self.generar(filas, rng, fecha_referencia, codificado, telemetria)
+            if telemetria is not None:
+                telemetria.lote(filas)
+
+    def guardar_csv(self, num, nombre_archivo, rng=None, tamano_lote=100000,
+                    fecha_referencia=None, telemetria=None, **opciones):
+        """
+        Genera num filas y las escribe en CSV con codificacion_csv.escribir_csv
+        (opciones: compresion, nivel, fragmentos). Retorna las filas escritas.
+        """
+        lotes = self.iterar_lotes(num, tamano_lote, rng, fecha_referencia, codificado=True,
+                                  telemetria=telemetria)
+        return escribir_csv(lotes, nombre_archivo, self.columnas, categorias=self.categorias,
+                            telemetria=telemetria, **opciones)
+
+
+def compilar(especificacion=None):
+    """
+    Compila una especificación (diccionario o ruta de un archivo JSON/YAML;
+    por defecto especificacion_pacientes()) en un PlanGeneracion. Lanza
+    ValueError si la especificación es inválida.
+    """
+    if especificacion is None:
+        especificacion = especificacion_pacientes()
+    elif isinstance(especificacion, (str, os.PathLike)):
+        especificacion = cargar_especificacion(especificacion)
+    return PlanGeneracion(especificacion)
+
+
+# -----------------------------
+# Especificación de las consultas de pacientes
+# -----------------------------
+def _reglas_edad(rangos, indice=None, genero=None):
+    reglas = []
+    for (min_edad, max_edad), *valores in rangos:
+        si = {"Edad": [min_edad, max_edad]}
+        if genero is not None:
+            si = {"Género": genero, **si}
+        reglas.append({"si": si, "valor": valores[0] if indice is None else valores[0][indice]})
+    return reglas
+
+
+def _por_genero_y_edad(rangos_por_genero, defecto=0):
+    reglas = [regla for genero in generos for regla in _reglas_edad(rangos_por_genero[genero],
+                                                                     genero=genero)]
+    return {"reglas": reglas, "defecto": defecto}
+
+
+def _signo_vital(nombre, columna, rangos):
+    # Los rangos se desplazan con la fiebre y la hipotermia (ver generar_signos_vitales_lote)
+    ajuste = ajuste_temperatura[nombre]
+    return {"nombre": columna, "tipo": "entero",
+            "min": {"reglas": _reglas_edad(rangos, 0)}, "max": {"reglas": _reglas_edad(rangos, 1)},
+            "ajustes": [{"si": {"Temperatura (°C)": {">": evaluaciones.temperatura_maxima}},
+                         "suma": ajuste},
+                        {"si": {"Temperatura (°C)": {"<": evaluaciones.temperatura_minima}},
+                         "suma": -ajuste}]}
+
+
+def _grupos_edad(limites, menor=None):
+    """Condiciones sobre la Edad de cada grupo de searchsorted(limites, edad) (ver evaluaciones)."""
+    grupos = [{"<=": int(limites[0])}]
+    grupos += [{">": int(a), "<=": int(b)} for a, b in zip(limites[:-1], limites[1:])]
+    grupos.append({">": int(limites[-1])})
+    if menor is not None:
+        grupos = [{"<": menor}, {**grupos[0], ">=": menor}] + grupos[1:]
+    return grupos
+
+
+def _clasificacion(columna, grupos, bajo, alto, etiquetas):
+    """
+    Reglas de una evaluación: etiquetas[1] si alguna prueba de bajo se cumple
+    en el grupo de edad, etiquetas[2] si alguna de alto, si no etiquetas[0].
+    bajo y alto son listas de (columna, operador, límite por grupo).
+    """
+    reglas = []
+    for etiqueta, limites in ((etiquetas[1], bajo), (etiquetas[2], alto)):
+        for i, grupo in enumerate(grupos):
+            pruebas = [{nombre: {operador: int(valores[i])}} for nombre, operador, valores in limites]
+            si = {"Edad": grupo, **pruebas[0]} if len(pruebas) == 1 else {"Edad": grupo, "o": pruebas}
+            reglas.append({"si": si, "valor": str(etiqueta)})
+    return {"nombre": columna, "tipo": "clasificacion", "defecto": str(etiquetas[0]),
+            "reglas": reglas}
+
+
+def especificacion_pacientes(dias_ventana_consulta=dias_ventana_consulta):
+    """
+    Especificación equivalente a generar_columnas_pacientes, construida con
+    las constantes de parametros.py y evaluaciones.py. La edad de
+    diagnóstico ALL es una mezcla de dos normales (60% / 40% en promedio,
+    no exacto por lote como en edad_ALL_lote).
+    """
+    e = evaluaciones
+    grupos_fc = _grupos_edad(e.edades_fc)
+    grupos_presion = _grupos_edad(e.edades_presion, menor=1)
+    sistolica, diastolica = "Presión Sistólica", "Presión Diastólica"
+    columnas = [
+        {"nombre": "ID Paciente", "tipo": "uuid"},
+        {"nombre": "Nombre", "tipo": "nombre", "genero": "Género"},
+        {"nombre": "Apellido", "tipo": "apellido"},
+        {"nombre": "Género", "tipo": "categoria", "valores": list(generos)},
+        {"nombre": "Edad", "tipo": "entero", "min": 0, "max": edad_maxima},
+        {"nombre": "Altura (cm)", "tipo": "normal", "decimales": 1,
+         "media": {"reglas": [{"si": {"Género": g}, "valor": altura_por_genero[g][0]}
+                              for g in generos]},
+         "desv": {"reglas": [{"si": {"Género": g}, "valor": altura_por_genero[g][1]}
+                             for g in generos]}},
+        {"nombre": "Peso (kg)", "tipo": "normal", "decimales": 1, "limites": [1, None],
+         "media": _por_genero_y_edad({g: [(r, m) for r, m, _ in peso_por_edad_genero[g]]
+                                      for g in generos}, peso_por_defecto[0]),
+         "desv": _por_genero_y_edad({g: [(r, d) for r, _, d in peso_por_edad_genero[g]]
+                                     for g in generos}, peso_por_defecto[1])},
+        {"nombre": "Temperatura (°C)", "tipo": "uniforme", "min": rango_temperatura[0],
+         "max": rango_temperatura[1],
+         "decimales": 1},
+        {"nombre": "Evaluación Temperatura", "tipo": "clasificacion",
+         "defecto": str(e.etiquetas_temperatura[0]),
+         "reglas": [{"si": {"Temperatura (°C)": {"<": e.temperatura_minima}},
+                     "valor": str(e.etiquetas_temperatura[1])},
+                    {"si": {"Temperatura (°C)": {">": e.temperatura_maxima}},
+                     "valor": str(e.etiquetas_temperatura[2])}]},
+        _signo_vital("sistolica", sistolica, rangos_sistolica),
+        _signo_vital("diastolica", diastolica, rangos_diastolica),
+        _clasificacion("Evaluación Presión", grupos_presion,
+                       [(sistolica, "<", e.sis_minima), (diastolica, "<", e.dias_minima)],
+                       [(sistolica, ">", e.sis_maxima), (diastolica, ">", e.dias_maxima)],
+                       e.etiquetas_presion),
+        _signo_vital("fc", "Frecuencia Cardíaca (lpm)", rangos_fc),
+        _clasificacion("Evaluación FC", grupos_fc,
+                       [("Frecuencia Cardíaca (lpm)", "<", e.fc_minima)],
+                       [("Frecuencia Cardíaca (lpm)", ">", e.fc_maxima)],
+                       e.etiquetas_fc),
+        _signo_vital("fr", "Frecuencia Respiratoria (rpm)", rangos_fr),
+        {"nombre": "Tipo de Sangre", "tipo": "categoria", "valores": list(tipos_sangre),
+         "probabilidades": list(probabilidades)},
+        {"nombre": "Fumador", "tipo": "bernoulli",
+         "p": _por_genero_y_edad(prob_fumador_por_edad_genero)},
+        {"nombre": "Consume Alcohol", "tipo": "bernoulli",
+         "p": _por_genero_y_edad(prob_alcohol_por_edad_genero)},
+        {"nombre": "Edad de diagnóstico ALL (años)", "tipo": "mezcla", "decimales": 1,
+         "limites": [0, edad_maxima],
+         "componentes": [{"peso": peso, "media": media, "desv": desv}
+                         for peso, media, desv in picos_edad_ALL]},
+        {"nombre": "ID Consulta", "tipo": "uuid"},
+        {"nombre": "Fecha de Consulta", "tipo": "fecha", "desde": -dias_ventana_consulta,
+         "hasta": 0},
+        {"nombre": "Tipo de Visita", "tipo": "categoria", "valores": list(tipos_visita)},
+        {"nombre": "Próxima Cita", "tipo": "fecha", "base": "Fecha de Consulta",
+         "desde": 7, "hasta": 60},
+    ]
+    return {"columnas": columnas}
@@ -0,0 +1,48 @@
+import numpy as np
+
+from medicDataGenerator import parametros
+
+# Etiquetas de cada evaluación; el código de una fila es su posición en el arreglo
+etiquetas_temperatura = np.array(["Normal", "Hipotermia", "Fiebre"])
+etiquetas_fc = np.array(["Normal", "Bradicardia", "Taquicardia"])
+etiquetas_presion = np.array(["Normal", "Hipotensión", "Hipertensión"])
+
+# Límites de parametros.py como arreglos: temperaturas (°C) de hipotermia y
+# fiebre, y mínimos y máximos de cada grupo de edad de evaluar_frecuencia_cardiaca
+# (<=1, <=5, <=12, <=18, resto) y evaluar_presion_arterial (<1, <=5, <=12, <=18, resto)
+temperatura_minima, temperatura_maxima = parametros.temperatura_minima, parametros.temperatura_maxima
+edades_fc = np.array(parametros.edades_fc)
+fc_minima = np.array(parametros.fc_minima)
+fc_maxima = np.array(parametros.fc_maxima)
+edades_presion = np.array(parametros.edades_presion)
+sis_minima = np.array(parametros.sis_minima)
+dias_minima = np.array(parametros.dias_minima)
+sis_maxima = np.array(parametros.sis_maxima)
+dias_maxima = np.array(parametros.dias_maxima)
+
+
+def _codigos(bajo, alto):
+    # 1 si está por debajo del rango, 2 si está por encima, 0 si es normal
+    return np.select([bajo, alto], [1, 2], 0).astype(np.int8)
+
+
+def evaluar_temperatura_array(temp):
+    """Versión por arreglos de evaluar_temperatura; retorna códigos de etiquetas_temperatura."""
+    temp = np.asarray(temp)
+    return _codigos(temp < temperatura_minima, temp > temperatura_maxima)
+
+
+def evaluar_frecuencia_cardiaca_array(fc, edad):
+    """Versión por arreglos de evaluar_frecuencia_cardiaca; retorna códigos de etiquetas_fc."""
+    fc = np.asarray(fc)
+    grupo = np.searchsorted(edades_fc, edad, side='left')
+    return _codigos(fc < fc_minima[grupo], fc > fc_maxima[grupo])
+
+
+def evaluar_presion_arterial_array(sistolica, diastolica, edad):
+    """Versión por arreglos de evaluar_presion_arterial; retorna códigos de etiquetas_presion."""
+    sistolica, diastolica, edad = np.asarray(sistolica), np.asarray(diastolica), np.asarray(edad)
+    grupo = np.searchsorted(edades_presion, edad, side='left') + 1
+    grupo = np.where(edad < 1, 0, grupo)
+    return _codigos((sistolica < sis_minima[grupo]) | (diastolica < dias_minima[grupo]),
+                    (sistolica > sis_maxima[grupo]) | (diastolica > dias_maxima[grupo]))
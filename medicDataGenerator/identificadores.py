@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+
+# Los dos caracteres hexadecimales (ASCII) de cada valor de byte, empacados en un uint16
+_tabla_hex = np.frombuffer(b"".join(b"%02x" % b for b in range(256)), dtype=np.uint16)
+
+# Grupos (bytes, posición en el texto) de la forma canónica xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
+_grupos_uuid = ((0, 4, 0), (4, 6, 9), (6, 8, 14), (8, 10, 19), (10, 16, 24))
+_posiciones_hex = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+def bytes_aleatorios(n, rng=None):
+    """
+    Matriz (n, 16) de bytes aleatorios obtenida de un solo búfer. Sin rng se
+    usa os.urandom, igual que uuid.uuid4; con rng el resultado es reproducible.
+    """
+    if rng is None:
+        return np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    return np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+
+
+def formatear_uuids(datos, como_bytes=False):
+    """
+    Convierte una matriz (n, 16) de bytes en cadenas UUID canónicas ('U36',
+    o 'S36' en ASCII con como_bytes=True).
+    """
+    datos = np.ascontiguousarray(datos, dtype=np.uint8)
+    n = len(datos)
+    hexa = _tabla_hex[datos].view(np.uint8)  # (n, 32) caracteres ASCII
+    texto = np.full((n, 36), ord("-"), dtype=np.uint8 if como_bytes else np.uint32)
+    for desde, hasta, posicion in _grupos_uuid:
+        texto[:, posicion:posicion + 2 * (hasta - desde)] = hexa[:, 2 * desde:2 * hasta]
+    # Cada fila de 36 puntos de código UCS-4 (o bytes) es directamente una cadena
+    return texto.view("S36" if como_bytes else "U36").ravel()
+
+
+def generar_uuids_bytes(n, rng=None):
+    """Matriz (n, 16) con los bytes de n UUID versión 4 (RFC 4122)."""
+    datos = bytes_aleatorios(n, rng)
+    datos[:, 6] = (datos[:, 6] & 0x0F) | 0x40  # versión 4
+    datos[:, 8] = (datos[:, 8] & 0x3F) | 0x80  # variante RFC 4122
+    return datos
+
+
+def generar_uuids(n, rng=None, como_bytes=False):
+    """
+    Genera n UUID versión 4 (RFC 4122) como arreglo de cadenas, a partir de un
+    único búfer aleatorio y con formato vectorizado. Con rng (np.random.Generator)
+    los identificadores son reproducibles; como_bytes se pasa a formatear_uuids.
+    """
+    return formatear_uuids(generar_uuids_bytes(n, rng), como_bytes)
+
+
+def uuids_a_bytes(textos):
+    """Inverso de formatear_uuids: matriz (n, 16) de bytes a partir de las cadenas canónicas."""
+    caracteres = np.asarray(textos, dtype="U36").view(np.uint32).reshape(-1, 36)[:, _posiciones_hex]
+    # '0'-'9' -> 0-9, 'a'-'f' / 'A'-'F' -> 10-15
+    digitos = np.where(caracteres <= ord("9"), caracteres - ord("0"),
+                       (caracteres | 0x20) - ord("a") + 10).astype(np.uint8)
+    return np.ascontiguousarray((digitos[:, 0::2] << 4) | digitos[:, 1::2])
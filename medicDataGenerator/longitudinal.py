@@ -0,0 +1,436 @@
+"""
+Generación longitudinal: pacientes con varias consultas a lo largo del tiempo.
+
+Un registro de pacientes (RegistroLongitudinal) guarda en un directorio los
+datos fijos de cada paciente (ID, género, año de nacimiento, tipo de sangre,
+fumador, consumo de alcohol, edad de diagnóstico ALL, nombre, altura) y la
+fecha de su próxima cita. Cada archivo del registro es una columna binaria
+de ancho fijo (<campo>.bin) y registro.json lleva el número de pacientes,
+hasta qué día se generaron consultas y cuántas ejecuciones terminaron.
+
+Cada ejecución de anexar_consultas avanza el registro hasta una fecha:
+los pacientes con cita en ese periodo tienen su consulta de control (y
+las siguientes, si también caen en el periodo), llegan pacientes nuevos a
+razón de nuevos_por_dia y las consultas se agregan al final del CSV. Los
+pacientes nuevos se agregan al final de los archivos del registro y las
+próximas citas se actualizan en su lugar (np.memmap), de modo que el costo
+depende de las filas nuevas y no del historial.
+
+Antes de tocar el CSV o las columnas, cada ejecución guarda en pendiente.npz
+el tamaño del CSV y los valores que va a sobrescribir; registro.json se
+reemplaza al final, de forma atómica. Si una ejecución se interrumpe, al
+abrir el registro se deshacen sus cambios (ver RegistroLongitudinal.recuperar).
+
+    python -m medicDataGenerator.longitudinal registro consultas.csv --until 2025-01-15
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from medicDataGenerator.medicDataGenerator import tipos_sangre, probabilidades, tipos_visita
+from medicDataGenerator.parametros import edad_maxima, tabla_parametros
+from medicDataGenerator.evaluaciones import (
+    evaluar_temperatura_array, evaluar_frecuencia_cardiaca_array, evaluar_presion_arterial_array)
+from medicDataGenerator.vectorizado import (
+    columnas_pacientes, categorias_pacientes, dias_ventana_consulta, dia_referencia,
+    generar_generos, generar_edades, generar_alturas, generar_pesos,
+    generar_signos_vitales_lote, edad_ALL_lote)
+from medicDataGenerator.nombres import generar_indices_nombres, nombres_desde_indices
+from medicDataGenerator.identificadores import generar_uuids, generar_uuids_bytes, formatear_uuids
+from medicDataGenerator.codificacion_csv import escribir_csv
+from medicDataGenerator.resumen import (
+    ResumenPacientes, columnas_resumen, leer_resumen_guardado, guardar_resumen, resumir_archivo,
+    huella_archivo, huella_encadenada)
+
+version_registro = 2
+archivo_metadatos = "registro.json"
+archivo_pendiente = "pendiente.npz"
+
+# Campos del registro: (tipo, forma de cada paciente).
+# 16 + 1 + 2 + 1 + 1 + 1 + 2 + 4 + 4 + 2 + 4 + 4 = 42 bytes por paciente.
+campos_registro = {
+    "id": (np.uint8, (16,)),             # bytes del UUID
+    "genero": (np.int8, ()),             # código de vectorizado.generos
+    "anio_nacimiento": (np.int16, ()),
+    "tipo_sangre": (np.int8, ()),        # posición en tipos_sangre
+    "fumador": (np.int8, ()),            # 0 = No, 1 = Sí
+    "alcohol": (np.int8, ()),            # 0 = No, 1 = Sí
+    "edad_ALL": (np.int16, ()),          # décimas de año
+    "nombre": (np.int32, ()),            # ver nombres.generar_indices_nombres
+    "apellido": (np.int32, ()),
+    "altura": (np.int16, ()),            # décimas de cm
+    "proxima_cita": (np.int32, ()),      # días desde 1970-01-01
+    "visitas": (np.int32, ()),
+}
+
+# Días entre una consulta y la siguiente (como en generar_fechas_consulta)
+dias_entre_citas = (7, 60)
+
+_codigo_control = tipos_visita.index("Control")
+
+
+class RegistroLongitudinal:
+    """Registro de pacientes guardado en directorio, una columna binaria por campo."""
+
+    def __init__(self, directorio, locale="es_ES"):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        try:
+            with open(self._ruta(archivo_metadatos), encoding="utf-8") as archivo:
+                self.metadatos = json.load(archivo)
+        except FileNotFoundError:
+            self.metadatos = {"version": version_registro, "pacientes": 0, "consultas": 0,
+                              "hasta": None, "ejecuciones": 0, "locale": locale}
+        if self.metadatos.get("version") != version_registro:
+            raise ValueError(f"versión de registro no soportada: {self.metadatos.get('version')!r}")
+        self.recuperar()
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def __len__(self):
+        return self.metadatos["pacientes"]
+
+    @property
+    def hasta(self):
+        """Último día con consultas generadas (None si el registro está vacío)."""
+        hasta = self.metadatos["hasta"]
+        return None if hasta is None else np.datetime64(hasta, "D")
+
+    def columna(self, campo, escribir=False):
+        """Columna campo como np.memmap (de solo lectura salvo con escribir=True)."""
+        tipo, forma = campos_registro[campo]
+        if not len(self):
+            return np.empty((0,) + forma, dtype=tipo)
+        return np.memmap(self._ruta(campo + ".bin"), dtype=tipo, mode="r+" if escribir else "r",
+                         shape=(len(self),) + forma)
+
+    def agregar(self, pacientes):
+        """Agrega al final de cada columna los pacientes {campo: arreglo}; retorna sus índices."""
+        inicio, n = len(self), len(pacientes["id"])
+        for campo, (tipo, forma) in campos_registro.items():
+            valores = np.ascontiguousarray(pacientes[campo], dtype=tipo)
+            if valores.shape != (n,) + forma:
+                raise ValueError(f"forma inválida para {campo!r}: {valores.shape}")
+            ruta = self._ruta(campo + ".bin")
+            with open(ruta, "ab") as archivo:
+                # Bytes de una ejecución interrumpida que no llegó a registro.json
+                archivo.truncate(inicio * np.dtype(tipo).itemsize * int(np.prod(forma)))
+                archivo.write(valores.tobytes())
+        self.metadatos["pacientes"] = inicio + n
+        return np.arange(inicio, inicio + n)
+
+    def guardar(self):
+        """Guarda registro.json; los pacientes agregados cuentan solo desde aquí."""
+        ruta = self._ruta(archivo_metadatos)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+            json.dump(self.metadatos, archivo, indent=2)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(ruta + ".tmp", ruta)
+
+    def iniciar_ejecucion(self, nombre_archivo, indices):
+        """
+        Guarda en pendiente.npz lo necesario para deshacer la ejecución: el
+        tamaño actual de nombre_archivo y los valores de proxima_cita y visitas
+        de los pacientes indices, que la ejecución va a cambiar.
+        """
+        ruta = self._ruta(archivo_pendiente)
+        tamano = os.path.getsize(nombre_archivo) if os.path.exists(nombre_archivo) else -1
+        with open(ruta + ".tmp", "wb") as archivo:
+            anteriores = {campo: self.columna(campo)[indices]
+                          for campo in ("proxima_cita", "visitas")}
+            np.savez(archivo, ejecucion=self.metadatos["ejecuciones"],
+                     archivo=os.path.abspath(nombre_archivo), tamano=tamano, indices=indices,
+                     **anteriores)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(ruta + ".tmp", ruta)
+
+    def terminar_ejecucion(self):
+        """Cuenta la ejecución como terminada: guarda registro.json y borra pendiente.npz."""
+        self.metadatos["ejecuciones"] += 1
+        self.guardar()
+        os.remove(self._ruta(archivo_pendiente))
+
+    def recuperar(self):
+        """
+        Deshace una ejecución que no llegó a guardar registro.json: restaura
+        las columnas cambiadas y recorta el CSV a su tamaño anterior. Retorna
+        True si había una ejecución interrumpida.
+        """
+        ruta = self._ruta(archivo_pendiente)
+        if not os.path.exists(ruta):
+            return False
+        with np.load(ruta) as pendiente:
+            pendiente = dict(pendiente)
+        if int(pendiente["ejecucion"]) < self.metadatos["ejecuciones"]:
+            # registro.json ya se guardó; solo faltaba borrar pendiente.npz
+            os.remove(ruta)
+            return False
+        indices = pendiente["indices"]
+        if len(indices):
+            for campo in ("proxima_cita", "visitas"):
+                columna = self.columna(campo, escribir=True)
+                columna[indices] = pendiente[campo]
+                columna.flush()
+                del columna
+        archivo, tamano = str(pendiente["archivo"]), int(pendiente["tamano"])
+        if tamano < 0:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        elif os.path.exists(archivo):
+            with open(archivo, "r+b") as csv:
+                csv.truncate(tamano)
+        # Los pacientes nuevos sobrantes se descartan en el próximo agregar
+        os.remove(ruta)
+        return True
+
+
+def _pacientes_nuevos(n, fechas, rng, locale, inicio=0):
+    """
+    Datos fijos de n pacientes nuevos cuya primera consulta es en fechas.
+    inicio es el número de pacientes ya registrados (ver edad_ALL_lote).
+    """
+    generos = generar_generos(n, rng)
+    edades = generar_edades(n, rng)
+    anios = fechas.astype("datetime64[Y]").astype(int) + 1970
+    pila, apellidos = generar_indices_nombres(generos, rng, locale)
+    tabla = tabla_parametros()
+    fumador = rng.random(n) < tabla["prob_fumador"][generos, edades]
+    alcohol = rng.random(n) < tabla["prob_alcohol"][generos, edades]
+    return {
+        "id": generar_uuids_bytes(n, rng),
+        "genero": generos,
+        "anio_nacimiento": anios - edades,
+        "tipo_sangre": rng.choice(len(tipos_sangre), size=n, p=probabilidades),
+        "fumador": fumador,
+        "alcohol": alcohol,
+        "edad_ALL": np.round(edad_ALL_lote(n, rng, inicio) * 10),
+        "nombre": pila,
+        "apellido": apellidos,
+        "altura": np.round(generar_alturas(generos, rng) * 10),
+        "proxima_cita": fechas.astype(np.int32),
+        "visitas": np.zeros(n, dtype=np.int32),
+    }
+
+
+def _consultas(pacientes, fechas, proximas, tipo_visita, rng, locale):
+    """
+    Lote de consultas (columnas de columnas_pacientes) de los pacientes dados.
+    Los datos fijos salen del registro; solo la edad, el peso y los signos
+    vitales cambian de una consulta a otra.
+    """
+    n = len(fechas)
+    generos = pacientes["genero"].astype(np.intp)
+    anios = fechas.astype("datetime64[Y]").astype(int) + 1970
+    edades = np.clip(anios - pacientes["anio_nacimiento"], 0, edad_maxima)
+    temp, sis, dias, fc, fr = generar_signos_vitales_lote(edades, rng, generos)
+    nombres, apellidos = nombres_desde_indices(generos, pacientes["nombre"],
+                                               pacientes["apellido"], locale)
+    # Categóricas como códigos de categorias_pacientes (ver codificacion_csv)
+    return {
+        "ID Paciente": formatear_uuids(pacientes["id"], como_bytes=True),
+        "Nombre": nombres,
+        "Apellido": apellidos,
+        "Género": generos,
+        "Edad": edades,
+        "Altura (cm)": pacientes["altura"] / 10,
+        "Peso (kg)": generar_pesos(edades, generos, rng),
+        "Temperatura (°C)": temp,
+        "Evaluación Temperatura": evaluar_temperatura_array(temp),
+        "Presión Sistólica": sis,
+        "Presión Diastólica": dias,
+        "Evaluación Presión": evaluar_presion_arterial_array(sis, dias, edades),
+        "Frecuencia Cardíaca (lpm)": fc,
+        "Evaluación FC": evaluar_frecuencia_cardiaca_array(fc, edades),
+        "Frecuencia Respiratoria (rpm)": fr,
+        "Tipo de Sangre": pacientes["tipo_sangre"],
+        "Fumador": pacientes["fumador"],
+        "Consume Alcohol": pacientes["alcohol"],
+        "Edad de diagnóstico ALL (años)": pacientes["edad_ALL"] / 10,
+        "ID Consulta": generar_uuids(n, rng, como_bytes=True),
+        "Fecha de Consulta": fechas,
+        "Tipo de Visita": tipo_visita,
+        "Próxima Cita": proximas,
+    }
+
+
+def _generador(semilla, ejecucion):
+    # Cada ejecución con la misma semilla tiene su propia secuencia
+    if semilla is None:
+        return np.random.default_rng()
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(ejecucion,)))
+
+
+def _columnas_resumen(lote):
+    # El resumen necesita las categóricas como texto
+    return {campo: categorias_pacientes[campo][lote[campo]] if campo in categorias_pacientes
+            else lote[campo] for campo in columnas_resumen}
+
+
+def anexar_consultas(registro, nombre_archivo, hasta=None, nuevos_por_dia=50.0, semilla=None,
+                     tamano_lote=100000, compresion=None, resumen=True):
+    """
+    Avanza registro (RegistroLongitudinal o su directorio) hasta el día
+    hasta (por defecto hoy) y agrega al final de nombre_archivo las
+    consultas del periodo, ordenadas por fecha:
+
+    - cada paciente con próxima cita en el periodo tiene una consulta de
+      "Control" ese día, con una nueva próxima cita entre 7 y 60 días después
+      (y más consultas si también caen en el periodo);
+    - llegan Poisson(nuevos_por_dia * días) pacientes nuevos, con su primera
+      consulta en un día uniforme del periodo.
+
+    El periodo empieza el día siguiente al de la ejecución anterior; en un
+    registro vacío abarca los dias_ventana_consulta días antes de hasta. Con
+    semilla el resultado de cada ejecución es reproducible. Con resumen=True
+    <archivo>.resumen.json se actualiza con las filas agregadas (si no
+    estaba vigente, el archivo anterior se resume una vez). Retorna el
+    número de consultas agregadas.
+    """
+    if not isinstance(registro, RegistroLongitudinal):
+        registro = RegistroLongitudinal(registro)
+    if nuevos_por_dia < 0 or tamano_lote <= 0:
+        raise ValueError("nuevos_por_dia debe ser >= 0 y tamano_lote positivo")
+    hasta = dia_referencia(hasta)
+    desde = (registro.hasta + 1 if registro.hasta is not None
+             else hasta - dias_ventana_consulta)
+    if hasta < desde:
+        return 0
+    rng = _generador(semilla, registro.metadatos["ejecuciones"])
+    locale = registro.metadatos["locale"]
+    dias = int((hasta - desde).astype(int)) + 1
+    ultimo = hasta.astype(np.int64)
+
+    # Participantes: pacientes con cita en el periodo y pacientes nuevos
+    proxima = registro.columna("proxima_cita")
+    antiguos = np.flatnonzero(proxima <= ultimo)
+    n_nuevos = int(rng.poisson(nuevos_por_dia * dias))
+    llegadas = desde + rng.integers(0, dias, size=n_nuevos).astype("timedelta64[D]")
+    nuevos = _pacientes_nuevos(n_nuevos, llegadas, rng, locale, len(registro))
+    participantes = {campo: np.concatenate([registro.columna(campo)[antiguos], nuevos[campo]])
+                     for campo in campos_registro}
+
+    # Consultas por rondas: quienes tienen la siguiente cita en el periodo siguen.
+    # La primera consulta de un paciente nuevo es de cualquier tipo, las demás de control.
+    locales, fechas, siguientes, primeras = [], [], [], []
+    actuales = np.arange(len(participantes["id"]))
+    fecha = participantes["proxima_cita"].astype(np.int64)
+    primera = actuales >= len(antiguos)
+    while len(actuales):
+        siguiente = fecha + rng.integers(dias_entre_citas[0], dias_entre_citas[1] + 1,
+                                         size=len(actuales))
+        for lista, valores in zip((locales, fechas, siguientes, primeras),
+                                  (actuales, fecha, siguiente, primera)):
+            lista.append(valores)
+        participantes["proxima_cita"][actuales] = siguiente
+        participantes["visitas"][actuales] += 1
+        sigue = siguiente <= ultimo
+        actuales, fecha = actuales[sigue], siguiente[sigue]
+        primera = np.zeros(len(actuales), dtype=bool)
+    locales, fechas, siguientes, primeras = (
+        np.concatenate(x) if x else np.empty(0, dtype=np.int64)
+        for x in (locales, fechas, siguientes, primeras))
+    orden = np.lexsort((locales, fechas))
+    locales, fechas, siguientes, primeras = (x[orden] for x in (locales, fechas, siguientes,
+                                                                primeras))
+    tipos = np.where(primeras, rng.integers(0, len(tipos_visita), size=len(locales)),
+                     _codigo_control)
+
+    anterior = acumulado = huella = None
+    if resumen:
+        # El resumen y la huella del archivo antes de agregar filas. Si el
+        # resumen guardado está vigente, el archivo no se lee: la huella de
+        # los bytes agregados se encadena a la guardada.
+        if os.path.exists(nombre_archivo) and os.path.getsize(nombre_archivo):
+            anterior = leer_resumen_guardado(nombre_archivo)
+            if anterior is None:
+                anterior = (resumir_archivo(nombre_archivo, usar_guardado=False),
+                            {"sha256": huella_archivo(nombre_archivo),
+                             "bytes": os.path.getsize(nombre_archivo)})
+        acumulado = ResumenPacientes(semilla=int(rng.integers(2 ** 63)))
+        huella = hashlib.sha256()
+
+    def lotes():
+        for inicio in range(0, len(locales), tamano_lote):
+            parte = slice(inicio, inicio + tamano_lote)
+            pacientes = {campo: valores[locales[parte]]
+                         for campo, valores in participantes.items()}
+            lote = _consultas(pacientes, fechas[parte].astype("datetime64[D]"),
+                              siguientes[parte].astype("datetime64[D]"), tipos[parte], rng, locale)
+            if acumulado is not None:
+                acumulado.actualizar(_columnas_resumen(lote))
+            yield lote
+
+    registro.iniciar_ejecucion(nombre_archivo, antiguos)
+    filas = escribir_csv(lotes(), nombre_archivo, columnas_pacientes,
+                         categorias=categorias_pacientes, compresion=compresion, anexar=True,
+                         huella=huella)
+
+    # El registro se actualiza después de escribir las consultas
+    if len(antiguos):
+        for campo in ("proxima_cita", "visitas"):
+            columna = registro.columna(campo, escribir=True)
+            columna[antiguos] = participantes[campo][:len(antiguos)]
+            columna.flush()
+            del columna
+    registro.agregar({campo: valores[len(antiguos):] for campo, valores in participantes.items()})
+    if acumulado is not None:
+        parametros = {"registro": os.path.abspath(registro.directorio), "hasta": str(hasta)}
+        if anterior is None:
+            guardar_resumen(acumulado, nombre_archivo, parametros, huella.hexdigest())
+        else:
+            resumen_anterior, datos = anterior
+            segmentos = datos.get("segmentos", [datos["bytes"]])
+            guardar_resumen(resumen_anterior.combinar(acumulado), nombre_archivo, parametros,
+                            huella_encadenada(datos["sha256"], huella.hexdigest()),
+                            segmentos + [os.path.getsize(nombre_archivo)])
+    registro.metadatos["consultas"] += filas
+    registro.metadatos["hasta"] = str(hasta)
+    # registro.json se guarda al final: hasta aquí la ejecución se puede deshacer
+    registro.terminar_ejecucion()
+    return filas
+
+
+def _fecha(texto):
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {texto!r} (use AAAA-MM-DD)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m medicDataGenerator.longitudinal",
+        description="Agrega consultas de un registro persistente de pacientes a un CSV.")
+    parser.add_argument("registro", help="directorio del registro de pacientes")
+    parser.add_argument("archivo", nargs="?", default="consultas_pacientes.csv",
+                        help="CSV al que se agregan las consultas")
+    parser.add_argument("--until", type=_fecha, default=None,
+                        help="último día AAAA-MM-DD con consultas (por defecto hoy)")
+    parser.add_argument("--new-per-day", type=float, default=50.0,
+                        help="pacientes nuevos por día en promedio (por defecto 50)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semilla para obtener un resultado reproducible")
+    parser.add_argument("--batch-size", type=int, default=100000,
+                        help="filas por lote (por defecto 100000)")
+    parser.add_argument("--no-summary", action="store_true",
+                        help="no actualizar el resumen <archivo>.resumen.json")
+    args = parser.parse_args(argv)
+    if args.new_per_day < 0 or args.batch_size < 1:
+        parser.error("--new-per-day debe ser >= 0 y --batch-size >= 1")
+
+    registro = RegistroLongitudinal(args.registro)
+    filas = anexar_consultas(registro, args.archivo, args.until, args.new_per_day, args.seed,
+                             args.batch_size, resumen=not args.no_summary)
+    print(f"{filas} consultas agregadas; {len(registro)} pacientes hasta {registro.hasta}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
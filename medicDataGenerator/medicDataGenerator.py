@@ -1,211 +1,117 @@
-import csv
+import itertools
 import random
-from faker import Faker
-from datetime import datetime, timedelta
-import numpy as np
-import uuid
-
-fake = Faker('es_ES')
+from bisect import bisect_left
+from datetime import datetime
+
+from medicDataGenerator import parametros
+# Se conserva el nombre en este módulo; la tabla vive en parametros
+from medicDataGenerator.parametros import peso_por_edad_genero
+
+# Faker y NumPy se cargan solo cuando se necesitan, para que importar el
+# módulo sea rápido y no tenga efectos secundarios.
+_fake = None
+
+def obtener_fake():
+    """Instancia compartida de Faker('es_ES'), creada en el primer uso."""
+    global _fake
+    if _fake is None:
+        from faker import Faker
+        _fake = Faker('es_ES')
+    return _fake
+
+def __getattr__(nombre):
+    # Compatibilidad con el antiguo atributo de módulo `fake`
+    if nombre == "fake":
+        return obtener_fake()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 # Proporciones reales de tipos de sangre en Colombia (en porcentaje)
 tipos_sangre = ['O+', 'A+', 'B+', 'AB+', 'O-', 'A-', 'B-', 'AB-']
 probabilidades = [0.56, 0.26, 0.07, 0.02, 0.05, 0.03, 0.007, 0.003]
 
-# Peso promedio (kg) por rango de edad y género para Colombia (aproximados)
-peso_por_edad_genero = {
-    "Masculino": [
-        ((0, 1), 10, 2),
-        ((2, 5), 16, 3),
-        ((6, 12), 32, 6),
-        ((13, 18), 58, 10),
-        ((19, 40), 72, 12),
-        ((41, 60), 76, 14),
-        ((61, 100), 73, 15)
-    ],
-    "Femenino": [
-        ((0, 1), 9, 1.8),
-        ((2, 5), 15, 2.8),
-        ((6, 12), 28, 5),
-        ((13, 18), 55, 9),
-        ((19, 40), 65, 10),
-        ((41, 60), 70, 13),
-        ((61, 100), 68, 14)
-    ]
-}
+tipos_visita = ["Consulta general", "Control", "Urgencia", "Especialista"]
 
 def peso_según_edad_genero(edad, genero):
+    import numpy as np
     rangos = peso_por_edad_genero[genero]
     for (min_edad, max_edad), peso_prom, desv in rangos:
         if min_edad <= edad <= max_edad:
             peso = max(1, round(np.random.normal(peso_prom, desv), 1))
             return peso
     # Por defecto, peso adulto promedio
-    return max(1, round(np.random.normal(70, 15), 1))
+    return max(1, round(np.random.normal(*parametros.peso_por_defecto), 1))
 
-def generar_signos_vitales(edad, peso):
-    temp = round(random.uniform(35.1, 39.2), 1)
-
-    # Factores de ajuste por temperatura
-    aumento_temp = temp > 37.5
-    baja_temp = temp < 36.0
-
-    # Frecuencia cardíaca (lpm) según edad
-    if edad <= 1:
-        fc_base = (100, 160)
-    elif edad <= 5:
-        fc_base = (90, 140)
-    elif edad <= 12:
-        fc_base = (70, 120)
-    else:
-        fc_base = (60, 100)
+def _entero_ajustado(nombre, rangos, edad, signo, hasta_siguiente=False):
+    # Entero en el rango de la edad, desplazado según la temperatura
+    (_, (minimo, maximo)) = rangos[parametros.indice_rango(rangos, edad, hasta_siguiente)]
+    ajuste = parametros.ajuste_temperatura[nombre] * signo
+    return random.randint(minimo + ajuste, maximo + ajuste)
 
-    fc_min, fc_max = fc_base
-    if aumento_temp:
-        fc = random.randint(fc_min + 10, fc_max + 10)
-    elif baja_temp:
+def generar_signos_vitales(edad, peso):
+    temp = round(random.uniform(*parametros.rango_temperatura), 1)
 
-        fc = random.randint(fc_min - 10, fc_max - 10)
-    else:
-        fc = random.randint(fc_min, fc_max)
-
-    # Frecuencia respiratoria (rpm) según edad
-    if edad <= 1:
-        fr_base = (30, 60)
-    elif edad <= 5:
-        fr_base = (20, 40)
-    elif edad <= 12:
-        fr_base = (18, 30)
+    # Factores de ajuste por temperatura: +1 si aumenta, -1 si baja
+    if temp > parametros.temperatura_maxima:
+        signo = 1
+    elif temp < parametros.temperatura_minima:
+        signo = -1
     else:
-        fr_base = (12, 20)
+        signo = 0
 
-    fr_min, fr_max = fr_base
-    if aumento_temp:
-        fr = random.randint(fr_min + 5, fr_max + 5)
-    elif baja_temp:
-        fr = random.randint(fr_min - 5, fr_max - 5)
-    else:
-        fr = random.randint(fr_min, fr_max)
-
-    # Presión arterial (mmHg) ajustada por edad
-    if edad < 18:
-        sis_base = (90, 110)
-        dias_base = (60, 70)
-    elif edad < 40:
-        sis_base = (110, 130)
-        dias_base = (70, 85)
-    else:
-        sis_base = (120, 150)
-        dias_base = (75, 95)
-
-    sis_min, sis_max = sis_base
-    dias_min, dias_max = dias_base
-
-    if aumento_temp:
-        sistolica = random.randint(sis_min + 5, sis_max + 5)
-        diastolica = random.randint(dias_min + 3, dias_max + 3)
-    elif baja_temp:
-        sistolica = random.randint(sis_min - 5, sis_max - 5)
-        diastolica = random.randint(dias_min - 3, dias_max - 3)
-    else:
-        sistolica = random.randint(sis_min, sis_max)
-        diastolica = random.randint(dias_min, dias_max)
+    # Frecuencia cardíaca (lpm) y respiratoria (rpm) hasta cada edad máxima
+    # (edad <= 1, <= 5, <= 12) y presión arterial (mmHg) hasta la mínima del
+    # rango siguiente (edad < 18, < 40)
+    fc = _entero_ajustado("fc", parametros.rangos_fc, edad, signo)
+    fr = _entero_ajustado("fr", parametros.rangos_fr, edad, signo)
+    sistolica = _entero_ajustado("sistolica", parametros.rangos_sistolica, edad, signo, True)
+    diastolica = _entero_ajustado("diastolica", parametros.rangos_diastolica, edad, signo, True)
 
     return temp, (sistolica, diastolica), fc, fr
 
 
 def evaluar_frecuencia_cardiaca(fc, edad):
-    if edad <= 1:
-        if fc < 100:
-            return "Bradicardia"
-        elif fc > 160:
-            return "Taquicardia"
-    elif edad <= 5:
-        if fc < 90:
-            return "Bradicardia"
-        elif fc > 140:
-            return "Taquicardia"
-    elif edad <= 12:
-        if fc < 70:
-            return "Bradicardia"
-        elif fc > 120:
-            return "Taquicardia"
-    elif edad <= 18:
-        if fc < 60:
-            return "Bradicardia"
-        elif fc > 100:
-            return "Taquicardia"
-    else:
-        if fc < 60:
-            return "Bradicardia"
-        elif fc > 100:
-            return "Taquicardia"
+    grupo = bisect_left(parametros.edades_fc, edad)
+    if fc < parametros.fc_minima[grupo]:
+        return "Bradicardia"
+    elif fc > parametros.fc_maxima[grupo]:
+        return "Taquicardia"
     return "Normal"
 
 def evaluar_presion_arterial(sistolica, diastolica, edad):
-    if edad < 1:
-        if sistolica < 70 or diastolica < 50:
-            return "Hipotensión"
-        elif sistolica > 100 or diastolica > 65:
-            return "Hipertensión"
-    elif edad <= 5:
-        if sistolica < 80 or diastolica < 55:
-            return "Hipotensión"
-        elif sistolica > 110 or diastolica > 75:
-            return "Hipertensión"
-    elif edad <= 12:
-        if sistolica < 90 or diastolica < 60:
-            return "Hipotensión"
-        elif sistolica > 120 or diastolica > 80:
-            return "Hipertensión"
-    elif edad <= 18:
-        if sistolica < 100 or diastolica < 65:
-            return "Hipotensión"
-        elif sistolica > 130 or diastolica > 85:
-            return "Hipertensión"
-    else:
-        if sistolica < 90 or diastolica < 60:
-            return "Hipotensión"
-        elif sistolica > 140 or diastolica > 90:
-            return "Hipertensión"
+    grupo = 0 if edad < 1 else bisect_left(parametros.edades_presion, edad) + 1
+    if sistolica < parametros.sis_minima[grupo] or diastolica < parametros.dias_minima[grupo]:
+        return "Hipotensión"
+    elif sistolica > parametros.sis_maxima[grupo] or diastolica > parametros.dias_maxima[grupo]:
+        return "Hipertensión"
     return "Normal"
 
 def evaluar_temperatura(temp):
-    if temp < 36.0:
+    if temp < parametros.temperatura_minima:
         return "Hipotermia"
-    elif temp > 37.5:
+    elif temp > parametros.temperatura_maxima:
         return "Fiebre"
     else:
         return "Normal"
 
 def generar_edad():
-    return random.randint(0, 100)
+    return random.randint(0, parametros.edad_maxima)
+
+def _en_rango(rangos, edad):
+    # Valor del primer rango (inclusive) que contiene edad, o None
+    return next((valor for (min_edad, max_edad), valor in rangos
+                 if min_edad <= edad <= max_edad), None)
 
 def asignar_fumador(edad, genero):
-    prob = 0
-    if edad < 12:
+    # Probabilidades ajustadas para que el promedio total quede cercano a
+    # 16.9% en hombres y 7.6% en mujeres. Nadie fuma antes del primer rango;
+    # las edades que no caen en ningún rango usan el último (65+).
+    prob_por_genero = parametros.prob_fumador_por_edad_genero
+    if edad < min(rangos[0][0][0] for rangos in prob_por_genero.values()):
         return "No"
-
-    if genero == 'Masculino':
-        # Ajustamos las probabilidades para que el promedio total quede cercano a 16.9%
-        if 12 <= edad <= 24:
-            prob = 0.186  # 18.6%
-        elif 25 <= edad <= 44:
-            prob = 0.132  # 13.2%
-        elif 45 <= edad <= 64:
-            prob = 0.117  # 11.7%
-        else:  # 65+
-            prob = 0.062  # 6.2%
-
-    elif genero == 'Femenino':
-        # Ajustamos similar para mujeres con promedio 7.6%, se escalan proporcionalmente
-        if 12 <= edad <= 24:
-            prob = 0.08  # un poco menor que hombres, proporción basada en dato general
-        elif 25 <= edad <= 44:
-            prob = 0.055
-        elif 45 <= edad <= 64:
-            prob = 0.05
-        else:  # 65+
-            prob = 0.03
+    rangos, prob = prob_por_genero.get(genero), 0
+    if rangos:
+        prob = _en_rango(rangos, edad)
+        prob = rangos[-1][1] if prob is None else prob
     return "Sí" if random.random() < prob else "No"
 
 def asignar_consumo_alcohol(edad, genero):
@@ -213,121 +119,130 @@ def asignar_consumo_alcohol(edad, genero):
     Asigna si una persona consume alcohol, basándose en estadísticas reales por edad y género en Colombia.
     La probabilidad fue ajustada a partir de prevalencias por edad y género.
     """
+    # El último rango (65+) no tiene edad máxima; las edades que no caen en
+    # ninguno de los intermedios usan la del primero (menores de 12)
+    rangos = parametros.prob_alcohol_por_edad_genero.get(genero)
     probabilidad = 0.0
-
-    if genero == "Masculino":
-        if 12 <= edad <= 17:
-            probabilidad = 0.35  # Ligeramente más alta que la media escolar (72% de hombres)
-        elif 18 <= edad <= 24:
-            probabilidad = 0.60
-        elif 25 <= edad <= 44:
-            probabilidad = 0.70
-        elif 45 <= edad <= 64:
-            probabilidad = 0.65
-        elif edad >= 65:
-            probabilidad = 0.45
-        else:
-            probabilidad = 0.01  # Muy baja si menor de 12
-    elif genero == "Femenino":
-        if 12 <= edad <= 17:
-            probabilidad = 0.29  # Más baja en mujeres escolares
-        elif 18 <= edad <= 24:
-            probabilidad = 0.48
-        elif 25 <= edad <= 44:
-            probabilidad = 0.58
-        elif 45 <= edad <= 64:
-            probabilidad = 0.52
-        elif edad >= 65:
-            probabilidad = 0.35
+    if rangos:
+        if edad >= rangos[-1][0][0]:
+            probabilidad = rangos[-1][1]
         else:
-            probabilidad = 0.01
-
+            probabilidad = _en_rango(rangos[1:-1], edad)
+            probabilidad = rangos[0][1] if probabilidad is None else probabilidad
     return "Sí" if random.random() < probabilidad else "No"
 
 def edad_ALL(n):
-    # Proporciones para cada pico
-    prop_pico1 = 0.6  # 60% en el primer pico (niños)
-    prop_pico2 = 0.4  # 40% en el segundo pico (adultos)
+    import numpy as np
+    # Proporción, media y desviación de cada pico (niños y adultos)
+    (prop_pico1, media1, desv1), (_, media2, desv2) = parametros.picos_edad_ALL
 
     # Cantidades para cada pico
     n1 = int(n * prop_pico1)
     n2 = n - n1
 
     # Distribución normal para cada pico
-    pico1 = np.random.normal(loc=3.5, scale=1.0, size=n1)   # pico en 2-5 años
-    pico2 = np.random.normal(loc=55, scale=5.0, size=n2)    # pico en 50-60 años
+    pico1 = np.random.normal(loc=media1, scale=desv1, size=n1)   # pico en 2-5 años
+    pico2 = np.random.normal(loc=media2, scale=desv2, size=n2)   # pico en 50-60 años
 
     edades_bimodales = np.concatenate([pico1, pico2])
 
     # Limitar los valores a rangos plausibles
-    edades_bimodales = np.clip(edades_bimodales, 0, 100)
+    edades_bimodales = np.clip(edades_bimodales, 0, parametros.edad_maxima)
 
     np.random.shuffle(edades_bimodales)  # Mezclar
 
     return edades_bimodales
 
-def generar_datos_pacientes(num=100):
-    datos = []
-
-    edades_diagnostico = edad_ALL(num)
-
-    for i in range(num):
-        genero = random.choice(["Masculino", "Femenino"])
-        edad = generar_edad()
-
-        if genero == "Masculino":
-            altura = round(np.random.normal(171, 7), 1)
-            nombre = fake.first_name_male()
+def generar_datos_pacientes(num=100, rng=None, fecha_referencia=None, telemetria=None):
+    """
+    Genera num pacientes con el motor por columnas (ver vectorizado) y los
+    retorna en un RegistrosPacientes: columnas tipadas y compactas que se
+    recorren, indexan y miden con len() igual que la lista de diccionarios
+    de antes. rng admite una semilla o un np.random.Generator y
+    fecha_referencia fija el día desde el que se cuentan las consultas.
+    telemetria (ver telemetria.py) recibe los tiempos por etapa y el avance.
+    """
+    from medicDataGenerator.registros import RegistrosPacientes
+    from medicDataGenerator.vectorizado import iterar_lotes_pacientes
+    return RegistrosPacientes.desde_lotes(
+        iterar_lotes_pacientes(num, rng=rng, fecha_referencia=fecha_referencia,
+                               telemetria=telemetria))
+
+def guardar_en_csv(datos, nombre_archivo="consultas_pacientes.csv", resumen=True,
+                   telemetria=None, **opciones):
+    # datos puede ser el RegistrosPacientes de generar_datos_pacientes, que se
+    # escribe directamente desde sus columnas, o una lista o cualquier iterable
+    # de diccionarios (por ejemplo un generador), cuyas filas se escriben por
+    # bloques a medida que se consumen. Cada bloque se codifica por columnas
+    # (ver codificacion_csv.escribir_csv, que recibe opciones: compresion,
+    # nivel, fragmentos, anexar) con el mismo resultado que csv.DictWriter. Con
+    # resumen=True también se guarda <archivo>.resumen.json (ver resumen.py),
+    # acumulado por bloques mientras se escribe (con el sha256 de los bytes
+    # escritos, sin releer el archivo; con anexar=True el resumen incluye las
+    # filas anteriores). Con una telemetria se miden las etapas "columnas" y
+    # "resumen", además de las de escribir_csv.
+    import hashlib
+    from medicDataGenerator.codificacion_csv import escribir_csv, columnas_desde_filas
+    from medicDataGenerator.registros import RegistrosPacientes
+    from medicDataGenerator.resumen import (
+        ResumenPacientes, columnas_resumen, guardar_resumen, resumen_anterior)
+    from medicDataGenerator.telemetria import medidor
+    from medicDataGenerator.vectorizado import columnas_pacientes
+
+    if isinstance(datos, RegistrosPacientes):
+        if not len(datos):
+            return
+        campos, categorias = columnas_pacientes, datos.categorias()
+        bloques = (datos[inicio:inicio + 100000] for inicio in range(0, len(datos), 100000))
+    else:
+        datos = iter(datos)
+        primero = next(datos, None)
+        if primero is None:
+            return
+        campos, categorias = list(primero.keys()), None
+        bloques = _bloques_de_filas(itertools.chain([primero], datos), 10000)
+    acumulado = huella = anterior = None
+    if resumen and set(columnas_resumen) <= set(campos) and opciones.get("fragmentos", 1) == 1:
+        acumulado = ResumenPacientes()
+        if opciones.get("anexar"):
+            # El resumen cubre también las filas anteriores; el sha256 del
+            # archivo completo lo calcula guardar_resumen
+            anterior = resumen_anterior(nombre_archivo)
         else:
-            altura = round(np.random.normal(158, 6), 1)
-            nombre = fake.first_name_female()
-
-        peso = peso_según_edad_genero(edad, genero)
-        apellido = fake.last_name()
-        fecha_consulta = fake.date_between(start_date='-6M', end_date='today')
-        tipo_visita = random.choice(["Consulta general", "Control", "Urgencia", "Especialista"])
-        proxima_cita = fecha_consulta + timedelta(days=random.randint(7, 60))
-        temp, (sis, dias), fc, fr = generar_signos_vitales(edad, peso)
-        tipo_sangre = random.choices(tipos_sangre, probabilidades)[0]
-        fumador = asignar_fumador(edad, genero)
-
-        datos.append({
-            "ID Paciente": str(uuid.uuid4()),
-            "Nombre": nombre,
-            "Apellido": apellido,
-            "Género": genero,
-            "Edad": edad,
-            "Altura (cm)": altura,
-            "Peso (kg)": peso,
-            "Temperatura (°C)": temp,
-            "Evaluación Temperatura": evaluar_temperatura(temp),
-            "Presión Sistólica": sis,
-            "Presión Diastólica": dias,
-            "Evaluación Presión": evaluar_presion_arterial(sis, dias, edad),
-            "Frecuencia Cardíaca (lpm)": fc,
-            "Evaluación FC": evaluar_frecuencia_cardiaca(fc, edad),
-            "Frecuencia Respiratoria (rpm)": fr,
-            "Tipo de Sangre": tipo_sangre,
-            "Fumador": fumador,
-            "Consume Alcohol": asignar_consumo_alcohol(edad, genero),
-            "Edad de diagnóstico ALL (años)": round(edades_diagnostico[i], 1),
-            "ID Consulta": str(uuid.uuid4()),
-            "Fecha de Consulta": fecha_consulta.strftime('%Y-%m-%d'),
-            "Tipo de Visita": tipo_visita,
-            "Próxima Cita": proxima_cita.strftime('%Y-%m-%d')
-        })
-    return datos
-
-def guardar_en_csv(datos, nombre_archivo="consultas_pacientes.csv"):
-    if not datos:
-        return
-    with open(nombre_archivo, mode='w', newline='', encoding='utf-8') as archivo:
-        campos = list(datos[0].keys())
-        escritor = csv.DictWriter(archivo, fieldnames=campos)
-        escritor.writeheader()
-        escritor.writerows(datos)
-
-# Ejecutar
-datos_pacientes = generar_datos_pacientes(100000)
-guardar_en_csv(datos_pacientes)
-print("Archivo CSV generado exitosamente.")
+            huella = hashlib.sha256()
+
+    medir = medidor(telemetria)
+
+    def lotes():
+        for bloque in bloques:
+            with medir("columnas", len(bloque)):
+                if isinstance(bloque, RegistrosPacientes):
+                    lote = bloque.a_columnas_codificadas()
+                    columnas = {campo: bloque.columna(campo) for campo in columnas_resumen}
+                else:
+                    lote = columnas = columnas_desde_filas(bloque, campos)
+            if acumulado is not None:
+                with medir("resumen", len(bloque)):
+                    acumulado.actualizar(columnas)
+            yield lote
+
+    escribir_csv(lotes(), nombre_archivo, campos, categorias=categorias, telemetria=telemetria,
+                 huella=huella, **opciones)
+    if acumulado is not None:
+        guardar_resumen(acumulado if anterior is None else anterior.combinar(acumulado),
+                        nombre_archivo, huella=huella.hexdigest() if huella is not None else None)
+
+def _bloques_de_filas(filas, tamano):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) == tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+if __name__ == "__main__":
+    datos_pacientes = generar_datos_pacientes(100000)
+    guardar_en_csv(datos_pacientes)
+    print("Archivo CSV generado exitosamente.")
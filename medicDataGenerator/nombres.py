@@ -0,0 +1,120 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Listas del proveedor de Faker que se usan para los nombres
+listas_nombres = ("first_names_male", "first_names_female", "last_names")
+
+
+def directorio_cache():
+    """Directorio donde se guardan las listas de nombres ya preparadas."""
+    if os.environ.get("MEDICDATAGENERATOR_CACHE"):
+        return os.environ["MEDICDATAGENERATOR_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "medicDataGenerator")
+
+
+def _leer_proveedor(locale):
+    from importlib import import_module
+    import faker
+
+    proveedor = import_module(f"faker.providers.person.{locale}").Provider
+    arreglos = {"version": np.array(faker.VERSION)}
+    for lista in listas_nombres:
+        valores = getattr(proveedor, lista)
+        # Algunos locales usan diccionarios {nombre: peso} en lugar de tuplas
+        if isinstance(valores, dict):
+            pesos = np.array(list(valores.values()), dtype=float)
+            arreglos[lista + "_pesos"] = pesos / pesos.sum()
+            valores = list(valores.keys())
+        arreglos[lista] = np.array(valores)
+    return arreglos
+
+
+@lru_cache(maxsize=None)
+def cargar_nombres(locale="es_ES"):
+    """
+    Retorna las listas de nombres y apellidos de Faker para locale como
+    arreglos de NumPy. Se leen una sola vez por proceso y se guardan en un
+    archivo .npz en directorio_cache() para no volver a importar Faker.
+    """
+    import faker
+
+    ruta = os.path.join(directorio_cache(), f"nombres_{locale}.npz")
+    try:
+        with np.load(ruta) as archivo:
+            arreglos = dict(archivo)
+        if str(arreglos["version"]) == faker.VERSION:
+            return arreglos
+    except (OSError, KeyError, ValueError):
+        pass
+
+    arreglos = _leer_proveedor(locale)
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp.npz"
+        np.savez(temporal, **arreglos)
+        os.replace(temporal, ruta)
+    except OSError:
+        # Sin permisos de escritura: se trabaja solo con la copia en memoria
+        pass
+    return arreglos
+
+
+def _indices(arreglos, lista, n, rng):
+    pesos = arreglos.get(lista + "_pesos")
+    if pesos is None:
+        return rng.integers(0, len(arreglos[lista]), size=n)
+    return rng.choice(len(arreglos[lista]), size=n, p=pesos)
+
+
+def _muestrear(arreglos, lista, n, rng):
+    return arreglos[lista][_indices(arreglos, lista, n, rng)]
+
+
+def generar_indices_nombres(codigos_genero, rng, locale="es_ES"):
+    """
+    Posiciones del nombre de pila (en la lista de su género) y del apellido,
+    con las mismas probabilidades que generar_nombres. Sirven para guardar los
+    nombres como enteros y recuperarlos con nombres_desde_indices.
+    """
+    arreglos = cargar_nombres(locale)
+    femenino = np.asarray(codigos_genero) == 1
+    pila = np.empty(len(femenino), dtype=np.int32)
+    pila[~femenino] = _indices(arreglos, "first_names_male", int((~femenino).sum()), rng)
+    pila[femenino] = _indices(arreglos, "first_names_female", int(femenino.sum()), rng)
+    return pila, _indices(arreglos, "last_names", len(femenino), rng).astype(np.int32)
+
+
+def nombres_desde_indices(codigos_genero, pila, apellidos, locale="es_ES"):
+    """Nombres y apellidos de las posiciones de generar_indices_nombres."""
+    arreglos = cargar_nombres(locale)
+    femenino = np.asarray(codigos_genero) == 1
+    nombres = np.where(femenino, arreglos["first_names_female"][np.where(femenino, pila, 0)],
+                       arreglos["first_names_male"][np.where(femenino, 0, pila)])
+    return nombres, arreglos["last_names"][apellidos]
+
+
+def generar_nombres_de_pila(codigos_genero, rng, locale="es_ES"):
+    """Nombres de pila según el género (0 = Masculino, 1 = Femenino)."""
+    arreglos = cargar_nombres(locale)
+    femenino = np.asarray(codigos_genero) == 1
+    tipo = np.result_type(arreglos["first_names_male"].dtype, arreglos["first_names_female"].dtype)
+    nombres = np.empty(len(femenino), dtype=tipo)
+    nombres[~femenino] = _muestrear(arreglos, "first_names_male", int((~femenino).sum()), rng)
+    nombres[femenino] = _muestrear(arreglos, "first_names_female", int(femenino.sum()), rng)
+    return nombres
+
+
+def generar_apellidos(n, rng, locale="es_ES"):
+    return _muestrear(cargar_nombres(locale), "last_names", n, rng)
+
+
+def generar_nombres(codigos_genero, rng, locale="es_ES"):
+    """
+    Nombres y apellidos para un lote completo mediante indexado de enteros,
+    sin llamar a Faker por fila. codigos_genero: 0 = Masculino, 1 = Femenino.
+    """
+    nombres = generar_nombres_de_pila(codigos_genero, rng, locale)
+    return nombres, generar_apellidos(len(nombres), rng, locale)
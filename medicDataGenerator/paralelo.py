@@ -0,0 +1,139 @@
+import hashlib
+import itertools
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from medicDataGenerator.vectorizado import iterar_lotes_pacientes, dia_referencia
+from medicDataGenerator.codificacion_csv import separar_extension, abrir_entrada, abrir_salida
+from medicDataGenerator.escritores import guardar_lotes, leer_lotes
+from medicDataGenerator.resumen import cargar_resumen, guardar_resumen, ruta_resumen
+from medicDataGenerator.telemetria import Telemetria, medidor
+
+
+def dividir_filas(num, trabajadores):
+    """Reparte num filas en fragmentos contiguos (inicio, cantidad) casi iguales."""
+    base, resto = divmod(num, trabajadores)
+    fragmentos = []
+    inicio = 0
+    for i in range(trabajadores):
+        cantidad = base + (1 if i < resto else 0)
+        fragmentos.append((inicio, cantidad))
+        inicio += cantidad
+    return fragmentos
+
+
+def ruta_parte(nombre_archivo, indice):
+    raiz, extension = separar_extension(nombre_archivo)
+    return f"{raiz}.parte-{indice:04d}{extension}"
+
+
+def _generar_fragmento(ruta, inicio, cantidad, semilla, tamano_lote, fecha_referencia,
+                       formato, resumen, parametros, opciones, telemetria=None):
+    # Cada trabajador tiene su propio generador, derivado de la SeedSequence
+    # del fragmento; no se usa ningún estado aleatorio global. El resumen de
+    # cada parte usa una semilla hija distinta, para que al combinarlos la
+    # muestra sea uniforme entre todas las partes.
+    [semilla_resumen] = semilla.spawn(1)
+    lotes = iterar_lotes_pacientes(cantidad, tamano_lote, np.random.default_rng(semilla),
+                                   inicio, fecha_referencia, telemetria)
+    return guardar_lotes(lotes, ruta, formato, resumen, parametros, telemetria, semilla_resumen,
+                         **opciones)
+
+
+def _generar_fragmento_midiendo(*argumentos):
+    # En otro proceso: mide con su propia telemetría y retorna sus métricas
+    telemetria = Telemetria()
+    _generar_fragmento(*argumentos, telemetria)
+    return telemetria.metricas()
+
+
+def unir_partes(partes, nombre_archivo, formato="csv", resumen=True, parametros=None,
+                **opciones):
+    """
+    Une los archivos parciales en uno solo. Los CSV se concatenan byte a byte
+    conservando un único encabezado (descomprimidos y vueltos a comprimir si
+    opciones trae compresion); los formatos binarios se releen por lotes.
+    Con resumen=True el resumen del archivo unido se obtiene combinando los
+    resúmenes guardados de las partes (o, en los binarios, al reescribirlos).
+    """
+    if formato != "csv":
+        lotes = itertools.chain.from_iterable(leer_lotes(parte, formato) for parte in partes)
+        guardar_lotes(lotes, nombre_archivo, formato, resumen, parametros, **opciones)
+        return
+    compresion = opciones.get("compresion")
+    huella = hashlib.sha256()
+    with abrir_salida(nombre_archivo, compresion, huella=huella) as destino:
+        for i, parte in enumerate(partes):
+            with abrir_entrada(parte, compresion) as origen:
+                encabezado = origen.readline()
+                if i == 0:
+                    destino.write(encabezado)
+                shutil.copyfileobj(origen, destino, 1 << 20)
+    if resumen:
+        resumenes = [cargar_resumen(parte) for parte in partes]
+        if resumenes and None not in resumenes:
+            total = resumenes[0]
+            for otro in resumenes[1:]:
+                total = total.combinar(otro)
+            guardar_resumen(total, nombre_archivo, parametros, huella.hexdigest())
+
+
+def generar_en_paralelo(num, nombre_archivo="consultas_pacientes.csv", semilla=None,
+                        trabajadores=None, tamano_lote=100000, unir=True,
+                        fecha_referencia=None, formato="csv", resumen=True, telemetria=None,
+                        **opciones):
+    """
+    Genera num pacientes repartidos entre varios procesos. Cada fragmento usa
+    una semilla independiente obtenida con SeedSequence.spawn, así que para
+    una misma (semilla, num, trabajadores) el resultado es idéntico byte a byte.
+
+    Con unir=True las partes se concatenan en nombre_archivo y se borran; con
+    unir=False se dejan como archivos <nombre>.parte-NNNN.<ext>. formato y
+    opciones se pasan a escritores.guardar_lotes. fecha_referencia (por
+    defecto hoy) se fija aquí para que todos los procesos usen el mismo día.
+    Con resumen=True cada archivo escrito queda con su <archivo>.resumen.json,
+    identificado por estos parámetros. Con varios procesos cada uno mide con
+    su propia telemetría, que se suma a telemetria (un lote por fragmento)
+    al terminar. Retorna la lista de archivos escritos.
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    fecha_referencia = dia_referencia(fecha_referencia)
+    semillas = np.random.SeedSequence(semilla).spawn(trabajadores)
+    if trabajadores == 1 and unir:
+        # Un solo fragmento: se escribe directamente en el archivo final
+        partes = [nombre_archivo]
+    else:
+        partes = [ruta_parte(nombre_archivo, i) for i in range(trabajadores)]
+    parametros = {"filas": num, "semilla": semilla, "trabajadores": trabajadores,
+                  "tamano_lote": tamano_lote, "fecha_referencia": str(fecha_referencia),
+                  "formato": formato, "opciones": opciones}
+    argumentos = [(parte, inicio, cantidad, ss, tamano_lote, fecha_referencia, formato, resumen,
+                   parametros if parte == nombre_archivo
+                   else {**parametros, "inicio": inicio, "cantidad": cantidad}, opciones)
+                  for parte, (inicio, cantidad), ss
+                  in zip(partes, dividir_filas(num, trabajadores), semillas)]
+
+    if trabajadores == 1:
+        _generar_fragmento(*argumentos[0], telemetria)
+    else:
+        funcion = _generar_fragmento if telemetria is None else _generar_fragmento_midiendo
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            futuros = [pool.submit(funcion, *args) for args in argumentos]
+            for futuro, args in zip(futuros, argumentos):
+                metricas = futuro.result()
+                if telemetria is not None:
+                    telemetria.combinar(metricas)
+                    telemetria.lote(args[2])
+
+    if not unir or partes == [nombre_archivo]:
+        return partes
+    with medidor(telemetria)("unir", num):
+        unir_partes(partes, nombre_archivo, formato, resumen, parametros, **opciones)
+    for parte in partes:
+        os.remove(parte)
+        if os.path.exists(ruta_resumen(parte)):
+            os.remove(ruta_resumen(parte))
+    return [nombre_archivo]
@@ -0,0 +1,149 @@
+"""
+Tabla de parámetros demográficos indexada por (género, edad 0..100).
+
+Todos los parámetros que dependen de la edad y el género (peso, signos
+vitales, probabilidad de fumar y de consumir alcohol) se calculan una sola
+vez a partir de las constantes de este módulo y de peso_por_edad_genero, y el
+motor por columnas los resuelve con indexado de arreglos, sin ramas por fila.
+Agregar un perfil demográfico nuevo es solo un cambio en estas constantes.
+Las funciones escalares de medicDataGenerator, evaluaciones y
+especificacion leen estas mismas constantes; NumPy se importa solo al
+construir la tabla, para que importar medicDataGenerator siga siendo rápido.
+"""
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+# Orden de los códigos de género usados en todo el motor por columnas
+generos = ["Masculino", "Femenino"]
+edad_maxima = 100
+
+# Altura (cm): media y desviación por género
+altura_por_genero = {"Masculino": (171, 7), "Femenino": (158, 6)}
+
+# Peso promedio (kg) por rango de edad y género para Colombia (aproximados)
+peso_por_edad_genero = {
+    "Masculino": [
+        ((0, 1), 10, 2),
+        ((2, 5), 16, 3),
+        ((6, 12), 32, 6),
+        ((13, 18), 58, 10),
+        ((19, 40), 72, 12),
+        ((41, 60), 76, 14),
+        ((61, 100), 73, 15)
+    ],
+    "Femenino": [
+        ((0, 1), 9, 1.8),
+        ((2, 5), 15, 2.8),
+        ((6, 12), 28, 5),
+        ((13, 18), 55, 9),
+        ((19, 40), 65, 10),
+        ((41, 60), 70, 13),
+        ((61, 100), 68, 14)
+    ]
+}
+
+# Peso (kg) por defecto para edades fuera de peso_por_edad_genero
+peso_por_defecto = (70, 15)
+
+# Temperatura (°C): se genera uniforme en este rango; por debajo de
+# temperatura_minima hay hipotermia y por encima de temperatura_maxima, fiebre
+rango_temperatura = (35.1, 39.2)
+temperatura_minima, temperatura_maxima = 36.0, 37.5
+
+# Rangos base de signos vitales por rango de edad (inclusive): (mínimo, máximo)
+rangos_fc = [((0, 1), (100, 160)), ((2, 5), (90, 140)), ((6, 12), (70, 120)), ((13, 100), (60, 100))]
+rangos_fr = [((0, 1), (30, 60)), ((2, 5), (20, 40)), ((6, 12), (18, 30)), ((13, 100), (12, 20))]
+rangos_sistolica = [((0, 17), (90, 110)), ((18, 39), (110, 130)), ((40, 100), (120, 150))]
+rangos_diastolica = [((0, 17), (60, 70)), ((18, 39), (70, 85)), ((40, 100), (75, 95))]
+
+# Desplazamiento de cada rango con fiebre (se suma) o hipotermia (se resta)
+ajuste_temperatura = {"fc": 10, "fr": 5, "sistolica": 5, "diastolica": 3}
+
+# Probabilidad de fumar por rango de edad y género (0 fuera de los rangos)
+prob_fumador_por_edad_genero = {
+    "Masculino": [((12, 24), 0.186), ((25, 44), 0.132), ((45, 64), 0.117), ((65, 100), 0.062)],
+    "Femenino": [((12, 24), 0.08), ((25, 44), 0.055), ((45, 64), 0.05), ((65, 100), 0.03)],
+}
+
+# Probabilidad de consumir alcohol por rango de edad y género
+prob_alcohol_por_edad_genero = {
+    "Masculino": [((0, 11), 0.01), ((12, 17), 0.35), ((18, 24), 0.60), ((25, 44), 0.70),
+                  ((45, 64), 0.65), ((65, 100), 0.45)],
+    "Femenino": [((0, 11), 0.01), ((12, 17), 0.29), ((18, 24), 0.48), ((25, 44), 0.58),
+                 ((45, 64), 0.52), ((65, 100), 0.35)],
+}
+
+
+# Límites de la evaluación de frecuencia cardíaca por grupo de edad
+# (<=1, <=5, <=12, <=18, resto)
+edades_fc = [1, 5, 12, 18]
+fc_minima = [100, 90, 70, 60, 60]
+fc_maxima = [160, 140, 120, 100, 100]
+
+# Límites de la evaluación de presión arterial por grupo de edad
+# (<1, <=5, <=12, <=18, resto)
+edades_presion = [5, 12, 18]
+sis_minima = [70, 80, 90, 100, 90]
+dias_minima = [50, 55, 60, 65, 60]
+sis_maxima = [100, 110, 120, 130, 140]
+dias_maxima = [65, 75, 80, 85, 90]
+
+# Edad de diagnóstico ALL: mezcla de dos normales (proporción, media, desviación),
+# un pico en niños (2-5 años) y otro en adultos (50-60 años), limitada a 0..100
+picos_edad_ALL = [(0.6, 3.5, 1.0), (0.4, 55, 5.0)]
+
+
+def indice_rango(rangos, edad, hasta_siguiente=False):
+    """
+    Posición en rangos [((min, max), ...), ...] del rango de edad según su
+    límite superior, como una cadena de "if edad <= max" (con
+    hasta_siguiente, "if edad < min del siguiente"); las edades mayores usan
+    el último rango. Es la búsqueda de las funciones escalares, que admiten
+    edades no enteras; la tabla la resuelve con indexado.
+    """
+    if hasta_siguiente:
+        return bisect_right([min_edad for (min_edad, _), *_ in rangos[1:]], edad)
+    return bisect_left([max_edad for (_, max_edad), *_ in rangos[:-1]], edad)
+
+
+def _llenar(tabla, fila, rangos, indice=None):
+    for (min_edad, max_edad), *valores in rangos:
+        valor = valores[0] if indice is None else valores[0][indice]
+        tabla[fila, min_edad:max_edad + 1] = valor
+
+
+@lru_cache(maxsize=None)
+def tabla_parametros():
+    """
+    Retorna un diccionario {parámetro: arreglo de forma (2, edad_maxima + 1)}
+    con los parámetros de cada (código de género, edad). Se construye una vez
+    por proceso; los arreglos son de solo lectura.
+    """
+    import numpy as np
+    forma = (len(generos), edad_maxima + 1)
+    tabla = {
+        "altura_media": np.empty(forma),
+        "altura_desv": np.empty(forma),
+        "peso_media": np.full(forma, float(peso_por_defecto[0])),
+        "peso_desv": np.full(forma, float(peso_por_defecto[1])),
+        "prob_fumador": np.zeros(forma),
+        "prob_alcohol": np.zeros(forma),
+    }
+    for nombre in ("fc", "fr", "sistolica", "diastolica"):
+        tabla[nombre + "_min"] = np.zeros(forma, dtype=np.int64)
+        tabla[nombre + "_max"] = np.zeros(forma, dtype=np.int64)
+
+    for fila, genero in enumerate(generos):
+        tabla["altura_media"][fila], tabla["altura_desv"][fila] = altura_por_genero[genero]
+        _llenar(tabla["peso_media"], fila, [(r, p) for r, p, _ in peso_por_edad_genero[genero]])
+        _llenar(tabla["peso_desv"], fila, [(r, d) for r, _, d in peso_por_edad_genero[genero]])
+        _llenar(tabla["prob_fumador"], fila, prob_fumador_por_edad_genero[genero])
+        _llenar(tabla["prob_alcohol"], fila, prob_alcohol_por_edad_genero[genero])
+        for nombre, rangos in (("fc", rangos_fc), ("fr", rangos_fr),
+                               ("sistolica", rangos_sistolica), ("diastolica", rangos_diastolica)):
+            _llenar(tabla[nombre + "_min"], fila, rangos, 0)
+            _llenar(tabla[nombre + "_max"], fila, rangos, 1)
+
+    for arreglo in tabla.values():
+        arreglo.flags.writeable = False
+    return tabla
@@ -0,0 +1,207 @@
+import numpy as np
+
+from medicDataGenerator.vectorizado import (
+    columnas_pacientes, categorias_pacientes, columnas_fecha, codificar_categoria,
+    formatear_fechas)
+from medicDataGenerator.identificadores import formatear_uuids, uuids_a_bytes
+
+# Cómo se guarda cada columna que no es categórica
+columnas_uuid = ["ID Paciente", "ID Consulta"]     # 16 bytes
+# Las fechas (vectorizado.columnas_fecha) se guardan como días desde 1970-01-01 (int32)
+columnas_texto = ["Nombre", "Apellido"]             # códigos uint32 en un diccionario propio
+# Columnas reales con un decimal, guardadas en décimas como enteros
+columnas_decimas = {
+    "Altura (cm)": np.int16,
+    "Peso (kg)": np.int16,
+    "Temperatura (°C)": np.int16,
+    "Edad de diagnóstico ALL (años)": np.int16,
+}
+columnas_enteras = {
+    "Edad": np.uint8,
+    "Presión Sistólica": np.int16,
+    "Presión Diastólica": np.int16,
+    "Frecuencia Cardíaca (lpm)": np.int16,
+    "Frecuencia Respiratoria (rpm)": np.int16,
+}
+
+# Filas que se decodifican de una vez al iterar como diccionarios
+_tamano_bloque = 10000
+
+
+class DiccionarioTexto:
+    """Tabla de búsqueda compartida texto <-> código que crece a medida que se codifica."""
+    __slots__ = ("valores", "_codigos")
+
+    def __init__(self, valores=()):
+        self.valores = list(valores)
+        self._codigos = {valor: i for i, valor in enumerate(self.valores)}
+
+    def codificar(self, textos):
+        unicos, inverso = np.unique(np.asarray(textos).astype(str), return_inverse=True)
+        mapa = np.empty(len(unicos), dtype=np.uint32)
+        for i, valor in enumerate(unicos.tolist()):
+            codigo = self._codigos.get(valor)
+            if codigo is None:
+                codigo = self._codigos[valor] = len(self.valores)
+                self.valores.append(valor)
+            mapa[i] = codigo
+        return mapa[inverso.ravel()]
+
+    def decodificar(self, codigos):
+        return np.array(self.valores)[codigos]
+
+
+class RegistrosPacientes:
+    """
+    Conjunto de pacientes guardado en columnas tipadas y compactas:
+    categorías como códigos int8 (ver vectorizado.categorias_pacientes),
+    nombres como códigos en un DiccionarioTexto, UUID como 16 bytes, fechas
+    como días enteros y medidas con un decimal como décimas en int16.
+
+    Se comporta como la lista de diccionarios que retornaba
+    generar_datos_pacientes: admite len(), índices, rebanadas e iteración, y
+    cada fila se entrega como un diccionario con tipos de Python.
+    """
+    __slots__ = ("_columnas", "_diccionarios", "_n")
+
+    def __init__(self, columnas, diccionarios, n):
+        self._columnas = columnas
+        self._diccionarios = diccionarios
+        self._n = n
+
+    @classmethod
+    def desde_lotes(cls, lotes):
+        """Construye el contenedor a partir de lotes de columnas (iterar_lotes_pacientes)."""
+        diccionarios = {campo: DiccionarioTexto() for campo in columnas_texto}
+        partes = {campo: [] for campo in columnas_pacientes}
+        for lote in lotes:
+            for campo, valores in cls._compactar(lote, diccionarios).items():
+                partes[campo].append(valores)
+        columnas = {}
+        for campo, trozos in partes.items():
+            columnas[campo] = (np.concatenate(trozos) if trozos
+                               else cls._compactar_vacio(campo))
+        return cls(columnas, diccionarios, len(columnas["Edad"]))
+
+    @classmethod
+    def desde_columnas(cls, lote):
+        return cls.desde_lotes([lote])
+
+    @staticmethod
+    def _compactar(lote, diccionarios):
+        compacto = {}
+        for campo in columnas_pacientes:
+            valores = lote[campo]
+            if campo in categorias_pacientes:
+                compacto[campo] = codificar_categoria(valores, categorias_pacientes[campo])
+            elif campo in columnas_uuid:
+                compacto[campo] = uuids_a_bytes(valores)
+            elif campo in columnas_fecha:
+                compacto[campo] = np.asarray(valores, dtype="datetime64[D]").astype(np.int32)
+            elif campo in columnas_texto:
+                compacto[campo] = diccionarios[campo].codificar(valores)
+            elif campo in columnas_decimas:
+                compacto[campo] = np.round(np.asarray(valores) * 10).astype(columnas_decimas[campo])
+            else:
+                compacto[campo] = np.asarray(valores).astype(columnas_enteras[campo])
+        return compacto
+
+    @staticmethod
+    def _compactar_vacio(campo):
+        if campo in categorias_pacientes:
+            return np.empty(0, dtype=np.int8)
+        if campo in columnas_uuid:
+            return np.empty((0, 16), dtype=np.uint8)
+        if campo in columnas_fecha:
+            return np.empty(0, dtype=np.int32)
+        if campo in columnas_texto:
+            return np.empty(0, dtype=np.uint32)
+        return np.empty(0, dtype={**columnas_decimas, **columnas_enteras}[campo])
+
+    # -----------------------------
+    # Acceso por columnas
+    # -----------------------------
+    @property
+    def nbytes(self):
+        """Memoria ocupada por las columnas (sin contar los diccionarios de texto)."""
+        return sum(valores.nbytes for valores in self._columnas.values())
+
+    def codigos(self, campo):
+        """Columna tal como está guardada (códigos, bytes, días o décimas)."""
+        return self._columnas[campo]
+
+    def columna(self, campo):
+        """Columna decodificada, con los mismos valores que genera generar_columnas_pacientes."""
+        valores = self._columnas[campo]
+        if campo in categorias_pacientes:
+            return categorias_pacientes[campo][valores]
+        if campo in columnas_uuid:
+            return formatear_uuids(valores)
+        if campo in columnas_fecha:
+            return valores.astype("datetime64[D]")
+        if campo in columnas_texto:
+            return self._diccionarios[campo].decodificar(valores)
+        if campo in columnas_decimas:
+            return valores / 10
+        return valores.astype(np.int64)
+
+    def a_columnas(self):
+        """Diccionario {columna: np.ndarray} decodificado, como un lote de iterar_lotes_pacientes."""
+        return {campo: self.columna(campo) for campo in columnas_pacientes}
+
+    def categorias(self):
+        """Valores de cada columna guardada como códigos (categóricas y nombres)."""
+        return {**categorias_pacientes,
+                **{campo: np.array(self._diccionarios[campo].valores, dtype=str)
+                   for campo in columnas_texto}}
+
+    def a_columnas_codificadas(self):
+        """
+        Como a_columnas, pero para codificacion_csv: las columnas de
+        categorias() quedan como códigos, sin decodificarlas, y los UUID como
+        bytes ASCII ('S36').
+        """
+        codificadas = self.categorias()
+        lote = {}
+        for campo in columnas_pacientes:
+            if campo in codificadas:
+                lote[campo] = self._columnas[campo]
+            elif campo in columnas_uuid:
+                lote[campo] = formatear_uuids(self._columnas[campo], como_bytes=True)
+            else:
+                lote[campo] = self.columna(campo)
+        return lote
+
+    # -----------------------------
+    # Vista compatible con la lista de diccionarios
+    # -----------------------------
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            columnas = {campo: valores[indice] for campo, valores in self._columnas.items()}
+            return RegistrosPacientes(columnas, self._diccionarios, len(columnas["Edad"]))
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError("índice de paciente fuera de rango")
+        return next(iter(self[indice:indice + 1]))
+
+    def __iter__(self):
+        # Se decodifica por bloques para no crear todos los diccionarios a la vez
+        for inicio in range(0, self._n, _tamano_bloque):
+            bloque = self[inicio:inicio + _tamano_bloque]
+            valores = [bloque._valores_fila(campo) for campo in columnas_pacientes]
+            for fila in zip(*valores):
+                yield dict(zip(columnas_pacientes, fila))
+
+    def _valores_fila(self, campo):
+        # Las filas conservan las fechas como texto ISO, igual que antes
+        valores = self.columna(campo)
+        if campo in columnas_fecha:
+            valores = formatear_fechas(valores)
+        return valores.tolist()
+
+    def __repr__(self):
+        return f"<RegistrosPacientes: {self._n} pacientes, {self.nbytes} bytes>"
@@ -0,0 +1,159 @@
+"""
+Informe de gráficas sin ventana: dibuja todas las figuras de plots.py con el
+backend Agg, en paralelo, y las guarda como PNG o SVG en un directorio.
+
+    python -m medicDataGenerator.reporte consultas_pacientes.csv --out-dir images
+
+Cada figura depende solo de algunas partes del resumen (ver resumen.py). Su
+huella se guarda en <directorio>/.huellas_reporte.json y, si en la siguiente
+ejecución no cambió, la figura no se vuelve a dibujar.
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from medicDataGenerator.resumen import resumir_archivo
+
+# Formatos de imagen del informe
+formatos_imagen = ["png", "svg"]
+archivo_huellas = ".huellas_reporte.json"
+
+# Figuras del informe: nombre de archivo -> (función de plots, argumentos
+# extra, partes del resumen que usa). Los nombres son los de images/.
+figuras = {
+    "AlturaGenero": ("graficar_altura_por_genero", (),
+                     ["hist/Altura (cm)", "suma/Altura (cm)", "n/Altura (cm)"]),
+    "TipoSangre": ("graficar_tipos_sangre", (), ["conteos/Tipo de Sangre"]),
+    "PesoEdad": ("graficar_peso_edad", (), ["peso_edad"]),
+    "FumadorGenero": ("graficar_fumadores_por_genero", (), ["fumadores"]),
+    "FumadoresEdad": ("graficar_edad_fumadores", (), ["edad_fumadores"]),
+    "FRCardiaca": ("graficar_variable_por_rango", ("Frecuencia Cardíaca (lpm)",),
+                   ["suma/Frecuencia Cardíaca (lpm)", "n/Frecuencia Cardíaca (lpm)"]),
+    "PresionSistolica": ("graficar_variable_por_rango", ("Presión Sistólica",),
+                         ["suma/Presión Sistólica", "n/Presión Sistólica"]),
+    "FRRespiratoria": ("graficar_variable_por_rango", ("Frecuencia Respiratoria (rpm)",),
+                       ["suma/Frecuencia Respiratoria (rpm)", "n/Frecuencia Respiratoria (rpm)"]),
+    "Alcohol": ("graficar_consumo_alcohol", (), ["alcohol", "filas"]),
+    "EdadDiagnosticoALL": ("graficar_edad_diagnostico_ALL", (),
+                           ["hist/Edad de diagnóstico ALL (años)"]),
+}
+
+
+def huella_figura(resumen, nombre, formato):
+    """Huella (sha256) de las partes del resumen que usa la figura nombre."""
+    funcion, argumentos, entradas = figuras[nombre]
+    huella = hashlib.sha256(json.dumps([nombre, funcion, argumentos, formato]).encode())
+    for entrada in entradas:
+        huella.update(entrada.encode())
+        if entrada.startswith("conteos/"):
+            conteo = resumen.conteos[entrada.split("/", 1)[1]]
+            huella.update(json.dumps(sorted(conteo.items())).encode())
+        else:
+            huella.update(resumen.arreglos[entrada].tobytes())
+    return huella.hexdigest()
+
+
+def _iniciar_trabajador():
+    # Backend sin ventana y el estilo que plots.py aplica con la primera figura
+    import matplotlib
+    matplotlib.use("Agg")
+    import seaborn as sns
+    sns.set(style="whitegrid")
+
+
+def _dibujar(nombre, resumen, ruta):
+    import matplotlib.pyplot as plt
+    from medicDataGenerator import plots
+
+    funcion, argumentos, _ = figuras[nombre]
+    figura = getattr(plots, funcion)(resumen, *argumentos)
+    figura.savefig(ruta)
+    plt.close(figura)
+    return ruta
+
+
+def generar_reporte(resumen, directorio="images", formatos=("png",), trabajadores=None,
+                    forzar=False):
+    """
+    Guarda cada figura de figuras como <directorio>/<nombre>.<formato> a
+    partir de un ResumenPacientes, repartiendo el dibujo entre trabajadores
+    procesos. Las figuras cuya huella no cambió desde la última ejecución (y
+    cuyo archivo sigue existiendo) se omiten salvo con forzar=True.
+    Retorna {ruta: True si se dibujó, False si se omitió}.
+    """
+    for formato in formatos:
+        if formato not in formatos_imagen:
+            raise ValueError(f"formato de imagen desconocido: {formato!r} "
+                             f"(opciones: {', '.join(formatos_imagen)})")
+    os.makedirs(directorio, exist_ok=True)
+    ruta_huellas = os.path.join(directorio, archivo_huellas)
+    try:
+        with open(ruta_huellas, encoding="utf-8") as archivo:
+            anteriores = json.load(archivo)
+    except (FileNotFoundError, ValueError):
+        anteriores = {}
+
+    huellas, pendientes, resultado = {}, [], {}
+    for nombre in figuras:
+        for formato in formatos:
+            archivo = f"{nombre}.{formato}"
+            ruta = os.path.join(directorio, archivo)
+            huellas[archivo] = huella_figura(resumen, nombre, formato)
+            cambio = anteriores.get(archivo) != huellas[archivo] or not os.path.exists(ruta)
+            if forzar or cambio:
+                pendientes.append((nombre, resumen, ruta))
+            resultado[ruta] = forzar or cambio
+
+    trabajadores = min(trabajadores or os.cpu_count() or 1, len(pendientes))
+    if trabajadores == 1:
+        # En el mismo proceso: también queda con el backend Agg
+        _iniciar_trabajador()
+        for argumentos in pendientes:
+            _dibujar(*argumentos)
+    elif trabajadores > 1:
+        with ProcessPoolExecutor(max_workers=trabajadores,
+                                 initializer=_iniciar_trabajador) as pool:
+            for futuro in [pool.submit(_dibujar, *argumentos) for argumentos in pendientes]:
+                futuro.result()
+
+    # Las huellas se guardan solo cuando todas las figuras se dibujaron bien
+    with open(ruta_huellas, "w", encoding="utf-8") as archivo:
+        json.dump({**anteriores, **huellas}, archivo, indent=2, sort_keys=True)
+    return resultado
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m medicDataGenerator.reporte",
+        description="Dibuja las gráficas del conjunto de datos sin abrir ventanas.")
+    parser.add_argument("archivo", nargs="?", default="consultas_pacientes.csv",
+                        help="datos generados (csv, parquet, arrow o npz)")
+    parser.add_argument("--out-dir", default="images",
+                        help="directorio de las imágenes (por defecto images)")
+    parser.add_argument("--format", nargs="+", choices=formatos_imagen, default=["png"],
+                        help="formatos de imagen (por defecto png)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos de dibujo (por defecto uno por CPU)")
+    parser.add_argument("--batch-size", type=int, default=100000,
+                        help="filas leídas por bloque (por defecto 100000)")
+    parser.add_argument("--force", action="store_true",
+                        help="dibujar todas las figuras aunque no hayan cambiado")
+    return parser
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    if (args.workers is not None and args.workers < 1) or args.batch_size < 1:
+        construir_parser().error("--workers y --batch-size deben ser >= 1")
+    resumen = resumir_archivo(args.archivo, tamano_bloque=args.batch_size)
+    resultado = generar_reporte(resumen, args.out_dir, args.format, args.workers, args.force)
+    dibujadas = sum(resultado.values())
+    print(f"{dibujadas} figuras generadas, {len(resultado) - dibujadas} sin cambios "
+          f"en {args.out_dir}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
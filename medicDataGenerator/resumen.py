@@ -0,0 +1,536 @@
+"""
+Estadísticas de un conjunto de pacientes calculadas en una sola pasada.
+
+ResumenPacientes acumula, lote a lote, todo lo que necesitan las gráficas
+de plots.py: conteos de las columnas categóricas, filas, fumadores y
+consumidores de alcohol por rango de edad y género, sumas para las medias
+por rango de edad e histogramas de las variables numéricas, más una muestra
+de tamaño fijo de (Edad, Peso). Los resúmenes de distintos fragmentos se
+combinan sumándolos, de modo que un archivo de cualquier tamaño se procesa
+por bloques sin cargarlo completo en memoria.
+
+Al escribir un archivo, el generador guarda también su resumen en
+<archivo>.resumen.json (ver guardar_resumen); resumir_archivo lo usa en
+lugar de releer los datos mientras corresponda al archivo.
+
+Las densidades se estiman sobre los histogramas (densidad_histograma), así
+que el costo de graficar no depende del número de filas.
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+from medicDataGenerator.codificacion_csv import separar_extension
+from medicDataGenerator.telemetria import medidor
+from medicDataGenerator.vectorizado import (
+    columnas_enteras, columnas_reales, categorias_pacientes, codificar_categoria)
+
+# Rangos de edad de plots.py: hasta 11, 18, 40 y 65 años (inclusive), y 66+
+rangos_edad = ["Niños (0-11)", "Jóvenes (12-18)", "Adultos jóvenes (19-40)",
+               "Adultos (41-65)", "Mayores (66+)"]
+limites_rangos_edad = np.array([11, 18, 40, 65])
+
+# Géneros normalizados (minúsculas, sin espacios); las filas con otro valor se ignoran
+generos_resumen = ["masculino", "femenino"]
+
+# Columnas de las que se cuentan los valores
+columnas_conteo = ["Tipo de Sangre", "Fumador", "Consume Alcohol", "Tipo de Visita",
+                   "Evaluación Temperatura", "Evaluación Presión", "Evaluación FC"]
+
+# Variables con media por rango de edad y género
+columnas_media = columnas_enteras + columnas_reales
+
+# Histogramas por género: (primer valor, último valor, ancho). Cada casilla
+# está centrada en un valor de la malla, así que con el ancho igual a la
+# resolución de los datos (1 o 0.1) el histograma no pierde información.
+# Los valores fuera del intervalo se acumulan en la primera o última casilla.
+histogramas = {
+    "Edad": (0, 100, 1),
+    "Altura (cm)": (100, 230, 0.1),
+    "Peso (kg)": (0, 200, 0.1),
+    "Temperatura (°C)": (34, 42, 0.1),
+    "Presión Sistólica": (40, 220, 1),
+    "Presión Diastólica": (30, 140, 1),
+    "Frecuencia Cardíaca (lpm)": (20, 220, 1),
+    "Frecuencia Respiratoria (rpm)": (5, 80, 1),
+    "Edad de diagnóstico ALL (años)": (0, 100, 0.1),
+}
+
+# Histograma conjunto de Edad (filas) y Peso (columnas) para la dispersión
+malla_peso_edad = {"Edad": (0, 100, 1), "Peso (kg)": (0, 200, 1)}
+
+# Filas que conserva la muestra de (Edad, Peso)
+tamano_muestra = 5000
+columnas_muestra = ["Edad", "Peso (kg)"]
+
+# Columnas que se leen del archivo para construir el resumen
+columnas_resumen = list(dict.fromkeys(
+    ["Género", "Edad"] + columnas_conteo + columnas_media + list(histogramas)))
+
+
+def rango_edad_array(edades):
+    """Código (posición en rangos_edad) del rango de cada edad."""
+    return np.searchsorted(limites_rangos_edad, np.asarray(edades, dtype=np.float64))
+
+
+def casillas(inicio, fin, ancho):
+    """Número de casillas y sus centros para un intervalo (inicio, fin, ancho) de histogramas."""
+    n = int(round((fin - inicio) / ancho)) + 1
+    return n, inicio + ancho * np.arange(n)
+
+
+def _indices(valores, inicio, fin, ancho):
+    n, _ = casillas(inicio, fin, ancho)
+    return np.clip(np.rint((valores - inicio) / ancho), 0, n - 1).astype(np.int64)
+
+
+def _codigos_genero(valores):
+    # Camino rápido: los valores tal como los escribe el generador
+    try:
+        return codificar_categoria(valores, categorias_pacientes["Género"]).astype(np.int64)
+    except ValueError:
+        pass
+    # Si no, se normaliza cada valor distinto una sola vez, no cada fila
+    unicos, inverso = np.unique(np.asarray(valores).astype(str), return_inverse=True)
+    mapa = np.array([generos_resumen.index(v) if v in generos_resumen else -1
+                     for v in np.char.lower(np.char.strip(unicos)).tolist()], dtype=np.int64)
+    return mapa[inverso.ravel()] if len(unicos) else np.empty(0, dtype=np.int64)
+
+
+def _contar(valores, campo):
+    """{valor: conteo} de una columna categórica."""
+    try:
+        # Con las categorías conocidas basta un bincount de los códigos
+        categorias = categorias_pacientes[campo]
+        conteos = np.bincount(codificar_categoria(valores, categorias), minlength=len(categorias))
+        return {v: c for v, c in zip(categorias.tolist(), conteos.tolist()) if c}
+    except ValueError:
+        valores, conteos = np.unique(np.asarray(valores).astype(str), return_counts=True)
+        return dict(zip(valores.tolist(), conteos.tolist()))
+
+
+def densidad_histograma(centros, conteos, ancho_banda=None, corte=3):
+    """
+    Estimación de densidad por kernel gaussiano sobre un histograma de casillas
+    uniformes, calculada como una convolución con FFT: el costo depende del
+    número de casillas y no del de filas. Sin ancho_banda se usa la regla de
+    Scott (desviación * n ** -1/5), como seaborn, y la curva abarca los datos
+    más corte anchos de banda a cada lado. Retorna (x, densidad).
+    """
+    centros = np.asarray(centros, dtype=np.float64)
+    conteos = np.asarray(conteos, dtype=np.float64)
+    ancho = centros[1] - centros[0]
+    n = conteos.sum()
+    if n == 0:
+        return centros, np.zeros_like(centros)
+    if ancho_banda is None:
+        media = (centros * conteos).sum() / n
+        desv = np.sqrt(((centros - media) ** 2 * conteos).sum() / n)
+        ancho_banda = desv * n ** (-1 / 5)
+    # El kernel no puede ser más angosto que una casilla
+    ancho_banda = max(ancho_banda, ancho)
+
+    # El kernel se trunca a 6 anchos de banda, donde su peso ya es despreciable
+    extra = int(np.ceil(max(corte, 6) * ancho_banda / ancho))
+    conteos = np.pad(conteos, extra)
+    x = centros[0] + ancho * (np.arange(len(conteos)) - extra)
+    kernel = np.exp(-0.5 * (ancho * np.arange(-extra, extra + 1) / ancho_banda) ** 2)
+    largo = len(conteos) + len(kernel) - 1
+    convolucion = np.fft.irfft(np.fft.rfft(conteos, largo) * np.fft.rfft(kernel, largo), largo)
+    densidad = convolucion[extra:extra + len(conteos)] / (n * ancho_banda * np.sqrt(2 * np.pi))
+    # Como seaborn, la curva se corta a corte anchos de banda de los datos
+    ocupadas = np.flatnonzero(conteos)
+    margen = int(np.ceil(corte * ancho_banda / ancho))
+    tramo = slice(ocupadas[0] - margen, ocupadas[-1] + margen + 1)
+    return x[tramo], np.maximum(densidad[tramo], 0)
+
+
+def _entropia(semilla):
+    # Lista de enteros que identifica una semilla de ResumenPacientes
+    if isinstance(semilla, np.random.SeedSequence):
+        return [int(valor) for valor in semilla.generate_state(4)]
+    if isinstance(semilla, (list, tuple, np.ndarray)):
+        return [int(valor) for valor in semilla]
+    return [int(semilla)]
+
+
+class ResumenPacientes:
+    """
+    Acumulador de estadísticas de pacientes. actualizar() agrega un lote
+    ({columna: valores}, por ejemplo de iterar_lotes_pacientes o un bloque
+    de pandas) y combinar() suma dos resúmenes; el resultado no depende de
+    cómo se partan los datos.
+
+    La muestra de (Edad, Peso) conserva las tamano_muestra filas con menor
+    clave aleatoria, lo que equivale a un muestreo uniforme sin reemplazo que
+    también se puede combinar. Las claves salen de semilla (un entero, una
+    lista de enteros o una np.random.SeedSequence), así que un mismo archivo
+    produce siempre el mismo resumen; la semilla de un resumen combinado se
+    deriva de las de ambos.
+    """
+    __slots__ = ("conteos", "arreglos", "muestra", "tamano_muestra", "semilla", "_rng")
+
+    def __init__(self, semilla=0, tamano_muestra=tamano_muestra):
+        self.tamano_muestra = tamano_muestra
+        # Sin semilla se fija una al azar, para poder derivar la de combinar()
+        self.semilla = np.random.SeedSequence() if semilla is None else semilla
+        self._rng = np.random.default_rng(self.semilla)
+        self.muestra = {campo: np.empty(0) for campo in ["clave"] + columnas_muestra}
+        forma = (len(rangos_edad), len(generos_resumen))
+        self.conteos = {campo: Counter() for campo in columnas_conteo}
+        self.arreglos = {
+            "filas": np.zeros(forma, dtype=np.int64),
+            "fumadores": np.zeros(forma, dtype=np.int64),
+            "alcohol": np.zeros(forma, dtype=np.int64),
+            "edad_fumadores": np.zeros((len(generos_resumen), casillas(*histogramas["Edad"])[0]),
+                                       dtype=np.int64),
+            "peso_edad": np.zeros([casillas(*malla_peso_edad[c])[0] for c in malla_peso_edad],
+                                  dtype=np.int64),
+        }
+        for campo in columnas_media:
+            self.arreglos["suma/" + campo] = np.zeros(forma)
+            self.arreglos["n/" + campo] = np.zeros(forma, dtype=np.int64)
+        for campo, intervalo in histogramas.items():
+            self.arreglos["hist/" + campo] = np.zeros(
+                (len(generos_resumen), casillas(*intervalo)[0]), dtype=np.int64)
+
+    # -----------------------------
+    # Acumulación
+    # -----------------------------
+    def actualizar(self, lote):
+        """Agrega las filas de un lote {columna: valores}; retorna el mismo resumen."""
+        # Solo cuentan las filas con género reconocido y edad numérica
+        genero = _codigos_genero(lote["Género"])
+        edades = np.asarray(lote["Edad"], dtype=np.float64)
+        validas = (genero >= 0) & ~np.isnan(edades)
+        genero, edades = genero[validas], edades[validas]
+        clave = rango_edad_array(edades) * len(generos_resumen) + genero
+        forma = self.arreglos["filas"].shape
+
+        def por_grupo(claves, pesos=None):
+            return np.bincount(claves, pesos, minlength=forma[0] * forma[1]).reshape(forma)
+
+        self.arreglos["filas"] += por_grupo(clave)
+        fumador = np.asarray(lote["Fumador"])[validas] == "Sí"
+        alcohol = np.asarray(lote["Consume Alcohol"])[validas] == "Sí"
+        self.arreglos["fumadores"] += por_grupo(clave[fumador])
+        self.arreglos["alcohol"] += por_grupo(clave[alcohol])
+
+        for campo in columnas_conteo:
+            self.conteos[campo].update(_contar(np.asarray(lote[campo])[validas], campo))
+
+        for campo in columnas_media:
+            valores = np.asarray(lote[campo], dtype=np.float64)[validas]
+            presentes = ~np.isnan(valores)
+            self.arreglos["suma/" + campo] += por_grupo(clave[presentes], valores[presentes])
+            self.arreglos["n/" + campo] += por_grupo(clave[presentes])
+
+        for campo, intervalo in histogramas.items():
+            valores = np.asarray(lote[campo], dtype=np.float64)[validas]
+            presentes = ~np.isnan(valores)
+            self._histograma(campo, genero[presentes], _indices(valores[presentes], *intervalo))
+
+        indices_edad = _indices(edades, *histogramas["Edad"])
+        n = self.arreglos["edad_fumadores"].shape[1]
+        self.arreglos["edad_fumadores"] += np.bincount(
+            genero[fumador] * n + indices_edad[fumador], minlength=2 * n).reshape(2, n)
+
+        pesos = np.asarray(lote["Peso (kg)"], dtype=np.float64)[validas]
+        presentes = ~np.isnan(pesos)
+        filas, columnas = self.arreglos["peso_edad"].shape
+        celda = (_indices(edades[presentes], *malla_peso_edad["Edad"]) * columnas
+                 + _indices(pesos[presentes], *malla_peso_edad["Peso (kg)"]))
+        self.arreglos["peso_edad"] += np.bincount(
+            celda, minlength=filas * columnas).reshape(filas, columnas)
+
+        nueva = {"clave": self._rng.random(len(edades)), "Edad": edades, "Peso (kg)": pesos}
+        self.muestra = self._recortar_muestra(self.muestra, nueva)
+        return self
+
+    def _recortar_muestra(self, *muestras):
+        muestra = {campo: np.concatenate([m[campo] for m in muestras]) for campo in self.muestra}
+        if len(muestra["clave"]) > self.tamano_muestra:
+            menores = np.argpartition(muestra["clave"], self.tamano_muestra)[:self.tamano_muestra]
+            muestra = {campo: valores[menores] for campo, valores in muestra.items()}
+        return muestra
+
+    def actualizar_filas(self, filas):
+        """Agrega una lista de filas como diccionarios (las de generar_datos_pacientes)."""
+        if filas:
+            self.actualizar({campo: np.array([fila[campo] for fila in filas])
+                             for campo in columnas_resumen})
+        return self
+
+    def _histograma(self, campo, genero, indices):
+        hist = self.arreglos["hist/" + campo]
+        n = hist.shape[1]
+        hist += np.bincount(genero * n + indices, minlength=hist.size).reshape(hist.shape)
+
+    def combinar(self, otro):
+        """
+        Nuevo resumen con las filas de ambos. Su semilla sale de las de los
+        dos (sin importar el orden), así que las claves de las filas que se le
+        agreguen después no repiten las de ninguna de las partes.
+        """
+        entropias = sorted([_entropia(self.semilla), _entropia(otro.semilla)])
+        resultado = ResumenPacientes(np.random.SeedSequence(entropias[0] + entropias[1]),
+                                     min(self.tamano_muestra, otro.tamano_muestra))
+        resultado.muestra = resultado._recortar_muestra(self.muestra, otro.muestra)
+        for campo in columnas_conteo:
+            resultado.conteos[campo] = self.conteos[campo] + otro.conteos[campo]
+        for nombre in self.arreglos:
+            resultado.arreglos[nombre] = self.arreglos[nombre] + otro.arreglos[nombre]
+        return resultado
+
+    # -----------------------------
+    # Consultas
+    # -----------------------------
+    @property
+    def filas(self):
+        return int(self.arreglos["filas"].sum())
+
+    def frecuencias(self, campo, valores=None):
+        """Proporción de cada valor de campo, en el orden de valores (por defecto los vistos)."""
+        conteo = self.conteos[campo]
+        valores = sorted(conteo) if valores is None else valores
+        total = sum(conteo.values())
+        return np.array([conteo.get(v, 0) / total if total else 0.0 for v in valores])
+
+    def media_por_rango(self, campo):
+        """Media de campo en cada rango de edad (NaN en los rangos sin datos)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.arreglos["suma/" + campo].sum(axis=1)
+                    / self.arreglos["n/" + campo].sum(axis=1))
+
+    def media_por_genero(self, campo):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.arreglos["suma/" + campo].sum(axis=0)
+                    / self.arreglos["n/" + campo].sum(axis=0))
+
+    def proporcion(self, nombre):
+        """Proporción de 'fumadores' o 'alcohol' por rango de edad (filas) y género (columnas)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.arreglos[nombre] / self.arreglos["filas"]
+
+    def histograma(self, campo, genero=None):
+        """
+        Retorna (centros, conteos) del histograma de campo para un género
+        ('masculino' o 'femenino') o para ambos si genero es None.
+        """
+        hist = self.arreglos["hist/" + campo]
+        conteos = hist.sum(axis=0) if genero is None else hist[generos_resumen.index(genero)]
+        return casillas(*histogramas[campo])[1], conteos
+
+    def densidad(self, campo, genero=None, ancho_banda=None):
+        """Densidad estimada de campo (ver densidad_histograma); retorna (x, densidad)."""
+        return densidad_histograma(*self.histograma(campo, genero), ancho_banda)
+
+    # -----------------------------
+    # Serialización
+    # -----------------------------
+    def a_diccionario(self):
+        """Diccionario con tipos de JSON que desde_diccionario convierte de vuelta."""
+        return {
+            "conteos": {campo: dict(conteo) for campo, conteo in self.conteos.items()},
+            "arreglos": {nombre: valores.tolist() for nombre, valores in self.arreglos.items()},
+            "tamano_muestra": self.tamano_muestra,
+            "semilla": _entropia(self.semilla),
+            "muestra": {campo: valores.tolist() for campo, valores in self.muestra.items()},
+        }
+
+    @classmethod
+    def desde_diccionario(cls, datos):
+        """
+        Resumen a partir de a_diccionario(). Lanza ValueError si no coincide
+        con la estructura actual (por ejemplo, si cambiaron los histogramas).
+        """
+        resumen = cls(datos.get("semilla", 0), datos["tamano_muestra"])
+        if set(datos["arreglos"]) != set(resumen.arreglos):
+            raise ValueError("el resumen guardado no tiene las estadísticas actuales")
+        for nombre, vacio in resumen.arreglos.items():
+            valores = np.array(datos["arreglos"][nombre], dtype=vacio.dtype)
+            if valores.shape != vacio.shape:
+                raise ValueError(f"forma distinta en {nombre!r}: {valores.shape} != {vacio.shape}")
+            resumen.arreglos[nombre] = valores
+        for campo in columnas_conteo:
+            resumen.conteos[campo] = Counter(datos["conteos"][campo])
+        resumen.muestra = {campo: np.array(datos["muestra"][campo], dtype=np.float64)
+                           for campo in resumen.muestra}
+        return resumen
+
+    def __repr__(self):
+        return f"<ResumenPacientes: {self.filas} pacientes>"
+
+
+# -----------------------------
+# Resumen guardado junto al archivo
+# -----------------------------
+version_resumen = 1
+
+
+def ruta_resumen(nombre_archivo):
+    return nombre_archivo + ".resumen.json"
+
+
+def huella_encadenada(anterior, huella_segmento):
+    """Huella de un archivo con huella anterior al que se agregó un segmento con huella_segmento."""
+    return hashlib.sha256((anterior + huella_segmento).encode("ascii")).hexdigest()
+
+
+def huella_archivo(nombre_archivo, segmentos=None, tamano_bloque=1 << 20):
+    """
+    sha256 del contenido del archivo. Si el archivo se escribió por partes
+    (segmentos: la posición en que termina cada una), la de la primera
+    parte se encadena con las de las siguientes (ver huella_encadenada).
+    """
+    fines = list(segmentos or [])[:-1] + [None]
+    resultado = None
+    with open(nombre_archivo, 'rb') as archivo:
+        for fin in fines:
+            huella = hashlib.sha256()
+            while fin is None or archivo.tell() < fin:
+                bloque = archivo.read(tamano_bloque if fin is None
+                                      else min(tamano_bloque, fin - archivo.tell()))
+                if not bloque:
+                    break
+                huella.update(bloque)
+            resultado = (huella.hexdigest() if resultado is None
+                         else huella_encadenada(resultado, huella.hexdigest()))
+    return resultado
+
+
+def guardar_resumen(resumen, nombre_archivo, parametros=None, huella=None, segmentos=None):
+    """
+    Guarda el resumen de nombre_archivo en ruta_resumen(nombre_archivo),
+    identificado por el sha256, tamaño y fecha de modificación del archivo y
+    por los parámetros de generación. huella es el sha256 (hexadecimal)
+    calculado mientras se escribía el archivo; sin ella el archivo se lee
+    de nuevo. segmentos, en un archivo al que se agregaron filas, son las
+    posiciones en que termina cada parte escrita (ver huella_archivo).
+    Retorna la ruta del resumen.
+    """
+    estado = os.stat(nombre_archivo)
+    datos = {
+        "nombre": os.path.basename(nombre_archivo),
+        "bytes": estado.st_size,
+        "mtime_ns": estado.st_mtime_ns,
+        "sha256": huella or huella_archivo(nombre_archivo, segmentos),
+    }
+    if segmentos and len(segmentos) > 1:
+        datos["segmentos"] = [int(fin) for fin in segmentos]
+    contenido = {
+        "version": version_resumen,
+        "archivo": datos,
+        "parametros": parametros or {},
+        "resumen": resumen.a_diccionario(),
+    }
+    ruta = ruta_resumen(nombre_archivo)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(contenido, archivo, ensure_ascii=False)
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def leer_resumen_guardado(nombre_archivo, parametros=None, verificar=False):
+    """
+    Como cargar_resumen, pero retorna (resumen, datos del archivo): un
+    diccionario con "sha256", "bytes" y, si se escribió por partes,
+    "segmentos". Sirve para agregar filas al archivo y extender su huella
+    sin leerlo (ver huella_encadenada).
+    """
+    try:
+        with open(ruta_resumen(nombre_archivo), encoding="utf-8") as archivo:
+            contenido = json.load(archivo)
+        estado = os.stat(nombre_archivo)
+    except (FileNotFoundError, ValueError):
+        return None
+    datos = contenido.get("archivo", {})
+    if contenido.get("version") != version_resumen or datos.get("bytes") != estado.st_size:
+        return None
+    if parametros is not None and contenido.get("parametros") != parametros:
+        return None
+    if (verificar or datos.get("mtime_ns") != estado.st_mtime_ns) \
+            and datos.get("sha256") != huella_archivo(nombre_archivo, datos.get("segmentos")):
+        return None
+    try:
+        return ResumenPacientes.desde_diccionario(contenido["resumen"]), datos
+    except (KeyError, ValueError):
+        return None
+
+
+def cargar_resumen(nombre_archivo, parametros=None, verificar=False):
+    """
+    Resumen guardado de nombre_archivo, o None si no existe o ya no le
+    corresponde. Si el tamaño y la fecha de modificación coinciden no se lee
+    el archivo; si la fecha cambió (o con verificar=True) se compara el
+    sha256. Con parametros, también deben coincidir los de la generación.
+    """
+    guardado = leer_resumen_guardado(nombre_archivo, parametros, verificar)
+    return None if guardado is None else guardado[0]
+
+
+# -----------------------------
+# Lectura por bloques
+# -----------------------------
+def resumir_lotes(lotes, semilla=0):
+    """Resumen de una secuencia de lotes de columnas."""
+    resumen = ResumenPacientes(semilla)
+    for lote in lotes:
+        resumen.actualizar(lote)
+    return resumen
+
+
+def resumen_anterior(nombre_archivo):
+    """
+    Resumen de nombre_archivo antes de agregarle filas (ver resumir_archivo),
+    o None si no existe o está vacío.
+    """
+    if not os.path.exists(nombre_archivo) or not os.path.getsize(nombre_archivo):
+        return None
+    return resumir_archivo(nombre_archivo)
+
+
+def lotes_con_resumen(lotes, resumen, telemetria=None):
+    """Entrega los mismos lotes y los agrega a resumen a medida que pasan."""
+    medir = medidor(telemetria)
+    for lote in lotes:
+        with medir("resumen", len(lote["Edad"])):
+            resumen.actualizar(lote)
+        yield lote
+
+
+def _bloques_csv(nombre_archivo, tamano_bloque):
+    import pandas as pd
+
+    numericas = set(columnas_media) | set(histogramas)
+    for bloque in pd.read_csv(nombre_archivo, usecols=columnas_resumen, chunksize=tamano_bloque,
+                              dtype={campo: str for campo in ["Género"] + columnas_conteo}):
+        # Los valores no numéricos se descartan, como pd.to_numeric(errors='coerce')
+        yield {campo: (pd.to_numeric(bloque[campo], errors="coerce").to_numpy(np.float64)
+                       if campo in numericas else bloque[campo].fillna("").to_numpy())
+               for campo in columnas_resumen}
+
+
+def resumir_archivo(nombre_archivo, formato=None, tamano_bloque=100000, semilla=0,
+                    usar_guardado=True):
+    """
+    Resumen de un archivo escrito por el generador. Si tiene un resumen
+    guardado vigente (ver cargar_resumen) se usa ese; si no, el archivo se lee
+    por bloques de tamano_bloque filas. formato se deduce de la extensión si
+    no se indica (.csv.gz y .csv.zst también son CSV); los CSV se leen con
+    pandas y los formatos binarios con escritores.leer_lotes.
+    """
+    if usar_guardado:
+        resumen = cargar_resumen(nombre_archivo)
+        if resumen is not None:
+            return resumen
+    if formato is None:
+        formato = separar_extension(nombre_archivo)[1].lstrip(".").lower().split(".")[0]
+    if formato == "csv":
+        return resumir_lotes(_bloques_csv(nombre_archivo, tamano_bloque), semilla)
+    from medicDataGenerator.escritores import leer_lotes
+    return resumir_lotes(leer_lotes(nombre_archivo, formato, tamano_bloque), semilla)
@@ -0,0 +1,266 @@
+"""
+Servicio local que entrega pacientes sintéticos por HTTP a medida que se generan.
+
+    python -m medicDataGenerator.servicio --port 8765
+    python -m medicDataGenerator.servicio --unix /tmp/pacientes.sock
+
+    curl 'http://127.0.0.1:8765/pacientes?rows=100000&seed=1&format=csv'
+    curl --unix-socket /tmp/pacientes.sock 'http://localhost/pacientes?rows=10'
+
+GET /pacientes acepta rows (por defecto 1000), seed, format (ndjson o csv)
+y date (AAAA-MM-DD, el día desde el que se cuentan las consultas). La
+respuesta se envía con Transfer-Encoding: chunked, un trozo por lote.
+
+Los lotes se generan y codifican (ver codificacion_csv) en un grupo de
+procesos, unos cuantos por delante del que se está enviando; el primero es
+pequeño para que los primeros datos lleguen en milisegundos. Si el cliente
+lee más despacio de lo que se genera, writer.drain() espera y no se piden
+más lotes: la memoria usada por conexión queda acotada. Para una misma
+semilla (y los mismos tamaños de lote) la respuesta es idéntica byte a byte.
+GET /salud responde "ok". Solo usa la biblioteca estándar y NumPy.
+"""
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from medicDataGenerator.vectorizado import (
+    columnas_pacientes, generar_columnas_pacientes, dia_referencia)
+from medicDataGenerator.codificacion_csv import codificar_lote, codificar_ndjson, encabezado
+
+# Formatos de respuesta y su Content-Type
+formatos = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+filas_por_defecto = 1000
+maximo_filas = 100_000_000
+
+_razones = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+_maximo_encabezados = 100
+
+
+def _preparar_trabajador():
+    # Carga las listas de nombres antes de la primera solicitud
+    from medicDataGenerator.nombres import cargar_nombres
+    cargar_nombres()
+
+
+def generar_trozo(inicio, cantidad, entropia, indice, fecha_referencia, formato):
+    """
+    Filas inicio..inicio+cantidad codificadas en formato. Cada lote usa su
+    propia SeedSequence (entropia, indice), así que no depende de los demás.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(entropia, spawn_key=(indice,)))
+    lote = generar_columnas_pacientes(cantidad, rng, inicio, fecha_referencia)
+    if formato == "csv":
+        return codificar_lote(lote, columnas_pacientes)
+    return codificar_ndjson(lote, columnas_pacientes)
+
+
+def dividir_lotes(filas, tamano_lote, primer_lote):
+    """(inicio, cantidad) de cada lote: el primero de primer_lote filas y el resto de tamano_lote."""
+    lotes, inicio = [], 0
+    while inicio < filas:
+        cantidad = min(primer_lote if inicio == 0 else tamano_lote, filas - inicio)
+        lotes.append((inicio, cantidad))
+        inicio += cantidad
+    return lotes
+
+
+class SolicitudInvalida(ValueError):
+    """Parámetros de una solicitud que no se pueden atender (respuesta 400)."""
+
+
+def leer_parametros(consulta):
+    """Valida los parámetros de GET /pacientes; retorna (filas, semilla, formato, fecha)."""
+    valores = {clave: lista[-1] for clave, lista in parse_qs(consulta).items()}
+    desconocidos = set(valores) - {"rows", "seed", "format", "date"}
+    if desconocidos:
+        raise SolicitudInvalida(f"parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+    try:
+        filas = int(valores.get("rows", filas_por_defecto))
+        semilla = int(valores["seed"]) if "seed" in valores else None
+        fecha = date.fromisoformat(valores["date"]) if "date" in valores else None
+    except ValueError as error:
+        raise SolicitudInvalida(f"parámetro inválido: {error}")
+    if not 0 <= filas <= maximo_filas:
+        raise SolicitudInvalida(f"rows debe estar entre 0 y {maximo_filas}")
+    if semilla is not None and semilla < 0:
+        raise SolicitudInvalida("seed debe ser >= 0")
+    formato = valores.get("format", "ndjson")
+    if formato not in formatos:
+        raise SolicitudInvalida(f"formato desconocido: {formato!r} "
+                                f"(opciones: {', '.join(formatos)})")
+    return filas, semilla, formato, fecha
+
+
+class ServicioPacientes:
+    """
+    Servidor HTTP asyncio (TCP o socket Unix) que genera los pacientes en un
+    grupo de trabajadores procesos. adelanto es el número de lotes que se
+    generan por delante del que se envía (por defecto dos por trabajador).
+    """
+
+    def __init__(self, trabajadores=None, tamano_lote=20000, primer_lote=1000, adelanto=None):
+        if tamano_lote < 1 or primer_lote < 1:
+            raise ValueError("tamano_lote y primer_lote deben ser >= 1")
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.tamano_lote, self.primer_lote = tamano_lote, primer_lote
+        self.adelanto = adelanto or 2 * self.trabajadores
+        self.grupo = None
+        self.servidor = None
+
+    async def iniciar(self, host="127.0.0.1", puerto=8765, unix=None):
+        """Crea el grupo de trabajadores (ya con los nombres cargados) y abre el servidor."""
+        self.grupo = ProcessPoolExecutor(max_workers=self.trabajadores,
+                                         initializer=_preparar_trabajador)
+        # Arranca los procesos antes de aceptar conexiones
+        await asyncio.gather(*(asyncio.wrap_future(self.grupo.submit(_preparar_trabajador))
+                               for _ in range(self.trabajadores)))
+        if unix is not None:
+            self.servidor = await asyncio.start_unix_server(self._atender, path=unix)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self.servidor
+
+    @property
+    def direccion(self):
+        """(host, puerto) o ruta del socket en que escucha el servidor."""
+        return self.servidor.sockets[0].getsockname()
+
+    async def cerrar(self):
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        if self.grupo is not None:
+            self.grupo.shutdown(wait=True, cancel_futures=True)
+
+    async def _atender(self, lector, escritor):
+        try:
+            try:
+                linea = await lector.readline()
+                for _ in range(_maximo_encabezados):
+                    if (await lector.readline()) in (b"\r\n", b"\n", b""):
+                        break
+            except (ValueError, asyncio.LimitOverrunError):
+                # Una línea más larga que el límite del lector (64 KiB)
+                await self._responder(escritor, 400, "línea de solicitud o encabezado "
+                                                     "demasiado largo\n")
+                return
+            partes = linea.decode("latin-1").split()
+            if len(partes) != 3:
+                await self._responder(escritor, 400, "solicitud mal formada\n")
+            elif partes[0] != "GET":
+                await self._responder(escritor, 405, "solo se acepta GET\n")
+            else:
+                await self._despachar(escritor, urlsplit(partes[1]))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # El cliente cerró la conexión: los lotes pendientes se descartan
+            pass
+        finally:
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _despachar(self, escritor, url):
+        if url.path == "/salud":
+            await self._responder(escritor, 200, "ok\n")
+        elif url.path == "/pacientes":
+            try:
+                parametros = leer_parametros(url.query)
+            except SolicitudInvalida as error:
+                await self._responder(escritor, 400, f"{error}\n")
+                return
+            await self._enviar_pacientes(escritor, *parametros)
+        else:
+            await self._responder(escritor, 404, "rutas: /pacientes, /salud\n")
+
+    async def _responder(self, escritor, estado, texto):
+        cuerpo = texto.encode("utf-8")
+        escritor.write(f"HTTP/1.1 {estado} {_razones[estado]}\r\n"
+                       f"Content-Type: text/plain; charset=utf-8\r\n"
+                       f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n"
+                       .encode("latin-1") + cuerpo)
+        await escritor.drain()
+
+    async def _enviar_pacientes(self, escritor, filas, semilla, formato, fecha):
+        # La fecha y la semilla se fijan una vez para todos los lotes
+        entropia = np.random.SeedSequence(semilla).entropy
+        fecha = dia_referencia(fecha)
+        escritor.write(f"HTTP/1.1 200 OK\r\nContent-Type: {formatos[formato]}\r\n"
+                       f"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+                       .encode("latin-1"))
+        if formato == "csv":
+            _escribir_trozo(escritor, encabezado(columnas_pacientes))
+        await escritor.drain()
+
+        lotes = iter(enumerate(dividir_lotes(filas, self.tamano_lote, self.primer_lote)))
+        pendientes = []
+        try:
+            while True:
+                while len(pendientes) < self.adelanto:
+                    siguiente = next(lotes, None)
+                    if siguiente is None:
+                        break
+                    indice, (inicio, cantidad) = siguiente
+                    pendientes.append(self.grupo.submit(generar_trozo, inicio, cantidad, entropia,
+                                                        indice, fecha, formato))
+                if not pendientes:
+                    break
+                _escribir_trozo(escritor, await asyncio.wrap_future(pendientes.pop(0)))
+                await escritor.drain()
+            escritor.write(b"0\r\n\r\n")
+            await escritor.drain()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+def _escribir_trozo(escritor, datos):
+    if datos:
+        escritor.write(b"%x\r\n" % len(datos) + datos + b"\r\n")
+
+
+def servir(host="127.0.0.1", puerto=8765, unix=None, **opciones):
+    """Ejecuta el servicio hasta que se interrumpe (Ctrl+C)."""
+    async def principal():
+        servicio = ServicioPacientes(**opciones)
+        await servicio.iniciar(host, puerto, unix)
+        print(f"Sirviendo pacientes en {servicio.direccion}", flush=True)
+        try:
+            await servicio.servidor.serve_forever()
+        finally:
+            await servicio.cerrar()
+
+    try:
+        asyncio.run(principal())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m medicDataGenerator.servicio",
+        description="Servicio HTTP local que entrega pacientes sintéticos en NDJSON o CSV.")
+    parser.add_argument("--host", default="127.0.0.1", help="por defecto 127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="por defecto 8765")
+    parser.add_argument("--unix", default=None, help="ruta de un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos de generación (por defecto uno por CPU)")
+    parser.add_argument("--batch-size", type=int, default=20000,
+                        help="filas por lote (por defecto 20000)")
+    args = parser.parse_args(argv)
+    if (args.workers is not None and args.workers < 1) or args.batch_size < 1:
+        parser.error("--workers y --batch-size deben ser >= 1")
+    servir(args.host, args.port, args.unix, trabajadores=args.workers,
+           tamano_lote=args.batch_size)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
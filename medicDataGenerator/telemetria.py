@@ -0,0 +1,168 @@
+"""
+Telemetría de la generación: tiempo y filas por etapa, progreso y memoria pico.
+
+    telemetria = Telemetria(progreso=lambda t: print(f"{t.filas_por_segundo:,.0f} filas/s"))
+    datos = generar_datos_pacientes(1_000_000, telemetria=telemetria)
+    guardar_en_csv(datos, telemetria=telemetria)
+    telemetria.metricas()["etapas"]["signos_vitales"]  # {"segundos": ..., "llamadas": ..., "filas": ...}
+
+Las funciones que aceptan telemetria (generar_columnas_pacientes,
+iterar_lotes_pacientes, generar_datos_pacientes, guardar_en_csv,
+escribir_csv, guardar_lotes, generar_en_paralelo) miden cada etapa una vez
+por lote y no por fila, así que el costo es de unos pocos microsegundos por
+lote. Con telemetria=None se usa un contexto nulo y no se mide nada.
+
+Cada lote generado llama a Telemetria.lote: actualiza las filas, la memoria
+pico del proceso, escribe una línea JSON en registro (si se dio un archivo)
+y llama a progreso(telemetria).
+
+Con varios procesos (generar_en_paralelo) memoria_pico es la del proceso
+principal y memoria_trabajadores la suma de los picos de los trabajadores
+combinados: una cota superior de la memoria que usaron a la vez, porque sus
+picos no tienen que coincidir.
+"""
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+_sin_medir = nullcontext()
+
+
+def _no_medir(etapa, filas=0):
+    return _sin_medir
+
+
+def medidor(telemetria):
+    """telemetria.medir, o una función equivalente que no mide nada si telemetria es None."""
+    return _no_medir if telemetria is None else telemetria.medir
+
+
+def memoria_pico():
+    """Memoria residente máxima del proceso en bytes (None si el sistema no la informa)."""
+    try:
+        import resource
+    except ImportError:
+        # resource no existe en Windows
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la da en KiB y macOS en bytes
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+class _Medicion:
+    __slots__ = ("telemetria", "etapa", "filas", "inicio")
+
+    def __init__(self, telemetria, etapa, filas):
+        self.telemetria, self.etapa, self.filas = telemetria, etapa, filas
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *excepcion):
+        self.telemetria.agregar(self.etapa, time.perf_counter() - self.inicio, self.filas)
+
+
+class Telemetria:
+    """
+    Tiempos acumulados por etapa y avance de una generación. progreso es
+    una función que recibe la telemetría después de cada lote; registro, un
+    archivo de texto en el que se escribe una línea JSON por lote (y una
+    final con terminar). memoria=False omite la medición de la memoria pico.
+    """
+
+    def __init__(self, progreso=None, registro=None, memoria=True):
+        self.progreso = progreso
+        self.registro = registro
+        self.memoria = memoria
+        self.etapas = {}
+        self.filas = 0
+        self.lotes = 0
+        self.memoria_pico = None
+        self.memoria_trabajadores = None
+        self.inicio = time.perf_counter()
+
+    def medir(self, etapa, filas=0):
+        """Contexto que suma a etapa el tiempo que tarda su bloque (y filas)."""
+        return _Medicion(self, etapa, filas)
+
+    def agregar(self, etapa, segundos, filas=0, llamadas=1):
+        acumulado = self.etapas.get(etapa)
+        if acumulado is None:
+            acumulado = self.etapas[etapa] = [0.0, 0, 0]
+        acumulado[0] += segundos
+        acumulado[1] += llamadas
+        acumulado[2] += filas
+
+    def lote(self, filas):
+        """Registra un lote terminado de filas filas."""
+        self.filas += filas
+        self.lotes += 1
+        if self.memoria:
+            self._actualizar_memoria(memoria_pico())
+        if self.registro is not None:
+            self._escribir({"evento": "lote", "filas_lote": filas, **self.metricas()})
+        if self.progreso is not None:
+            self.progreso(self)
+
+    def combinar(self, metricas):
+        """
+        Suma las etapas de otra telemetría (por ejemplo la de otro proceso),
+        dadas por metricas(), y su memoria pico a memoria_trabajadores.
+        """
+        for etapa, valores in metricas["etapas"].items():
+            self.agregar(etapa, valores["segundos"], valores["filas"], valores["llamadas"])
+        for pico in (metricas["memoria_pico"], metricas.get("memoria_trabajadores")):
+            if pico is not None:
+                self.memoria_trabajadores = (self.memoria_trabajadores or 0) + pico
+
+    def terminar(self):
+        """Escribe en registro la línea final con las métricas totales y las retorna."""
+        metricas = self.metricas()
+        if self.registro is not None:
+            self._escribir({"evento": "fin", **metricas})
+        return metricas
+
+    @property
+    def segundos(self):
+        return time.perf_counter() - self.inicio
+
+    @property
+    def filas_por_segundo(self):
+        segundos = self.segundos
+        return self.filas / segundos if segundos > 0 else 0.0
+
+    def metricas(self):
+        """Diccionario (serializable a JSON) con los totales y las etapas ordenadas por tiempo."""
+        segundos = self.segundos
+        etapas = sorted(self.etapas.items(), key=lambda etapa: -etapa[1][0])
+        return {
+            "filas": self.filas,
+            "lotes": self.lotes,
+            "segundos": round(segundos, 6),
+            "filas_por_segundo": round(self.filas / segundos, 1) if segundos > 0 else 0.0,
+            "memoria_pico": self.memoria_pico,
+            "memoria_trabajadores": self.memoria_trabajadores,
+            "etapas": {etapa: {"segundos": round(total, 6), "llamadas": llamadas, "filas": filas}
+                       for etapa, (total, llamadas, filas) in etapas},
+        }
+
+    def _actualizar_memoria(self, pico):
+        if pico is not None and (self.memoria_pico is None or pico > self.memoria_pico):
+            self.memoria_pico = pico
+
+    def _escribir(self, linea):
+        self.registro.write(json.dumps(linea, ensure_ascii=False) + "\n")
+        self.registro.flush()
+
+
+def lotes_medidos(lotes, telemetria, etapa):
+    """
+    Entrega los mismos lotes y suma a etapa el tiempo que quien los consume
+    tarda con cada uno (por ejemplo un escritor que no acepta telemetria).
+    """
+    for lote in lotes:
+        inicio = time.perf_counter()
+        yield lote
+        telemetria.agregar(etapa, time.perf_counter() - inicio,
+                           len(next(iter(lote.values()))) if lote else 0)
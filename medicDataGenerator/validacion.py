@@ -0,0 +1,234 @@
+"""
+Validación de las distribuciones generadas contra los valores de referencia.
+
+Compara un ResumenPacientes (ver resumen.py) con las constantes del
+generador: tipos de sangre contra probabilidades (chi-cuadrado), altura por
+género contra altura_por_genero (media y Kolmogorov-Smirnov), peso por rango
+de edad y género contra peso_por_edad_genero (medias) y prevalencia de
+fumadores y de consumo de alcohol por rango de edad y género (chi-cuadrado).
+Como trabaja sobre el resumen, el costo no depende del número de filas: con
+el resumen guardado junto al archivo no se leen los datos.
+
+    python -m medicDataGenerator.validacion consultas_pacientes.csv --alpha 0.001
+
+Las funciones de distribución (chi2_sf, normal_sf, ks_sf) están
+implementadas aquí para no depender de scipy.
+"""
+import argparse
+import json
+import math
+
+import numpy as np
+
+from medicDataGenerator.medicDataGenerator import tipos_sangre, probabilidades
+from medicDataGenerator.parametros import generos, altura_por_genero, tabla_parametros
+from medicDataGenerator.resumen import (
+    resumir_archivo, rango_edad_array, rangos_edad, generos_resumen, casillas, histogramas)
+
+alfa_por_defecto = 0.001
+
+
+# -----------------------------
+# Distribuciones
+# -----------------------------
+def _gamma_q(a, x):
+    """Función gamma incompleta superior regularizada Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        # Serie de P(a, x)
+        termino = suma = 1.0 / a
+        n = a
+        while abs(termino) > abs(suma) * 1e-15:
+            n += 1
+            termino *= x / n
+            suma += termino
+        return max(0.0, 1.0 - suma * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # Fracción continua de Q(a, x) (método de Lentz)
+    minimo = 1e-300
+    b = x + 1 - a
+    c = 1 / minimo
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = minimo if abs(d) < minimo else d
+        c = b + an / c
+        c = minimo if abs(c) < minimo else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+
+def chi2_sf(x, grados):
+    """P(X >= x) para X con distribución chi-cuadrado de grados grados de libertad."""
+    return _gamma_q(grados / 2, x / 2)
+
+
+def normal_sf(z):
+    """P(Z >= z) para una normal estándar."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def ks_sf(d, n):
+    """
+    P(D >= d) para el estadístico de Kolmogorov-Smirnov de n observaciones
+    (distribución asintótica con la corrección de Stephens).
+    """
+    if n <= 0 or d <= 0:
+        return 1.0
+    raiz = math.sqrt(n)
+    lam = (raiz + 0.12 + 0.11 / raiz) * d
+    if lam < 1.18:
+        # Forma que converge rápido para lam pequeño
+        x = math.exp(-math.pi ** 2 / (8 * lam ** 2))
+        p = math.sqrt(2 * math.pi) / lam * sum(x ** ((2 * k - 1) ** 2) for k in range(1, 6))
+        return min(1.0, max(0.0, 1 - p))
+    return min(1.0, max(0.0, 2 * sum((-1) ** (k - 1) * math.exp(-2 * k ** 2 * lam ** 2)
+                                     for k in range(1, 101))))
+
+
+def _resultado(prueba, columna, grupo, estadistico, p, alfa, **extra):
+    return {"prueba": prueba, "columna": columna, "grupo": grupo,
+            "estadistico": float(estadistico), "p": float(p), "aprobada": bool(p >= alfa),
+            **extra}
+
+
+# -----------------------------
+# Pruebas
+# -----------------------------
+def validar_tipos_sangre(resumen, alfa=alfa_por_defecto):
+    """Chi-cuadrado de bondad de ajuste de Tipo de Sangre contra probabilidades."""
+    observados = np.array([resumen.conteos["Tipo de Sangre"].get(t, 0) for t in tipos_sangre])
+    n = observados.sum()
+    otros = sum(resumen.conteos["Tipo de Sangre"].values()) - n
+    esperados = n * np.asarray(probabilidades) / np.sum(probabilidades)
+    estadistico = ((observados - esperados) ** 2 / esperados).sum() if n else 0.0
+    p = 0.0 if otros else chi2_sf(estadistico, len(tipos_sangre) - 1)
+    return [_resultado("chi2", "Tipo de Sangre", "todos", estadistico, p, alfa,
+                       grados=len(tipos_sangre) - 1, filas=int(n))]
+
+
+def validar_altura(resumen, alfa=alfa_por_defecto):
+    """Media (prueba z) y forma (Kolmogorov-Smirnov) de la altura de cada género."""
+    resultados = []
+    for genero, nombre in zip(generos_resumen, generos):
+        media, desv = altura_por_genero[nombre]
+        centros, conteos = resumen.histograma("Altura (cm)", genero)
+        n = conteos.sum()
+        if not n:
+            continue
+        n_medias = resumen.arreglos["n/Altura (cm)"][:, generos_resumen.index(genero)].sum()
+        suma = resumen.arreglos["suma/Altura (cm)"][:, generos_resumen.index(genero)].sum()
+        z = (suma / n_medias - media) / (desv / math.sqrt(n_medias))
+        resultados.append(_resultado("media", "Altura (cm)", nombre, z, 2 * normal_sf(abs(z)),
+                                     alfa, esperado=media, observado=suma / n_medias))
+        # Los datos están redondeados a la casilla: la CDF empírica se compara en sus bordes
+        ancho = histogramas["Altura (cm)"][2]
+        bordes = (centros + ancho / 2 - media) / (desv * math.sqrt(2))
+        teorica = 0.5 * (1 + np.array([math.erf(b) for b in bordes]))
+        d = np.abs(np.cumsum(conteos) / n - teorica).max()
+        resultados.append(_resultado("ks", "Altura (cm)", nombre, d, ks_sf(d, n), alfa,
+                                     filas=int(n)))
+    return resultados
+
+
+def _esperado_por_rango(resumen, parametro):
+    """
+    Suma de parametro[género, edad] sobre las filas de cada (rango de edad,
+    género), a partir del histograma de edades del resumen.
+    """
+    _, edades = casillas(*histogramas["Edad"])
+    por_edad = resumen.arreglos["hist/Edad"] * parametro[:, edades.astype(int)]
+    rangos = rango_edad_array(edades)
+    return np.array([por_edad[:, rangos == r].sum(axis=1) for r in range(len(rangos_edad))])
+
+
+def validar_peso(resumen, alfa=alfa_por_defecto):
+    """
+    Media del peso por rango de edad y género contra la esperada según
+    peso_por_edad_genero y las edades observadas (pruebas z), más una
+    chi-cuadrado que combina todos los grupos.
+    """
+    tabla = tabla_parametros()
+    n = resumen.arreglos["n/Peso (kg)"]
+    esperado = _esperado_por_rango(resumen, tabla["peso_media"])
+    varianza = _esperado_por_rango(resumen, tabla["peso_desv"] ** 2)
+    resultados, z_total = [], []
+    for r, rango in enumerate(rangos_edad):
+        for g, nombre in enumerate(generos):
+            if not n[r, g]:
+                continue
+            observado = resumen.arreglos["suma/Peso (kg)"][r, g] / n[r, g]
+            z = (observado - esperado[r, g] / n[r, g]) / (math.sqrt(varianza[r, g]) / n[r, g])
+            z_total.append(z)
+            resultados.append(_resultado("media", "Peso (kg)", f"{rango} {nombre}", z,
+                                         2 * normal_sf(abs(z)), alfa,
+                                         esperado=esperado[r, g] / n[r, g], observado=observado))
+    estadistico = float(np.sum(np.square(z_total)))
+    resultados.append(_resultado("chi2", "Peso (kg)", "todos", estadistico,
+                                 chi2_sf(estadistico, len(z_total)), alfa, grados=len(z_total)))
+    return resultados
+
+
+def validar_prevalencia(resumen, nombre, columna, parametro, alfa=alfa_por_defecto):
+    """
+    Chi-cuadrado de la cantidad de 'Sí' por rango de edad y género contra la
+    esperada según la probabilidad de cada (género, edad) de parametro.
+    """
+    prob = tabla_parametros()[parametro]
+    observados = resumen.arreglos[nombre]
+    esperados = _esperado_por_rango(resumen, prob)
+    varianzas = _esperado_por_rango(resumen, prob * (1 - prob))
+    con_varianza = varianzas > 0
+    imposibles = (~con_varianza & (observados != np.rint(esperados))).any()
+    estadistico = float((((observados - esperados) ** 2)[con_varianza]
+                         / varianzas[con_varianza]).sum())
+    grados = int(con_varianza.sum())
+    p = 0.0 if imposibles else chi2_sf(estadistico, grados)
+    return [_resultado("chi2", columna, "rango de edad y género", estadistico, p, alfa,
+                       grados=grados)]
+
+
+def validar_resumen(resumen, alfa=alfa_por_defecto):
+    """Ejecuta todas las pruebas; retorna la lista de resultados (diccionarios)."""
+    return (validar_tipos_sangre(resumen, alfa)
+            + validar_altura(resumen, alfa)
+            + validar_peso(resumen, alfa)
+            + validar_prevalencia(resumen, "fumadores", "Fumador", "prob_fumador", alfa)
+            + validar_prevalencia(resumen, "alcohol", "Consume Alcohol", "prob_alcohol", alfa))
+
+
+def validar_archivo(nombre_archivo, alfa=alfa_por_defecto, tamano_bloque=100000):
+    """Valida un archivo generado usando su resumen guardado o leyéndolo por bloques."""
+    return validar_resumen(resumir_archivo(nombre_archivo, tamano_bloque=tamano_bloque), alfa)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m medicDataGenerator.validacion",
+        description="Compara las distribuciones generadas con los valores de referencia.")
+    parser.add_argument("archivo", nargs="?", default="consultas_pacientes.csv")
+    parser.add_argument("--alpha", type=float, default=alfa_por_defecto,
+                        help="nivel de significancia de cada prueba (por defecto 0.001)")
+    parser.add_argument("--json", help="archivo donde guardar los resultados")
+    args = parser.parse_args(argv)
+
+    resultados = validar_archivo(args.archivo, args.alpha)
+    for r in resultados:
+        estado = "OK   " if r["aprobada"] else "FALLA"
+        print(f"{estado} {r['prueba']:<6}{r['columna']:<18}{r['grupo']:<36}"
+              f"{r['estadistico']:>12.4f}  p={r['p']:.4g}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+    return 0 if all(r["aprobada"] for r in resultados) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,287 @@
+from datetime import date
+
+import numpy as np
+
+from medicDataGenerator.medicDataGenerator import tipos_sangre, probabilidades, tipos_visita
+from medicDataGenerator.parametros import (
+    generos as nombres_generos, edad_maxima, ajuste_temperatura, rango_temperatura,
+    temperatura_minima, temperatura_maxima, picos_edad_ALL, tabla_parametros)
+from medicDataGenerator.evaluaciones import (
+    etiquetas_temperatura, etiquetas_fc, etiquetas_presion, evaluar_temperatura_array,
+    evaluar_frecuencia_cardiaca_array, evaluar_presion_arterial_array)
+from medicDataGenerator.nombres import generar_nombres
+from medicDataGenerator.identificadores import generar_uuids
+from medicDataGenerator.telemetria import medidor
+
+# Orden de las columnas, igual al de los diccionarios de generar_datos_pacientes
+columnas_pacientes = [
+    "ID Paciente", "Nombre", "Apellido", "Género", "Edad", "Altura (cm)",
+    "Peso (kg)", "Temperatura (°C)", "Evaluación Temperatura",
+    "Presión Sistólica", "Presión Diastólica", "Evaluación Presión",
+    "Frecuencia Cardíaca (lpm)", "Evaluación FC",
+    "Frecuencia Respiratoria (rpm)", "Tipo de Sangre", "Fumador",
+    "Consume Alcohol", "Edad de diagnóstico ALL (años)", "ID Consulta",
+    "Fecha de Consulta", "Tipo de Visita", "Próxima Cita"
+]
+
+# Los géneros se manejan como códigos: 0 = Masculino, 1 = Femenino
+generos = np.array(nombres_generos)
+si_no = np.array(["No", "Sí"])
+
+# Valores posibles de cada columna categórica, en el orden de sus códigos
+categorias_pacientes = {
+    "Género": generos,
+    "Evaluación Temperatura": etiquetas_temperatura,
+    "Evaluación Presión": etiquetas_presion,
+    "Evaluación FC": etiquetas_fc,
+    "Tipo de Sangre": np.array(tipos_sangre),
+    "Fumador": si_no,
+    "Consume Alcohol": si_no,
+    "Tipo de Visita": np.array(tipos_visita),
+}
+
+# Columnas numéricas; el resto son texto
+columnas_enteras = ["Edad", "Presión Sistólica", "Presión Diastólica",
+                    "Frecuencia Cardíaca (lpm)", "Frecuencia Respiratoria (rpm)"]
+columnas_reales = ["Altura (cm)", "Peso (kg)", "Temperatura (°C)",
+                   "Edad de diagnóstico ALL (años)"]
+
+# Columnas de fecha: se generan como np.datetime64[D] y se pasan a texto ISO
+# (AAAA-MM-DD) solo al escribir en CSV o al entregar filas como diccionarios
+columnas_fecha = ["Fecha de Consulta", "Próxima Cita"]
+
+# Las consultas caen en los últimos 6 meses (como '-6M' de Faker)
+dias_ventana_consulta = 182
+
+
+def codificar_categoria(valores, categorias):
+    """Códigos (posiciones en categorias) de un arreglo de valores categóricos."""
+    valores = np.asarray(valores).astype(str)
+    orden = np.argsort(categorias)
+    posiciones = np.minimum(np.searchsorted(categorias[orden], valores), len(categorias) - 1)
+    codigos = orden[posiciones]
+    if not (categorias[codigos] == valores).all():
+        raise ValueError(f"valores fuera de las categorías {categorias.tolist()}")
+    return codigos.astype(np.int8)
+
+
+def dia_referencia(fecha=None):
+    """
+    Fecha de referencia como np.datetime64[D]. Acepta None (hoy), un
+    datetime.date, un texto 'AAAA-MM-DD' o un np.datetime64.
+    """
+    if fecha is None:
+        fecha = date.today()
+    return np.datetime64(fecha, "D")
+
+
+def formatear_fechas(valores):
+    """Fechas (np.datetime64[D]) como textos ISO 'AAAA-MM-DD', sin recorrerlas fila a fila."""
+    return np.datetime_as_string(np.asarray(valores, dtype="datetime64[D]"), unit="D")
+
+
+def generar_fechas_consulta(n, rng, fecha_referencia=None):
+    """
+    Fechas de consulta en los últimos dias_ventana_consulta días antes de
+    fecha_referencia y próxima cita entre 7 y 60 días después de cada consulta,
+    calculadas con aritmética entera de días. Retorna (fechas, proximas).
+    """
+    dia = dia_referencia(fecha_referencia)
+    fechas = dia - rng.integers(0, dias_ventana_consulta + 1, size=n).astype("timedelta64[D]")
+    proximas = fechas + rng.integers(7, 61, size=n).astype("timedelta64[D]")
+    return fechas, proximas
+
+
+def _generador(rng):
+    """Acepta None, una semilla entera o un np.random.Generator."""
+    return np.random.default_rng(rng)
+
+
+def generar_generos(n, rng):
+    return rng.integers(0, 2, size=n)
+
+
+def generar_edades(n, rng):
+    return rng.integers(0, edad_maxima + 1, size=n)
+
+
+# Los parámetros que dependen de la edad y el género se leen de
+# parametros.tabla_parametros() con tabla[nombre][codigos_genero, edades].
+def generar_alturas(codigos_genero, rng):
+    tabla = tabla_parametros()
+    alturas = rng.normal(tabla["altura_media"][codigos_genero, 0],
+                         tabla["altura_desv"][codigos_genero, 0])
+    return np.round(alturas, 1)
+
+
+def generar_pesos(edades, codigos_genero, rng):
+    """Versión por lotes de peso_según_edad_genero."""
+    tabla = tabla_parametros()
+    pesos = rng.normal(tabla["peso_media"][codigos_genero, edades],
+                       tabla["peso_desv"][codigos_genero, edades])
+    return np.maximum(1, np.round(pesos, 1))
+
+
+def _entero_ajustado(tabla, nombre, indice, signo, rng):
+    """Entero uniforme en el rango de nombre, desplazado según la temperatura."""
+    ajuste = ajuste_temperatura[nombre] * signo
+    return rng.integers(tabla[nombre + "_min"][indice] + ajuste,
+                        tabla[nombre + "_max"][indice] + ajuste, endpoint=True)
+
+
+def generar_signos_vitales_lote(edades, rng, codigos_genero=None):
+    """Versión por lotes de generar_signos_vitales.
+
+    Retorna los arreglos (temperatura, sistólica, diastólica, fc, fr).
+    """
+    tabla = tabla_parametros()
+    n = len(edades)
+    if codigos_genero is None:
+        codigos_genero = np.zeros(n, dtype=np.intp)
+    indice = (codigos_genero, edades)
+    temp = np.round(rng.uniform(*rango_temperatura, size=n), 1)
+
+    # Factores de ajuste por temperatura: +1 si aumenta, -1 si baja
+    signo = np.where(temp > temperatura_maxima, 1, np.where(temp < temperatura_minima, -1, 0))
+
+    fc = _entero_ajustado(tabla, "fc", indice, signo, rng)
+    fr = _entero_ajustado(tabla, "fr", indice, signo, rng)
+    sistolica = _entero_ajustado(tabla, "sistolica", indice, signo, rng)
+    diastolica = _entero_ajustado(tabla, "diastolica", indice, signo, rng)
+
+    return temp, sistolica, diastolica, fc, fr
+
+
+def _asignar_si_no(edades, codigos_genero, probabilidad, rng):
+    prob = tabla_parametros()[probabilidad][codigos_genero, edades]
+    return si_no[(rng.random(len(edades)) < prob).astype(np.intp)]
+
+
+def asignar_fumador_lote(edades, codigos_genero, rng):
+    return _asignar_si_no(edades, codigos_genero, "prob_fumador", rng)
+
+
+def asignar_consumo_alcohol_lote(edades, codigos_genero, rng):
+    return _asignar_si_no(edades, codigos_genero, "prob_alcohol", rng)
+
+
+def edad_ALL_lote(n, rng, inicio=0):
+    """
+    Igual que edad_ALL pero con un generador explícito y compatible con lotes:
+    inicio es la posición del lote dentro del conjunto completo, de modo que la
+    suma de los lotes conserva exactamente la proporción 60/40 de edad_ALL.
+    """
+    (proporcion, media1, desv1), (_, media2, desv2) = picos_edad_ALL
+    # 60% en el primer pico (niños)
+    n1 = int((inicio + n) * proporcion) - int(inicio * proporcion)
+    edades = np.concatenate([rng.normal(media1, desv1, size=n1),
+                             rng.normal(media2, desv2, size=n - n1)])
+    edades = np.clip(edades, 0, edad_maxima)
+    rng.shuffle(edades)
+    return edades
+
+
+def generar_columnas_pacientes(num=100, rng=None, inicio=0, fecha_referencia=None,
+                               telemetria=None):
+    """
+    Genera los datos de num pacientes por columnas en lugar de fila a fila.
+    Retorna un diccionario {columna: np.ndarray} con las mismas columnas y
+    distribuciones que generar_datos_pacientes. inicio indica la posición del
+    lote cuando se genera por partes (ver iterar_lotes_pacientes).
+
+    Todo el azar sale de rng y las fechas (np.datetime64[D]) se cuentan hacia
+    atrás desde fecha_referencia (por defecto hoy), de modo que con una
+    semilla y una fecha fija la salida es reproducible. Con una telemetria
+    (ver telemetria.py) se mide el tiempo de cada etapa y el lote se cuenta
+    como terminado (telemetria.lote), así metricas() incluye sus filas.
+    """
+    lote = _columnas_pacientes(num, rng, inicio, fecha_referencia, telemetria)
+    if telemetria is not None:
+        telemetria.lote(num)
+    return lote
+
+
+def _columnas_pacientes(num, rng, inicio, fecha_referencia, telemetria):
+    # generar_columnas_pacientes sin marcar el lote como terminado, para
+    # que iterar_lotes_pacientes lo marque después de que se consuma
+    rng = _generador(rng)
+    medir = medidor(telemetria)
+
+    # Las etapas consumen rng siempre en el mismo orden
+    with medir("demografia", num):
+        codigos_genero = generar_generos(num, rng)
+        edades = generar_edades(num, rng)
+        alturas = generar_alturas(codigos_genero, rng)
+        pesos = generar_pesos(edades, codigos_genero, rng)
+    with medir("signos_vitales", num):
+        temp, sis, dias, fc, fr = generar_signos_vitales_lote(edades, rng, codigos_genero)
+    with medir("categorias", num):
+        tipo_sangre = np.asarray(tipos_sangre)[rng.choice(len(tipos_sangre), size=num,
+                                                          p=probabilidades)]
+        tipo_visita = np.asarray(tipos_visita)[rng.integers(0, len(tipos_visita), size=num)]
+    with medir("nombres", num):
+        nombres, apellidos = generar_nombres(codigos_genero, rng)
+    with medir("fechas", num):
+        fechas, proximas = generar_fechas_consulta(num, rng, fecha_referencia)
+    with medir("uuids", num):
+        id_paciente = generar_uuids(num, rng)
+    with medir("evaluaciones", num):
+        evaluacion_temperatura = etiquetas_temperatura[evaluar_temperatura_array(temp)]
+        evaluacion_presion = etiquetas_presion[evaluar_presion_arterial_array(sis, dias, edades)]
+        evaluacion_fc = etiquetas_fc[evaluar_frecuencia_cardiaca_array(fc, edades)]
+    with medir("habitos", num):
+        fumador = asignar_fumador_lote(edades, codigos_genero, rng)
+        alcohol = asignar_consumo_alcohol_lote(edades, codigos_genero, rng)
+    with medir("edad_ALL", num):
+        edad_all = np.round(edad_ALL_lote(num, rng, inicio), 1)
+    with medir("uuids", num):
+        id_consulta = generar_uuids(num, rng)
+
+    return {
+        "ID Paciente": id_paciente,
+        "Nombre": nombres,
+        "Apellido": apellidos,
+        "Género": generos[codigos_genero],
+        "Edad": edades,
+        "Altura (cm)": alturas,
+        "Peso (kg)": pesos,
+        "Temperatura (°C)": temp,
+        "Evaluación Temperatura": evaluacion_temperatura,
+        "Presión Sistólica": sis,
+        "Presión Diastólica": dias,
+        "Evaluación Presión": evaluacion_presion,
+        "Frecuencia Cardíaca (lpm)": fc,
+        "Evaluación FC": evaluacion_fc,
+        "Frecuencia Respiratoria (rpm)": fr,
+        "Tipo de Sangre": tipo_sangre,
+        "Fumador": fumador,
+        "Consume Alcohol": alcohol,
+        "Edad de diagnóstico ALL (años)": edad_all,
+        "ID Consulta": id_consulta,
+        "Fecha de Consulta": fechas,
+        "Tipo de Visita": tipo_visita,
+        "Próxima Cita": proximas,
+    }
+
+
+def iterar_lotes_pacientes(num=100, tamano_lote=100000, rng=None, inicio=0,
+                           fecha_referencia=None, telemetria=None):
+    """
+    Genera num pacientes en lotes de tamano_lote filas (el último puede ser
+    menor). Solo hay un lote en memoria a la vez, sin importar el valor de num.
+    inicio es la posición de la primera fila dentro del conjunto completo.
+    Con una telemetria cada lote se marca como terminado (telemetria.lote)
+    cuando quien lo consume pide el siguiente, así el progreso incluye, por
+    ejemplo, su escritura.
+    """
+    if tamano_lote <= 0:
+        raise ValueError("tamano_lote debe ser positivo")
+    rng = _generador(rng)
+    # La fecha se fija una vez para que todos los lotes usen el mismo día
+    fecha_referencia = dia_referencia(fecha_referencia)
+    for desplazamiento in range(0, num, tamano_lote):
+        filas = min(tamano_lote, num - desplazamiento)
+        yield _columnas_pacientes(filas, rng, inicio + desplazamiento, fecha_referencia,
+                                  telemetria)
+        if telemetria is not None:
+            telemetria.lote(filas)
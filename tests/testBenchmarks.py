@@ -0,0 +1,54 @@
+import unittest
+from benchmarks.suite import ejecutar_suite, comparar
+
+
+def ejecucion(**filas_por_segundo):
+    return {"resultados": [{"etapa": etapa, "filas": 1000, "filas_por_segundo": valor}
+                           for etapa, valor in filas_por_segundo.items()]}
+
+
+class TestSuiteBenchmarks(unittest.TestCase):
+    def test_resultados_por_etapa(self):
+        resultados = ejecutar_suite(["generar_uuids", "uuid.uuid4", "edad_ALL_lote"],
+                                    tamanos=[500], aislado=False)
+        self.assertEqual([(r["etapa"], r["filas"]) for r in resultados["resultados"]],
+                         [("generar_uuids", 500), ("uuid.uuid4", 500), ("edad_ALL_lote", 500)])
+        for r in resultados["resultados"]:
+            self.assertGreater(r["filas_por_segundo"], 0)
+            self.assertGreater(r["rss_pico_mb"], 0)
+
+    def test_lineas_base_fila_a_fila(self):
+        lineas_base = ["generar_signos_vitales", "peso_según_edad_genero", "edad_ALL",
+                       "Faker first_name/last_name"]
+        resultados = ejecutar_suite(lineas_base, tamanos=[200], aislado=False)
+        self.assertEqual([r["etapa"] for r in resultados["resultados"]], lineas_base)
+        self.assertTrue(all(r["filas_por_segundo"] > 0 for r in resultados["resultados"]))
+
+    def test_sobrecarga_telemetria(self):
+        resultado, = ejecutar_suite(["Telemetria"], tamanos=[2000], aislado=False)["resultados"]
+        self.assertGreater(resultado["filas_por_segundo"], 0)
+        self.assertIsInstance(resultado["sobrecarga"], float)
+        self.assertGreater(resultado["sobrecarga"], -1)
+
+    def test_regresion_de_sobrecarga(self):
+        referencia = ejecucion(Telemetria=1000.0)
+        actual = ejecucion(Telemetria=1000.0)
+        referencia["resultados"][0]["sobrecarga"] = 0.005
+        actual["resultados"][0]["sobrecarga"] = 0.04
+        regresiones = comparar(actual, referencia)
+        self.assertEqual([(r["etapa"], r["sobrecarga"]) for r in regresiones],
+                         [("Telemetria", 0.04)])
+        self.assertAlmostEqual(regresiones[0]["cambio"], 0.035)
+        self.assertEqual(comparar(actual, referencia, umbral_sobrecarga=0.05), [])
+
+    def test_regresion_sobre_umbral(self):
+        referencia = ejecucion(uuid=1000.0, edad_ALL=1000.0)
+        actual = ejecucion(uuid=850.0, edad_ALL=700.0, nueva=10.0)
+        regresiones = comparar(actual, referencia, umbral=0.2)
+        self.assertEqual([r["etapa"] for r in regresiones], ["edad_ALL"])
+        self.assertAlmostEqual(regresiones[0]["cambio"], -0.3)
+        self.assertEqual(comparar(actual, referencia, umbral=0.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
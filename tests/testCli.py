@@ -0,0 +1,121 @@
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from medicDataGenerator.__main__ import main
+
+# Tiempo máximo (segundos) permitido para importar el módulo generador
+PRESUPUESTO_IMPORTACION = 0.2
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestImportacion(unittest.TestCase):
+    def test_importacion_rapida_y_sin_efectos(self):
+        codigo = (
+            "import json, sys, time\n"
+            "t = time.perf_counter()\n"
+            "import medicDataGenerator.medicDataGenerator\n"
+            "t = time.perf_counter() - t\n"
+            "print(json.dumps({'tiempo': t, 'modulos': [m for m in ('numpy', 'faker') if m in sys.modules]}))\n"
+        )
+        with tempfile.TemporaryDirectory() as directorio:
+            salida = subprocess.run([sys.executable, "-c", codigo], cwd=directorio, check=True,
+                                    capture_output=True, text=True,
+                                    env=dict(os.environ, PYTHONPATH=RAIZ))
+            self.assertEqual(os.listdir(directorio), [])
+        resultado = json.loads(salida.stdout)
+        self.assertEqual(resultado["modulos"], [])
+        self.assertLess(resultado["tiempo"], PRESUPUESTO_IMPORTACION)
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ejecutar(self, *argumentos):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return main(list(argumentos))
+
+    def test_genera_archivo(self):
+        ruta = os.path.join(self.directorio.name, "salida.csv")
+        self.assertEqual(self.ejecutar("--rows", "50", "--out", ruta), 0)
+        with open(ruta, encoding='utf-8') as archivo:
+            self.assertEqual(len(archivo.readlines()), 51)
+
+    def test_semilla_reproducible(self):
+        rutas = [os.path.join(self.directorio.name, f"{i}.csv") for i in range(2)]
+        for ruta in rutas:
+            self.ejecutar("--rows", "40", "--seed", "7", "--workers", "2", "--out", ruta)
+        with open(rutas[0], 'rb') as a, open(rutas[1], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_semilla_reproducible_comprimida(self):
+        rutas = []
+        for i, hora in enumerate((1e9, 2e9)):
+            os.mkdir(os.path.join(self.directorio.name, str(i)))
+            rutas.append(os.path.join(self.directorio.name, str(i), "datos.csv.gz"))
+            # Otra hora en cada ejecución: no debe quedar en el encabezado gzip
+            with mock.patch("time.time", return_value=hora):
+                self.ejecutar("--rows", "40", "--seed", "7", "--reference-date", "2025-01-01",
+                              "--compression", "gzip", "--out", rutas[-1])
+        with open(rutas[0], 'rb') as a, open(rutas[1], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_fecha_de_referencia(self):
+        ruta = os.path.join(self.directorio.name, "fecha.csv")
+        self.ejecutar("--rows", "30", "--reference-date", "2024-02-29", "--out", ruta)
+        with open(ruta, encoding='utf-8') as archivo:
+            fechas = [fila["Fecha de Consulta"] for fila in csv.DictReader(archivo)]
+        self.assertTrue(all("2023-08-31" <= f <= "2024-02-29" for f in fechas))
+
+    def test_compresion(self):
+        actual = os.getcwd()
+        os.chdir(self.directorio.name)
+        self.addCleanup(os.chdir, actual)
+        self.ejecutar("--rows", "20", "--compression", "gzip")
+        with gzip.open("consultas_pacientes.csv.gz", "rt", encoding='utf-8') as archivo:
+            self.assertEqual(len(archivo.readlines()), 21)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.ejecutar("--format", "npz", "--compression", "gzip")
+
+    def test_especificacion(self):
+        especificacion = os.path.join(self.directorio.name, "spec.json")
+        with open(especificacion, "w", encoding='utf-8') as archivo:
+            json.dump({"columnas": [{"nombre": "Edad", "tipo": "entero", "min": 0, "max": 9}]},
+                      archivo)
+        ruta = os.path.join(self.directorio.name, "spec.csv")
+        self.ejecutar("--rows", "15", "--spec", especificacion, "--out", ruta)
+        with open(ruta, encoding='utf-8') as archivo:
+            self.assertEqual(archivo.readline().strip(), "Edad")
+            self.assertEqual(len(archivo.readlines()), 15)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.ejecutar("--spec", os.path.join(self.directorio.name, "no_existe.json"))
+
+    def test_metricas(self):
+        ruta = os.path.join(self.directorio.name, "m.csv")
+        metricas = os.path.join(self.directorio.name, "m.jsonl")
+        self.ejecutar("--rows", "250", "--batch-size", "100", "--out", ruta, "--metrics", metricas)
+        with open(metricas, encoding='utf-8') as archivo:
+            lineas = [json.loads(linea) for linea in archivo]
+        self.assertEqual([linea["evento"] for linea in lineas], ["lote"] * 3 + ["fin"])
+        self.assertEqual(lineas[-1]["filas"], 250)
+        self.assertIn("codificar", lineas[-1]["etapas"])
+
+    def test_argumentos_invalidos(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.ejecutar("--rows", "-1")
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self.ejecutar("--reference-date", "29/02/2024")
+
+
+if __name__ == '__main__':
+    unittest.main()
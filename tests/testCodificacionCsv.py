@@ -0,0 +1,138 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from medicDataGenerator.codificacion_csv import (
+    codificar_lote, codificar_ndjson, encabezado, columnas_desde_filas, escribir_csv, separar_extension,
+    ruta_fragmento, abrir_entrada)
+from medicDataGenerator.medicDataGenerator import generar_datos_pacientes, guardar_en_csv
+from medicDataGenerator.vectorizado import (
+    generar_columnas_pacientes, categorias_pacientes, codificar_categoria, formatear_fechas)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def con_csv_writer(columnas, filas=None):
+    """Lo que escribe csv.writer para el mismo lote (o las mismas filas)."""
+    texto = io.StringIO()
+    escritor = csv.writer(texto)
+    if filas is None:
+        valores = [formatear_fechas(v) if v.dtype.kind == "M" else v.tolist()
+                   for v in columnas.values()]
+        filas = zip(*valores)
+    escritor.writerows(filas)
+    return texto.getvalue().encode("utf-8")
+
+
+class TestCodificacionCsv(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.lote = generar_columnas_pacientes(3000, rng=2)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_igual_a_csv_writer(self):
+        self.assertEqual(codificar_lote(self.lote), con_csv_writer(self.lote))
+        # Con las columnas categóricas como códigos el resultado no cambia
+        codificado = {campo: codificar_categoria(valores, categorias_pacientes[campo])
+                      if campo in categorias_pacientes else valores
+                      for campo, valores in self.lote.items()}
+        self.assertEqual(codificar_lote(codificado, categorias=categorias_pacientes),
+                         con_csv_writer(self.lote))
+
+    def test_numeros(self):
+        lote = {"entero": np.array([0, -7, 123456789, -2 ** 63, 2 ** 62]),
+                "real": np.array([0.1, -2.5, 1e22, 1 / 3, -0.0, float("nan"), float("inf")]
+                                 + [1.0] * 3),
+                "redondeado": np.array([36.6, -0.0, 1e14, 0.0, 99.9]),
+                "booleano": np.array([True, False, True, False, True])}
+        for campo, valores in lote.items():
+            columna = {campo: valores}
+            self.assertEqual(codificar_lote(columna), con_csv_writer(columna), campo)
+        self.assertEqual(codificar_lote({"x": np.array([1.25, 2.0])}, decimales={"x": 1}),
+                         b"1.2\r\n2.0\r\n")
+
+    def test_comillas_y_utf8(self):
+        textos = np.array(["", "a,b", 'dijo "hola"', "línea\nnueva", "ñandú", "日本", "😀,x",
+                           "\r", "sin cambios"])
+        lote = {"texto": textos, "otro": np.arange(len(textos))}
+        self.assertEqual(codificar_lote(lote), con_csv_writer(lote))
+        # Un campo vacío solo en la fila se escribe como "" (igual que csv.writer)
+        solo = {"texto": textos}
+        self.assertEqual(codificar_lote(solo), con_csv_writer(solo))
+
+    def test_ndjson_igual_a_json_dumps(self):
+        lote = dict(self.lote, Texto=np.array(['dijo "hola"', "a\\b", "línea\nnueva", "\x01", "😀"] * 600),
+                    Booleano=np.arange(3000) % 2 == 0)
+        filas = zip(*[formatear_fechas(v) if v.dtype.kind == "M" else v.tolist()
+                      for v in lote.values()])
+        esperado = "".join(json.dumps(dict(zip(lote, fila)), ensure_ascii=False) + "\n"
+                           for fila in filas)
+        self.assertEqual(codificar_ndjson(lote), esperado.encode("utf-8"))
+
+    def test_filas_como_diccionarios(self):
+        datos = generar_datos_pacientes(500, rng=3)
+        filas = [dict(fila, Extra=None if i % 2 else i) for i, fila in enumerate(datos)]
+        campos = list(filas[0])
+        esperado = con_csv_writer(None, [[fila[c] for c in campos] for fila in filas])
+        self.assertEqual(codificar_lote(columnas_desde_filas(filas, campos)), esperado)
+
+    def test_guardar_en_csv_igual_a_dictwriter(self):
+        datos = generar_datos_pacientes(2500, rng=5)
+        filas = list(datos)
+        texto = io.StringIO()
+        escritor = csv.DictWriter(texto, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+        for nombre, entrada in (("registros.csv", datos), ("filas.csv", iter(filas))):
+            guardar_en_csv(entrada, self.ruta(nombre), resumen=False)
+            with open(self.ruta(nombre), 'rb') as archivo:
+                self.assertEqual(archivo.read(), texto.getvalue().encode("utf-8"), nombre)
+
+    def test_gzip_y_fragmentos(self):
+        lotes = [generar_columnas_pacientes(700, rng=i) for i in range(3)]
+        columnas = list(lotes[0])
+        esperado = encabezado(columnas) + b"".join(codificar_lote(lote) for lote in lotes)
+        huella = hashlib.sha256()
+        self.assertEqual(escribir_csv(iter(lotes), self.ruta("datos.csv.gz"), huella=huella), 2100)
+        with gzip.open(self.ruta("datos.csv.gz"), 'rb') as archivo:
+            self.assertEqual(archivo.read(), esperado)
+        # La huella es la de los bytes comprimidos que quedaron en el disco
+        with open(self.ruta("datos.csv.gz"), 'rb') as archivo:
+            self.assertEqual(huella.hexdigest(), hashlib.sha256(archivo.read()).hexdigest())
+
+        escribir_csv(iter(lotes), self.ruta("partes.csv"), fragmentos=3)
+        cuerpos = []
+        for i in range(3):
+            with open(ruta_fragmento(self.ruta("partes.csv"), i), 'rb') as archivo:
+                self.assertEqual(archivo.readline(), encabezado(columnas))
+                cuerpos.append(archivo.read())
+        self.assertEqual(sorted(b"".join(cuerpos).splitlines()),
+                         sorted(esperado.splitlines()[1:]))
+
+    @unittest.skipIf(zstandard is None, "requiere zstandard")
+    def test_zstd(self):
+        escribir_csv(iter([self.lote]), self.ruta("datos.csv.zst"))
+        with abrir_entrada(self.ruta("datos.csv.zst")) as archivo:
+            self.assertEqual(archivo.read(), encabezado(list(self.lote)) + codificar_lote(self.lote))
+
+    def test_extensiones(self):
+        self.assertEqual(separar_extension("a/datos.csv.gz"), ("a/datos", ".csv.gz"))
+        self.assertEqual(separar_extension("datos.csv"), ("datos", ".csv"))
+        self.assertEqual(ruta_fragmento("datos.csv.zst", 2), "datos.fragmento-0002.csv.zst")
+        with self.assertRaises(ValueError):
+            escribir_csv(iter([self.lote]), self.ruta("x.csv"), compresion="bz2")
+
+
+if __name__ == '__main__':
+    unittest.main()
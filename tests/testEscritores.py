@@ -0,0 +1,108 @@
+import csv
+import os
+import tempfile
+import unittest
+from datetime import date
+import numpy as np
+from medicDataGenerator.medicDataGenerator import generar_datos_pacientes, guardar_en_csv
+from medicDataGenerator.vectorizado import (
+    iterar_lotes_pacientes, generar_columnas_pacientes, columnas_pacientes)
+from medicDataGenerator.escritores import (
+    guardar_lotes_en_csv, guardar_lotes, leer_lotes)
+from medicDataGenerator.paralelo import generar_en_paralelo
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestEscritores(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_csv_por_lotes(self):
+        ruta = self.ruta("lotes.csv")
+        filas = guardar_lotes_en_csv(iterar_lotes_pacientes(250, tamano_lote=100, rng=1), ruta)
+        self.assertEqual(filas, 250)
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            lector = csv.reader(archivo)
+            self.assertEqual(next(lector), columnas_pacientes)
+            self.assertEqual(sum(1 for _ in lector), 250)
+
+    def test_csv_fechas_iso(self):
+        ruta = self.ruta("fechas.csv")
+        guardar_lotes_en_csv(iterar_lotes_pacientes(30, rng=4, fecha_referencia="2024-12-31"), ruta)
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            for fila in csv.DictReader(archivo):
+                consulta = date.fromisoformat(fila["Fecha de Consulta"])
+                self.assertLessEqual(consulta, date(2024, 12, 31))
+                self.assertGreater(date.fromisoformat(fila["Próxima Cita"]), consulta)
+
+    def test_mismo_encabezado_que_guardar_en_csv(self):
+        ruta_filas, ruta_lotes = self.ruta("filas.csv"), self.ruta("lotes.csv")
+        guardar_en_csv(generar_datos_pacientes(5), ruta_filas)
+        guardar_lotes_en_csv(iterar_lotes_pacientes(5, rng=2), ruta_lotes)
+        with open(ruta_filas, encoding='utf-8') as a, open(ruta_lotes, encoding='utf-8') as b:
+            self.assertEqual(a.readline(), b.readline())
+
+    def test_guardar_en_csv_acepta_generador(self):
+        ruta = self.ruta("generador.csv")
+        guardar_en_csv((paciente for paciente in generar_datos_pacientes(10)), ruta)
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            self.assertEqual(len(list(csv.DictReader(archivo))), 10)
+
+
+class TestFormatosBinarios(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.lotes = [generar_columnas_pacientes(120, rng=i, inicio=120 * i) for i in range(3)]
+
+    def ida_y_vuelta(self, formato, **opciones):
+        ruta = os.path.join(self.directorio.name, f"datos.{formato}")
+        self.assertEqual(guardar_lotes(iter(self.lotes), ruta, formato, **opciones), 360)
+        leidos = list(leer_lotes(ruta, formato))
+        for campo in columnas_pacientes:
+            esperado = np.concatenate([lote[campo] for lote in self.lotes])
+            obtenido = np.concatenate([lote[campo] for lote in leidos])
+            np.testing.assert_array_equal(obtenido, esperado, err_msg=campo)
+        return ruta
+
+    def test_npz(self):
+        ruta = self.ida_y_vuelta("npz")
+        with np.load(ruta) as archivo:
+            self.assertEqual(archivo["lote_000000/Género"].dtype, np.int8)
+            self.assertEqual(archivo["lote_000000/Fecha de Consulta"].dtype,
+                             np.dtype("datetime64[D]"))
+
+    @unittest.skipIf(pyarrow is None, "requiere pyarrow")
+    def test_parquet_grupos_y_diccionarios(self):
+        import pyarrow.parquet as pq
+        ruta = self.ida_y_vuelta("parquet", filas_por_grupo=100)
+        archivo = pq.ParquetFile(ruta)
+        self.assertEqual([archivo.metadata.row_group(i).num_rows
+                          for i in range(archivo.num_row_groups)], [100, 100, 100, 60])
+        self.assertTrue(pyarrow.types.is_dictionary(archivo.schema_arrow.field("Tipo de Sangre").type))
+        self.assertEqual(archivo.schema_arrow.field("Próxima Cita").type, pyarrow.date32())
+
+    @unittest.skipIf(pyarrow is None, "requiere pyarrow")
+    def test_arrow(self):
+        self.ida_y_vuelta("arrow", filas_por_grupo=50)
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            guardar_lotes([], os.path.join(self.directorio.name, "x"), "xlsx")
+
+    def test_union_de_partes_npz(self):
+        ruta = os.path.join(self.directorio.name, "paralelo.npz")
+        generar_en_paralelo(250, ruta, semilla=3, trabajadores=2, formato="npz")
+        self.assertEqual(sum(len(lote["Edad"]) for lote in leer_lotes(ruta, "npz")), 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from medicDataGenerator.especificacion import (
+    compilar, especificacion_pacientes, cargar_especificacion)
+from medicDataGenerator.vectorizado import columnas_pacientes
+from medicDataGenerator.parametros import tabla_parametros
+from medicDataGenerator.evaluaciones import (
+    etiquetas_temperatura, etiquetas_fc, etiquetas_presion, evaluar_temperatura_array,
+    evaluar_frecuencia_cardiaca_array, evaluar_presion_arterial_array)
+from medicDataGenerator.resumen import resumir_lotes
+from medicDataGenerator.validacion import validar_resumen
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class TestEspecificacion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.plan = compilar()
+        cls.datos = cls.plan.generar(20000, rng=3, fecha_referencia="2025-01-15")
+
+    def test_columnas_y_dependencias(self):
+        self.assertEqual(list(self.datos), columnas_pacientes)
+        orden = self.plan.orden
+        self.assertLess(orden.index("Género"), orden.index("Nombre"))
+        self.assertLess(orden.index("Temperatura (°C)"), orden.index("Frecuencia Cardíaca (lpm)"))
+
+    def test_evaluaciones_derivadas(self):
+        d = self.datos
+        np.testing.assert_array_equal(
+            d["Evaluación Temperatura"],
+            etiquetas_temperatura[evaluar_temperatura_array(d["Temperatura (°C)"])])
+        np.testing.assert_array_equal(
+            d["Evaluación FC"],
+            etiquetas_fc[evaluar_frecuencia_cardiaca_array(d["Frecuencia Cardíaca (lpm)"], d["Edad"])])
+        np.testing.assert_array_equal(
+            d["Evaluación Presión"],
+            etiquetas_presion[evaluar_presion_arterial_array(
+                d["Presión Sistólica"], d["Presión Diastólica"], d["Edad"])])
+
+    def test_signos_vitales_en_rango_ajustado(self):
+        d, tabla = self.datos, tabla_parametros()
+        signo = np.where(d["Temperatura (°C)"] > 37.5, 1, np.where(d["Temperatura (°C)"] < 36.0, -1, 0))
+        fc = d["Frecuencia Cardíaca (lpm)"]
+        self.assertTrue((fc >= tabla["fc_min"][0, d["Edad"]] + 10 * signo).all())
+        self.assertTrue((fc <= tabla["fc_max"][0, d["Edad"]] + 10 * signo).all())
+        self.assertTrue(((d["Próxima Cita"] - d["Fecha de Consulta"]).astype(int) >= 7).all())
+        self.assertTrue((d["Fecha de Consulta"] <= np.datetime64("2025-01-15")).all())
+
+    def test_distribuciones_de_referencia(self):
+        for resultado in validar_resumen(resumir_lotes([self.datos])):
+            self.assertTrue(resultado["aprobada"], resultado)
+
+    def test_reproducible_y_por_lotes(self):
+        a = self.plan.generar(100, rng=1, fecha_referencia="2025-01-15")
+        b = self.plan.generar(100, rng=1, fecha_referencia="2025-01-15")
+        for campo in a:
+            np.testing.assert_array_equal(a[campo], b[campo])
+        lotes = list(self.plan.iterar_lotes(250, tamano_lote=100, rng=1))
+        self.assertEqual([len(lote["Edad"]) for lote in lotes], [100, 100, 50])
+
+    def test_guardar_csv(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "spec.csv")
+            self.assertEqual(self.plan.guardar_csv(300, ruta, rng=2), 300)
+            with open(ruta, newline='', encoding='utf-8') as archivo:
+                filas = list(csv.DictReader(archivo))
+        self.assertEqual(len(filas), 300)
+        self.assertTrue({f["Género"] for f in filas} <= {"Masculino", "Femenino"})
+        self.assertEqual(len(filas[0]["ID Paciente"]), 36)
+
+    def test_archivos_json_y_yaml(self):
+        especificacion = especificacion_pacientes()
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "spec.json")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump(especificacion, archivo, ensure_ascii=False)
+            self.assertEqual(cargar_especificacion(ruta), especificacion)
+            if yaml is not None:
+                ruta = os.path.join(directorio, "spec.yaml")
+                with open(ruta, "w", encoding="utf-8") as archivo:
+                    yaml.safe_dump(especificacion, archivo, allow_unicode=True)
+                self.assertEqual(compilar(ruta).columnas, columnas_pacientes)
+
+    def test_especificacion_propia(self):
+        plan = compilar({"columnas": [
+            {"nombre": "Temperatura", "tipo": "uniforme", "min": 35, "max": 40, "decimales": 1},
+            {"nombre": "Grupo", "tipo": "categoria", "valores": ["a", "b", "c"],
+             "probabilidades": [0, 1, 1]},
+            {"nombre": "Valor", "tipo": "entero", "min": 0, "max": 0,
+             "ajustes": [{"si": {"o": [{"Grupo": "b"}, {"Temperatura": {">": 39}}]}, "suma": 1}]},
+            {"nombre": "Estado", "tipo": "clasificacion", "defecto": "bajo",
+             "reglas": [{"si": {"Valor": 1, "Grupo": ["b", "c"]}, "valor": "alto"}]},
+        ]})
+        d = plan.generar(2000, rng=0)
+        self.assertNotIn("a", d["Grupo"])
+        esperado = (d["Grupo"] == "b") | (d["Temperatura"] > 39)
+        np.testing.assert_array_equal(d["Valor"], esperado.astype(int))
+        np.testing.assert_array_equal(d["Estado"] == "alto", esperado)
+
+    def test_muchas_categorias(self):
+        valores = [f"v{i}" for i in range(300)]
+        plan = compilar({"columnas": [
+            {"nombre": "Valor", "tipo": "categoria", "valores": valores},
+            {"nombre": "Ponderado", "tipo": "categoria", "valores": valores,
+             "probabilidades": [1] * 300},
+            {"nombre": "Clase", "tipo": "clasificacion", "defecto": "v0",
+             "reglas": [{"si": {"Valor": v}, "valor": v} for v in valores]},
+        ]})
+        d = plan.generar(60000, rng=4)
+        for campo in ("Valor", "Ponderado", "Clase"):
+            self.assertEqual(set(d[campo]), set(valores), campo)
+        np.testing.assert_array_equal(d["Clase"], d["Valor"])
+        # Los códigos indexan bien la tabla de categorías del CSV
+        codificados = plan.generar(1000, rng=4, codificado=True)
+        np.testing.assert_array_equal(np.asarray(valores)[codificados["Valor"]],
+                                      plan.generar(1000, rng=4)["Valor"])
+
+    def test_especificaciones_invalidas(self):
+        invalidas = [
+            {},
+            {"columnas": [{"nombre": "x", "tipo": "desconocido"}]},
+            {"columnas": [{"nombre": "x", "tipo": "entero", "min": 0}]},
+            {"columnas": [{"nombre": "x", "tipo": "entero", "min": 0, "max": 1,
+                           "ajustes": [{"si": {"y": 1}, "suma": 1}]}]},
+            {"columnas": [{"nombre": "x", "tipo": "entero", "min": 0, "max": 1},
+                          {"nombre": "x", "tipo": "uuid"}]},
+            {"columnas": [{"nombre": "x", "tipo": "entero", "min": 0, "max": 1,
+                           "ajustes": [{"si": {"y": {">": 1}}, "suma": 1}]},
+                          {"nombre": "y", "tipo": "entero", "min": 0, "max": 1,
+                           "ajustes": [{"si": {"x": {"~": 1}}, "suma": 1}]}]},
+            {"columnas": [{"nombre": "x", "tipo": "entero", "min": 0, "max": 1,
+                           "ajustes": [{"si": {"y": {">": 1}}, "suma": 1}]},
+                          {"nombre": "y", "tipo": "entero", "min": 0, "max": 1,
+                           "ajustes": [{"si": {"x": {">": 1}}, "suma": 1}]}]},
+            {"columnas": [{"nombre": "g", "tipo": "categoria", "valores": ["a"]},
+                          {"nombre": "n", "tipo": "nombre", "genero": "g"}]},
+        ]
+        for especificacion in invalidas:
+            with self.assertRaises(ValueError, msg=especificacion):
+                compilar(especificacion)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from medicDataGenerator.medicDataGenerator import (
+    evaluar_temperatura, evaluar_presion_arterial, evaluar_frecuencia_cardiaca)
+from medicDataGenerator.evaluaciones import (
+    etiquetas_temperatura, etiquetas_fc, etiquetas_presion, evaluar_temperatura_array,
+    evaluar_frecuencia_cardiaca_array, evaluar_presion_arterial_array)
+
+
+class TestEvaluacionesArray(unittest.TestCase):
+    """Las versiones por arreglos deben coincidir con las funciones escalares."""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 20000
+        # Edades enteras y fraccionarias, incluidos los límites exactos de cada rango
+        self.edades = np.concatenate([rng.integers(-1, 121, n), rng.uniform(-1, 120, n),
+                                      [0, 0.5, 1, 1.5, 5, 5.5, 12, 12.5, 18, 18.5]])
+        m = len(self.edades)
+        self.temp = np.round(rng.uniform(34, 41, m), 1)
+        self.fc = rng.integers(30, 200, m)
+        self.sis = rng.integers(50, 170, m)
+        self.dias = rng.integers(30, 110, m)
+
+    def test_temperatura(self):
+        esperado = [evaluar_temperatura(t) for t in self.temp.tolist()]
+        obtenido = etiquetas_temperatura[evaluar_temperatura_array(self.temp)]
+        self.assertEqual(obtenido.tolist(), esperado)
+
+    def test_frecuencia_cardiaca(self):
+        esperado = [evaluar_frecuencia_cardiaca(f, e)
+                    for f, e in zip(self.fc.tolist(), self.edades.tolist())]
+        obtenido = etiquetas_fc[evaluar_frecuencia_cardiaca_array(self.fc, self.edades)]
+        self.assertEqual(obtenido.tolist(), esperado)
+
+    def test_presion_arterial(self):
+        esperado = [evaluar_presion_arterial(s, d, e) for s, d, e
+                    in zip(self.sis.tolist(), self.dias.tolist(), self.edades.tolist())]
+        obtenido = etiquetas_presion[evaluar_presion_arterial_array(self.sis, self.dias, self.edades)]
+        self.assertEqual(obtenido.tolist(), esperado)
+
+    def test_escalares(self):
+        self.assertEqual(etiquetas_temperatura[evaluar_temperatura_array(39.5)], "Fiebre")
+        self.assertEqual(etiquetas_fc[evaluar_frecuencia_cardiaca_array(40, 30)], "Bradicardia")
+
+
+if __name__ == '__main__':
+    unittest.main()
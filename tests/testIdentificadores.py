@@ -0,0 +1,32 @@
+import unittest
+import uuid
+import numpy as np
+from medicDataGenerator.identificadores import generar_uuids, formatear_uuids
+
+
+class TestIdentificadores(unittest.TestCase):
+    def test_uuid_version_4(self):
+        for texto in generar_uuids(200):
+            valor = uuid.UUID(texto)
+            self.assertEqual(valor.version, 4)
+            self.assertEqual(valor.variant, uuid.RFC_4122)
+            self.assertEqual(str(valor), texto)
+
+    def test_unicos(self):
+        ids = generar_uuids(100000)
+        self.assertEqual(len(set(ids)), 100000)
+
+    def test_formato_igual_a_uuid(self):
+        datos = np.random.default_rng(1).integers(0, 256, size=(20, 16), dtype=np.uint8)
+        esperados = [str(uuid.UUID(bytes=bytes(fila))) for fila in datos]
+        self.assertEqual(formatear_uuids(datos).tolist(), esperados)
+
+    def test_modo_con_semilla(self):
+        a = generar_uuids(100, np.random.default_rng(5))
+        b = generar_uuids(100, np.random.default_rng(5))
+        np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(generar_uuids(100), generar_uuids(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
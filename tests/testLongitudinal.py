@@ -0,0 +1,158 @@
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+from collections import defaultdict
+from unittest import mock
+import numpy as np
+from medicDataGenerator.longitudinal import (
+    RegistroLongitudinal, anexar_consultas, campos_registro, main)
+from medicDataGenerator.resumen import cargar_resumen, resumir_archivo
+from medicDataGenerator.vectorizado import columnas_pacientes
+
+
+def leer(ruta):
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        lector = csv.reader(archivo)
+        encabezado = next(lector)
+        return encabezado, [dict(zip(encabezado, fila)) for fila in lector]
+
+
+class TestLongitudinal(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.registro = os.path.join(self.directorio.name, "registro")
+        self.csv = os.path.join(self.directorio.name, "consultas.csv")
+
+    def test_consultas_de_seguimiento(self):
+        primera = anexar_consultas(self.registro, self.csv, "2025-01-15", 20, semilla=1)
+        segunda = anexar_consultas(self.registro, self.csv, "2025-03-01", 20, semilla=1)
+        encabezado, filas = leer(self.csv)
+        self.assertEqual(encabezado, columnas_pacientes)
+        self.assertEqual(len(filas), primera + segunda)
+        self.assertEqual([f["Fecha de Consulta"] for f in filas],
+                         sorted(f["Fecha de Consulta"] for f in filas))
+
+        por_paciente = defaultdict(list)
+        for fila in filas:
+            por_paciente[fila["ID Paciente"]].append(fila)
+        registro = RegistroLongitudinal(self.registro)
+        self.assertEqual(len(registro), len(por_paciente))
+        self.assertEqual(registro.metadatos["consultas"], len(filas))
+        self.assertTrue(any(len(v) > 2 for v in por_paciente.values()))
+        for consultas in por_paciente.values():
+            # Cada próxima cita es la fecha de la consulta siguiente
+            for actual, siguiente in zip(consultas, consultas[1:]):
+                self.assertEqual(actual["Próxima Cita"], siguiente["Fecha de Consulta"])
+                self.assertEqual(siguiente["Tipo de Visita"], "Control")
+            self.assertGreater(consultas[-1]["Próxima Cita"], "2025-03-01")
+            for campo in ("Nombre", "Apellido", "Género", "Tipo de Sangre", "Fumador",
+                          "Consume Alcohol", "Edad de diagnóstico ALL (años)", "Altura (cm)"):
+                self.assertEqual(len({c[campo] for c in consultas}), 1, campo)
+
+    def test_solo_las_filas_nuevas(self):
+        anexar_consultas(self.registro, self.csv, "2025-01-15", 10, semilla=2)
+        registro = RegistroLongitudinal(self.registro)
+        antes = {campo: np.array(registro.columna(campo)) for campo in campos_registro}
+        # Sin días nuevos no se agrega nada
+        self.assertEqual(anexar_consultas(self.registro, self.csv, "2025-01-15", 10), 0)
+        anexar_consultas(self.registro, self.csv, "2025-01-20", 0, semilla=2)
+        registro = RegistroLongitudinal(self.registro)
+        self.assertEqual(len(registro), len(antes["id"]))
+        for campo in ("id", "genero", "anio_nacimiento", "nombre"):
+            np.testing.assert_array_equal(registro.columna(campo), antes[campo])
+        cambiaron = registro.columna("proxima_cita") != antes["proxima_cita"]
+        self.assertTrue((antes["proxima_cita"][cambiaron] <= np.datetime64("2025-01-20").astype(int)).all())
+        np.testing.assert_array_equal(registro.columna("visitas")[cambiaron],
+                                      antes["visitas"][cambiaron] + 1)
+
+    def test_reproducible(self):
+        otro = os.path.join(self.directorio.name, "otro")
+        copia = os.path.join(self.directorio.name, "copia.csv")
+        for registro, ruta in ((self.registro, self.csv), (otro, copia)):
+            anexar_consultas(registro, ruta, "2025-01-15", 5, semilla=3)
+            anexar_consultas(registro, ruta, "2025-02-15", 5, semilla=3)
+        with open(self.csv, 'rb') as a, open(copia, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_registro_interrumpido(self):
+        anexar_consultas(self.registro, self.csv, "2025-01-15", 5, semilla=4)
+        registro = RegistroLongitudinal(self.registro)
+        n = len(registro)
+        # Pacientes escritos sin llegar a registro.json: se descartan al agregar
+        registro.agregar({campo: np.array(registro.columna(campo)[:3]) for campo in campos_registro})
+        registro = RegistroLongitudinal(self.registro)
+        self.assertEqual(len(registro), n)
+        registro.agregar({campo: np.array(registro.columna(campo)[:2]) for campo in campos_registro})
+        registro.guardar()
+        self.assertEqual(os.path.getsize(os.path.join(self.registro, "id.bin")), 16 * (n + 2))
+
+    def test_resumen_actualizado(self):
+        anexar_consultas(self.registro, self.csv, "2025-01-15", 20, semilla=5)
+        anexar_consultas(self.registro, self.csv, "2025-02-15", 20, semilla=5)
+        guardado = cargar_resumen(self.csv, verificar=True)
+        self.assertIsNotNone(guardado)
+        leido = resumir_archivo(self.csv, usar_guardado=False)
+        self.assertEqual(guardado.filas, len(leer(self.csv)[1]))
+        self.assertEqual(guardado.conteos, leido.conteos)
+        for nombre, valores in leido.arreglos.items():
+            np.testing.assert_allclose(guardado.arreglos[nombre], valores, err_msg=nombre)
+
+    def test_anexar_no_relee_el_archivo(self):
+        for ruta in (self.csv, self.csv + ".gz"):
+            registro = os.path.join(self.directorio.name, "registro" + ruta[-3:])
+            anexar_consultas(registro, ruta, "2025-01-15", 20, semilla=7)
+            # Con el resumen vigente, la huella se extiende con los bytes agregados
+            with mock.patch("medicDataGenerator.resumen.huella_archivo") as releer, \
+                    mock.patch("medicDataGenerator.longitudinal.huella_archivo", releer):
+                anexar_consultas(registro, ruta, "2025-02-15", 20, semilla=7)
+                anexar_consultas(registro, ruta, "2025-03-15", 20, semilla=7)
+            releer.assert_not_called()
+            self.assertIsNotNone(cargar_resumen(ruta, verificar=True))
+            # Cambiar las filas anteriores invalida la huella encadenada
+            with open(ruta, "r+b") as archivo:
+                archivo.seek(100)
+                byte = archivo.read(1)
+                archivo.seek(100)
+                archivo.write(bytes([byte[0] ^ 1]))
+            self.assertIsNone(cargar_resumen(ruta, verificar=True))
+
+    def test_ejecucion_interrumpida(self):
+        anexar_consultas(self.registro, self.csv, "2025-01-15", 10, semilla=6)
+        with open(self.csv, 'rb') as archivo:
+            contenido = archivo.read()
+        registro = RegistroLongitudinal(self.registro)
+        antes = {campo: np.array(registro.columna(campo)) for campo in campos_registro}
+        # Falla después de escribir el CSV y las columnas, antes de registro.json
+        with mock.patch("medicDataGenerator.longitudinal.guardar_resumen",
+                        side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                anexar_consultas(self.registro, self.csv, "2025-02-15", 10, semilla=6)
+        self.assertGreater(os.path.getsize(self.csv), len(contenido))
+        registro = RegistroLongitudinal(self.registro)
+        self.assertEqual(registro.metadatos["ejecuciones"], 1)
+        with open(self.csv, 'rb') as archivo:
+            self.assertEqual(archivo.read(), contenido)
+        for campo, valores in antes.items():
+            np.testing.assert_array_equal(registro.columna(campo), valores, err_msg=campo)
+        # La ejecución repetida da lo mismo que si no se hubiera interrumpido
+        otro, copia = os.path.join(self.directorio.name, "otro"), self.csv + ".copia"
+        anexar_consultas(otro, copia, "2025-01-15", 10, semilla=6)
+        anexar_consultas(otro, copia, "2025-02-15", 10, semilla=6)
+        anexar_consultas(registro, self.csv, "2025-02-15", 10, semilla=6)
+        with open(self.csv, 'rb') as a, open(copia, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_cli(self):
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            self.assertEqual(main([self.registro, self.csv, "--until", "2025-01-15",
+                                   "--new-per-day", "3", "--seed", "1"]), 0)
+        self.assertIn("consultas agregadas", salida.getvalue())
+        self.assertGreater(len(leer(self.csv)[1]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
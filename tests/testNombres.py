@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from faker.providers.person.es_ES import Provider
+from medicDataGenerator.nombres import cargar_nombres, generar_nombres
+
+
+class TestNombres(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        entorno = mock.patch.dict(os.environ, {"MEDICDATAGENERATOR_CACHE": self.directorio.name})
+        entorno.start()
+        self.addCleanup(entorno.stop)
+        cargar_nombres.cache_clear()
+        self.addCleanup(cargar_nombres.cache_clear)
+
+    def test_nombres_segun_genero(self):
+        codigos = np.array([0, 1] * 500)
+        nombres, apellidos = generar_nombres(codigos, np.random.default_rng(1))
+        self.assertEqual(len(nombres), 1000)
+        self.assertTrue(set(nombres[codigos == 0]) <= set(Provider.first_names_male))
+        self.assertTrue(set(nombres[codigos == 1]) <= set(Provider.first_names_female))
+        self.assertTrue(set(apellidos) <= set(Provider.last_names))
+
+    def test_reproducible_con_semilla(self):
+        codigos = np.zeros(50, dtype=int)
+        a = generar_nombres(codigos, np.random.default_rng(2))
+        b = generar_nombres(codigos, np.random.default_rng(2))
+        np.testing.assert_array_equal(a[0], b[0])
+        np.testing.assert_array_equal(a[1], b[1])
+
+    def test_cache_en_disco(self):
+        cargar_nombres()
+        ruta = os.path.join(self.directorio.name, "nombres_es_ES.npz")
+        self.assertTrue(os.path.exists(ruta))
+        cargar_nombres.cache_clear()
+        with mock.patch("medicDataGenerator.nombres._leer_proveedor") as leer:
+            arreglos = cargar_nombres()
+        leer.assert_not_called()
+        self.assertEqual(len(arreglos["last_names"]), len(Provider.last_names))
+
+
+if __name__ == '__main__':
+    unittest.main()
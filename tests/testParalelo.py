@@ -0,0 +1,91 @@
+import csv
+import gzip
+import os
+import tempfile
+import unittest
+from datetime import date
+import numpy as np
+from medicDataGenerator.paralelo import generar_en_paralelo, dividir_filas
+from medicDataGenerator.resumen import cargar_resumen, resumir_archivo, ruta_resumen
+
+
+class TestGeneracionParalela(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.fecha = date(2025, 1, 15)
+
+    def generar(self, nombre, **kwargs):
+        ruta = os.path.join(self.directorio.name, nombre)
+        return generar_en_paralelo(300, ruta, fecha_referencia=self.fecha, **kwargs)
+
+    def leer_bytes(self, ruta):
+        with open(ruta, 'rb') as archivo:
+            return archivo.read()
+
+    def test_dividir_filas(self):
+        self.assertEqual(dividir_filas(10, 3), [(0, 4), (4, 3), (7, 3)])
+        self.assertEqual(sum(c for _, c in dividir_filas(1001, 7)), 1001)
+
+    def test_reproducible_byte_a_byte(self):
+        [a] = self.generar("a.csv", semilla=42, trabajadores=2, tamano_lote=64)
+        [b] = self.generar("b.csv", semilla=42, trabajadores=2, tamano_lote=64)
+        self.assertEqual(self.leer_bytes(a), self.leer_bytes(b))
+        [c] = self.generar("c.csv", semilla=43, trabajadores=2, tamano_lote=64)
+        self.assertNotEqual(self.leer_bytes(a), self.leer_bytes(c))
+
+    def test_muestras_independientes_por_parte(self):
+        partes = self.generar("m.csv", semilla=3, trabajadores=3, unir=False)
+        claves = [cargar_resumen(parte).muestra["clave"] for parte in partes]
+        # Cada parte sortea sus propias claves; con la misma semilla serían iguales
+        self.assertEqual(len({tuple(c[:20]) for c in claves}), 3)
+        for c in claves:
+            self.assertFalse(np.isin(c, np.concatenate([o for o in claves if o is not c])).any())
+
+    def test_partes_sin_unir(self):
+        partes = self.generar("p.csv", semilla=1, trabajadores=3, unir=False)
+        self.assertEqual(len(partes), 3)
+        filas = 0
+        for parte in partes:
+            with open(parte, newline='', encoding='utf-8') as archivo:
+                filas += len(list(csv.DictReader(archivo)))
+        self.assertEqual(filas, 300)
+
+    def test_union_un_solo_encabezado(self):
+        [ruta] = self.generar("u.csv", semilla=2, trabajadores=2)
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual(len(filas), 300)
+        self.assertEqual(len({fila["ID Paciente"] for fila in filas}), 300)
+        self.assertFalse(any(fila["ID Paciente"] == "ID Paciente" for fila in filas))
+
+    def test_resumen_de_la_union(self):
+        [ruta] = self.generar("r.csv", semilla=5, trabajadores=3)
+        self.assertEqual(sorted(os.listdir(self.directorio.name)), ["r.csv", "r.csv.resumen.json"])
+        guardado = cargar_resumen(ruta, verificar=True)
+        leido = resumir_archivo(ruta, usar_guardado=False)
+        self.assertEqual(guardado.filas, 300)
+        self.assertEqual(guardado.conteos, leido.conteos)
+        for nombre, valores in leido.arreglos.items():
+            np.testing.assert_allclose(guardado.arreglos[nombre], valores, err_msg=nombre)
+        parametros = {"filas": 300, "semilla": 5, "trabajadores": 3, "tamano_lote": 100000,
+                      "fecha_referencia": "2025-01-15", "formato": "csv", "opciones": {}}
+        self.assertIsNotNone(cargar_resumen(ruta, parametros))
+        self.assertIsNone(cargar_resumen(ruta, {**parametros, "semilla": 6}))
+
+    def test_union_comprimida(self):
+        [plano] = self.generar("z.csv", semilla=3, trabajadores=2)
+        [ruta] = self.generar("z.csv.gz", semilla=3, trabajadores=2, compresion="gzip")
+        self.assertEqual(sorted(os.listdir(self.directorio.name)),
+                         ["z.csv", "z.csv.gz", "z.csv.gz.resumen.json", "z.csv.resumen.json"])
+        with gzip.open(ruta, 'rb') as archivo:
+            self.assertEqual(archivo.read(), self.leer_bytes(plano))
+        self.assertEqual(resumir_archivo(ruta, usar_guardado=False).filas, 300)
+
+    def test_sin_resumen(self):
+        [ruta] = self.generar("s.csv", semilla=5, trabajadores=2, resumen=False)
+        self.assertFalse(os.path.exists(ruta_resumen(ruta)))
+
+
+if __name__ == '__main__':
+    unittest.main()
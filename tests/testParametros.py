@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+import numpy as np
+from medicDataGenerator import parametros
+from medicDataGenerator.medicDataGenerator import (
+    generar_signos_vitales, peso_según_edad_genero, asignar_fumador, asignar_consumo_alcohol,
+    evaluar_temperatura)
+from medicDataGenerator.parametros import (
+    tabla_parametros, generos, edad_maxima, ajuste_temperatura)
+
+
+class TestTablaParametros(unittest.TestCase):
+    """La tabla debe reproducir las reglas de las funciones escalares en cada (género, edad)."""
+
+    def setUp(self):
+        self.tabla = tabla_parametros()
+        self.casos = [(g, genero, edad) for g, genero in enumerate(generos)
+                      for edad in range(edad_maxima + 1)]
+
+    def test_forma_y_solo_lectura(self):
+        self.assertEqual(self.tabla["fc_min"].shape, (2, edad_maxima + 1))
+        with self.assertRaises(ValueError):
+            self.tabla["prob_fumador"][0, 20] = 1.0
+
+    def test_rangos_de_signos_vitales(self):
+        # Con randint devolviendo sus límites se obtienen los rangos exactos de cada regla
+        for temp, signo in ((36.5, 0), (38.0, 1), (35.5, -1)):
+            with mock.patch("random.uniform", return_value=temp), \
+                    mock.patch("random.randint", side_effect=lambda a, b: (a, b)):
+                for g, _, edad in self.casos:
+                    _, (sis, dias), fc, fr = generar_signos_vitales(edad, 0)
+                    for nombre, rango in (("fc", fc), ("fr", fr),
+                                          ("sistolica", sis), ("diastolica", dias)):
+                        ajuste = ajuste_temperatura[nombre] * signo
+                        esperado = (self.tabla[nombre + "_min"][g, edad] + ajuste,
+                                    self.tabla[nombre + "_max"][g, edad] + ajuste)
+                        self.assertEqual(rango, esperado, (nombre, edad, temp))
+
+    def test_peso(self):
+        # normal(media, desv) -> media * 1000 + desv permite recuperar ambos parámetros
+        with mock.patch("numpy.random.normal", side_effect=lambda m, d: m * 1000 + d):
+            for g, genero, edad in self.casos:
+                valor = peso_según_edad_genero(edad, genero)
+                media, desv = divmod(round(valor, 1), 1000)
+                self.assertEqual(media, self.tabla["peso_media"][g, edad])
+                self.assertAlmostEqual(desv, self.tabla["peso_desv"][g, edad])
+
+    def test_probabilidades(self):
+        for funcion, nombre in ((asignar_fumador, "prob_fumador"),
+                                (asignar_consumo_alcohol, "prob_alcohol")):
+            for g, genero, edad in self.casos:
+                prob = self.tabla[nombre][g, edad]
+                with mock.patch("random.random", return_value=prob):
+                    self.assertEqual(funcion(edad, genero), "No")
+                if prob > 0:
+                    with mock.patch("random.random", return_value=np.nextafter(prob, 0)):
+                        self.assertEqual(funcion(edad, genero), "Sí", (nombre, genero, edad))
+
+    def test_funciones_escalares_leen_parametros(self):
+        # Las funciones escalares no repiten los valores: un cambio en parametros las afecta
+        with mock.patch.object(parametros, "rango_temperatura", (38.0, 38.0)):
+            temp = generar_signos_vitales(30, 70)[0]
+        self.assertEqual((temp, evaluar_temperatura(temp)), (38.0, "Fiebre"))
+        with mock.patch.dict(parametros.prob_fumador_por_edad_genero,
+                             {"Masculino": [((0, edad_maxima), 1.0)]}):
+            self.assertEqual(asignar_fumador(5, "Masculino"), "Sí")
+
+
+# Resultados de las cadenas de if originales en edades no enteras y negativas:
+# (edad, rangos de fc, fr, sistólica y diastólica a 36.5 °C, probabilidad de
+# fumar de un hombre, probabilidad de consumir alcohol de una mujer)
+referencia_edades = [
+    (-1, (100, 160), (30, 60), (90, 110), (60, 70), 0, 0.01),
+    (0.5, (100, 160), (30, 60), (90, 110), (60, 70), 0, 0.01),
+    (1.5, (90, 140), (20, 40), (90, 110), (60, 70), 0, 0.01),
+    (5.5, (70, 120), (18, 30), (90, 110), (60, 70), 0, 0.01),
+    (11.5, (70, 120), (18, 30), (90, 110), (60, 70), 0, 0.01),
+    (12.5, (60, 100), (12, 20), (90, 110), (60, 70), 0.186, 0.29),
+    (17.5, (60, 100), (12, 20), (90, 110), (60, 70), 0.186, 0.01),
+    (24.5, (60, 100), (12, 20), (110, 130), (70, 85), 0.062, 0.01),
+    (39.5, (60, 100), (12, 20), (110, 130), (70, 85), 0.132, 0.58),
+    (44.5, (60, 100), (12, 20), (120, 150), (75, 95), 0.062, 0.01),
+    (64.5, (60, 100), (12, 20), (120, 150), (75, 95), 0.062, 0.01),
+    (100.5, (60, 100), (12, 20), (120, 150), (75, 95), 0.062, 0.35),
+]
+
+
+class TestEdadesNoEnteras(unittest.TestCase):
+    """Las funciones escalares conservan sus resultados fuera de las edades enteras 0..100."""
+
+    def test_signos_vitales(self):
+        with mock.patch("random.uniform", return_value=36.5), \
+                mock.patch("random.randint", side_effect=lambda a, b: (a, b)):
+            for edad, fc, fr, sis, dias, _, _ in referencia_edades:
+                self.assertEqual(generar_signos_vitales(edad, 0), (36.5, (sis, dias), fc, fr), edad)
+
+    def test_probabilidades(self):
+        for edad, *_, fumador, alcohol in referencia_edades:
+            for funcion, genero, prob in ((asignar_fumador, "Masculino", fumador),
+                                          (asignar_consumo_alcohol, "Femenino", alcohol)):
+                with mock.patch("random.random", return_value=prob):
+                    self.assertEqual(funcion(edad, genero), "No", (funcion.__name__, edad))
+                if prob > 0:
+                    with mock.patch("random.random", return_value=np.nextafter(prob, 0)):
+                        self.assertEqual(funcion(edad, genero), "Sí", (funcion.__name__, edad))
+
+
+if __name__ == '__main__':
+    unittest.main()
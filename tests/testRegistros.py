@@ -0,0 +1,55 @@
+import sys
+import unittest
+import numpy as np
+from medicDataGenerator.medicDataGenerator import generar_datos_pacientes
+from medicDataGenerator.vectorizado import generar_columnas_pacientes, columnas_pacientes
+from medicDataGenerator.registros import RegistrosPacientes
+
+
+def tamano_diccionarios(filas):
+    """Memoria aproximada de una lista de diccionarios (contenedores + valores)."""
+    total = sys.getsizeof(filas)
+    for fila in filas:
+        total += sys.getsizeof(fila) + sum(sys.getsizeof(v) for v in fila.values())
+    return total
+
+
+class TestRegistrosPacientes(unittest.TestCase):
+    def setUp(self):
+        self.columnas = generar_columnas_pacientes(3000, rng=9)
+        self.registros = RegistrosPacientes.desde_columnas(self.columnas)
+
+    def test_columnas_sin_perdida(self):
+        for campo in columnas_pacientes:
+            np.testing.assert_array_equal(self.registros.columna(campo), self.columnas[campo],
+                                          err_msg=campo)
+
+    def test_vista_de_diccionarios(self):
+        self.assertEqual(len(self.registros), 3000)
+        paciente = self.registros[-1]
+        self.assertEqual(list(paciente.keys()), columnas_pacientes)
+        self.assertIsInstance(paciente["Edad"], int)
+        self.assertIsInstance(paciente["Altura (cm)"], float)
+        self.assertIsInstance(paciente["Género"], str)
+        self.assertEqual(paciente["Fecha de Consulta"],
+                         str(self.columnas["Fecha de Consulta"][-1]))
+        self.assertEqual(paciente["ID Consulta"], self.columnas["ID Consulta"][-1])
+        self.assertEqual(paciente["Altura (cm)"], float(self.columnas["Altura (cm)"][-1]))
+        self.assertEqual(len(list(self.registros[10:20])), 10)
+        with self.assertRaises(IndexError):
+            self.registros[3000]
+
+    def test_memoria_por_fila(self):
+        filas = list(self.registros)
+        self.assertLess(self.registros.nbytes * 10, tamano_diccionarios(filas))
+
+    def test_generar_datos_pacientes(self):
+        datos = generar_datos_pacientes(50, rng=3)
+        self.assertIsInstance(datos, RegistrosPacientes)
+        self.assertEqual([p["ID Paciente"] for p in datos],
+                         [p["ID Paciente"] for p in generar_datos_pacientes(50, rng=3)])
+        self.assertEqual(len(generar_datos_pacientes(0)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from medicDataGenerator.vectorizado import iterar_lotes_pacientes
+from medicDataGenerator.escritores import guardar_lotes
+from medicDataGenerator.resumen import resumir_lotes
+
+try:
+    import matplotlib
+    import seaborn
+    from medicDataGenerator.reporte import generar_reporte, figuras, main
+except ImportError:
+    matplotlib = None
+
+
+@unittest.skipIf(matplotlib is None, "requiere matplotlib y seaborn")
+class TestReporte(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.imagenes = os.path.join(self.directorio.name, "images")
+        self.resumen = resumir_lotes(iterar_lotes_pacientes(2000, rng=1))
+
+    def test_todas_las_figuras_y_omision_sin_cambios(self):
+        resultado = generar_reporte(self.resumen, self.imagenes, ["png", "svg"], trabajadores=2)
+        self.assertEqual(len(resultado), 2 * len(figuras))
+        self.assertTrue(all(resultado.values()))
+        for ruta in resultado:
+            self.assertGreater(os.path.getsize(ruta), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.imagenes, "PesoEdad.svg")))
+
+        # Sin cambios en el resumen no se dibuja nada
+        self.assertFalse(any(generar_reporte(self.resumen, self.imagenes, ["png", "svg"]).values()))
+        # Con otro resumen solo cambian las figuras cuyas entradas cambiaron
+        otro = self.resumen.combinar(resumir_lotes(iterar_lotes_pacientes(10, rng=2)))
+        otro.conteos["Tipo de Sangre"] = self.resumen.conteos["Tipo de Sangre"]
+        resultado = generar_reporte(otro, self.imagenes, ["png"], trabajadores=1)
+        self.assertFalse(resultado[os.path.join(self.imagenes, "TipoSangre.png")])
+        self.assertTrue(resultado[os.path.join(self.imagenes, "AlturaGenero.png")])
+
+    def test_archivo_borrado_y_forzar(self):
+        generar_reporte(self.resumen, self.imagenes, trabajadores=1)
+        os.remove(os.path.join(self.imagenes, "Alcohol.png"))
+        resultado = generar_reporte(self.resumen, self.imagenes, trabajadores=1)
+        self.assertEqual([os.path.basename(r) for r, dibujada in resultado.items() if dibujada],
+                         ["Alcohol.png"])
+        self.assertTrue(all(generar_reporte(self.resumen, self.imagenes, trabajadores=1,
+                                            forzar=True).values()))
+
+    def test_cli(self):
+        datos = os.path.join(self.directorio.name, "datos.csv")
+        guardar_lotes(iterar_lotes_pacientes(300, rng=3), datos)
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            self.assertEqual(main([datos, "--out-dir", self.imagenes, "--workers", "1"]), 0)
+        self.assertIn(f"{len(figuras)} figuras generadas", salida.getvalue())
+        with self.assertRaises(ValueError):
+            generar_reporte(self.resumen, self.imagenes, ["jpg"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from medicDataGenerator.vectorizado import generar_columnas_pacientes, iterar_lotes_pacientes
+from medicDataGenerator.escritores import guardar_lotes
+from medicDataGenerator.resumen import (
+    ResumenPacientes, resumir_lotes, resumir_archivo, rango_edad_array, rangos_edad,
+    densidad_histograma, tamano_muestra, guardar_resumen, cargar_resumen, ruta_resumen)
+from medicDataGenerator.medicDataGenerator import generar_datos_pacientes, guardar_en_csv
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def iguales(a, b):
+    # Las sumas reales pueden diferir en el último bit según el orden de suma
+    return (a.conteos == b.conteos
+            and all(np.allclose(a.arreglos[k], b.arreglos[k], rtol=1e-12) for k in a.arreglos))
+
+
+class TestResumen(unittest.TestCase):
+    def setUp(self):
+        self.lotes = [generar_columnas_pacientes(700, rng=i, inicio=700 * i) for i in range(3)]
+        self.resumen = resumir_lotes(self.lotes)
+        self.columnas = {campo: np.concatenate([lote[campo] for lote in self.lotes])
+                         for campo in self.lotes[0]}
+
+    def test_rangos_de_edad(self):
+        # Mismos cortes que categorizar_edad: <=11, <=18, <=40, <=65, resto
+        np.testing.assert_array_equal(rango_edad_array([0, 11, 11.5, 18, 19, 40, 65, 66, 100]),
+                                      [0, 0, 1, 1, 2, 2, 3, 4, 4])
+
+    def test_conteos_y_medias(self):
+        self.assertEqual(self.resumen.filas, 2100)
+        self.assertEqual(self.resumen.conteos["Tipo de Sangre"]["O+"],
+                         (self.columnas["Tipo de Sangre"] == "O+").sum())
+        rangos = rango_edad_array(self.columnas["Edad"])
+        fc = self.columnas["Frecuencia Cardíaca (lpm)"]
+        esperado = [fc[rangos == r].mean() for r in range(len(rangos_edad))]
+        np.testing.assert_allclose(self.resumen.media_por_rango("Frecuencia Cardíaca (lpm)"), esperado)
+        mujeres = self.columnas["Género"] == "Femenino"
+        alcohol = self.columnas["Consume Alcohol"] == "Sí"
+        self.assertAlmostEqual(self.resumen.proporcion("alcohol")[2, 1],
+                               alcohol[mujeres & (rangos == 2)].mean())
+
+    def test_histogramas(self):
+        centros, conteos = self.resumen.histograma("Altura (cm)", "masculino")
+        self.assertEqual(conteos.sum(), (self.columnas["Género"] == "Masculino").sum())
+        # Con casillas de 0.1 cada altura cae exactamente en su centro
+        media = (centros * conteos).sum() / conteos.sum()
+        self.assertAlmostEqual(media, self.resumen.media_por_genero("Altura (cm)")[0])
+        self.assertEqual(self.resumen.arreglos["edad_fumadores"].sum(),
+                         (self.columnas["Fumador"] == "Sí").sum())
+        self.assertEqual(self.resumen.arreglos["peso_edad"].sum(), 2100)
+
+    def test_combinar_no_depende_de_la_particion(self):
+        partes = [resumir_lotes([lote]) for lote in self.lotes]
+        combinado = partes[0].combinar(partes[1]).combinar(partes[2])
+        self.assertTrue(iguales(combinado, self.resumen))
+        self.assertTrue(iguales(ResumenPacientes().combinar(self.resumen), self.resumen))
+
+    @unittest.skipIf(pd is None, "requiere pandas")
+    def test_archivo_csv_por_bloques(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "datos.csv")
+            guardar_lotes(iterar_lotes_pacientes(1500, rng=9), ruta)
+            por_bloques = resumir_archivo(ruta, tamano_bloque=400)
+            datos = pd.read_csv(ruta)
+        self.assertTrue(iguales(por_bloques, resumir_lotes(iterar_lotes_pacientes(1500, rng=9))))
+        self.assertAlmostEqual(por_bloques.media_por_rango("Presión Sistólica")[4],
+                               datos[datos["Edad"] > 65]["Presión Sistólica"].mean())
+
+    def test_densidad_igual_a_kde_directo(self):
+        rng = np.random.default_rng(1)
+        valores = np.round(rng.normal(50, 5, 1000))
+        conteos = np.bincount(valores.astype(int), minlength=101)
+        x, densidad = densidad_histograma(np.arange(101.0), conteos, ancho_banda=2.0)
+        directo = (np.exp(-0.5 * ((x[:, None] - valores[None, :]) / 2.0) ** 2).sum(axis=1)
+                   / (1000 * 2.0 * np.sqrt(2 * np.pi)))
+        np.testing.assert_allclose(densidad, directo, atol=1e-9)
+        self.assertAlmostEqual(densidad.sum() * (x[1] - x[0]), 1, places=4)
+        # La curva abarca los datos más 3 anchos de banda a cada lado
+        self.assertEqual((x[0], x[-1]), (valores.min() - 6, valores.max() + 6))
+
+    def test_muestra_de_tamano_fijo(self):
+        resumen = ResumenPacientes(tamano_muestra=500).actualizar(self.lotes[0])
+        self.assertEqual(len(resumen.muestra["Edad"]), 500)
+        self.assertTrue(np.isin(resumen.muestra["Peso (kg)"], self.lotes[0]["Peso (kg)"]).all())
+        self.assertEqual(len(self.resumen.muestra["Edad"]), min(2100, tamano_muestra))
+        # Combinar conserva las claves menores de ambas muestras
+        otro = ResumenPacientes(semilla=1, tamano_muestra=500).actualizar(self.lotes[1])
+        combinado = resumen.combinar(otro)
+        claves = np.sort(np.concatenate([resumen.muestra["clave"], otro.muestra["clave"]]))[:500]
+        np.testing.assert_array_equal(np.sort(combinado.muestra["clave"]), claves)
+
+    def test_combinar_en_distinto_orden(self):
+        # Cada parte se reconoce en la muestra por su edad
+        def parte(filas, edad, semilla):
+            lote = dict(generar_columnas_pacientes(filas, rng=semilla))
+            lote["Edad"] = np.full(filas, edad)
+            return ResumenPacientes(semilla, tamano_muestra=1200).actualizar(lote), lote
+
+        (a, _), (b, _), (c, _), (_, lote_d) = (parte(3000, 10, 0), parte(6000, 40, 1),
+                                               parte(9000, 70, 2), parte(6000, 95, 3))
+        combinados = [a.combinar(b).combinar(c), c.combinar(a).combinar(b),
+                      b.combinar(c.combinar(a))]
+        referencia = np.sort(combinados[0].muestra["clave"])
+        for combinado in combinados:
+            edades = combinado.muestra["Edad"]
+            np.testing.assert_array_equal(np.sort(combinado.muestra["clave"]), referencia)
+            for edad, proporcion in ((10, 1 / 6), (40, 2 / 6), (70, 3 / 6)):
+                self.assertAlmostEqual(np.mean(edades == edad), proporcion, delta=0.05)
+            # Las filas agregadas después tienen claves nuevas, no las de una parte
+            combinado.actualizar(lote_d)
+            claves = combinado.muestra["clave"]
+            self.assertEqual(len(np.unique(claves)), len(claves))
+            self.assertAlmostEqual(np.mean(combinado.muestra["Edad"] == 95), 1 / 4, delta=0.05)
+        self.assertEqual(a.combinar(b).semilla.entropy, b.combinar(a).semilla.entropy)
+
+    def test_resumen_guardado(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "datos.npz")
+            guardar_lotes(iter(self.lotes), ruta, "npz", parametros={"semilla": 1})
+            guardado = cargar_resumen(ruta)
+            self.assertTrue(iguales(guardado, self.resumen))
+            np.testing.assert_array_equal(guardado.muestra["Edad"], self.resumen.muestra["Edad"])
+            self.assertIsNone(cargar_resumen(ruta, {"semilla": 2}))
+            # Si el archivo cambia, el resumen deja de valer
+            guardar_lotes(iter(self.lotes[:1]), ruta, "npz", resumen=False)
+            self.assertIsNone(cargar_resumen(ruta))
+            self.assertEqual(resumir_archivo(ruta).filas, 700)
+
+    def test_resumen_de_guardar_en_csv(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "datos.csv")
+            datos = generar_datos_pacientes(25000, rng=4)
+            guardar_en_csv(datos, ruta)
+            self.assertTrue(os.path.exists(ruta_resumen(ruta)))
+            self.assertTrue(iguales(cargar_resumen(ruta, verificar=True),
+                                    resumir_lotes([datos.a_columnas()])))
+
+    def test_resumen_al_anexar(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta, otra = os.path.join(directorio, "datos.csv"), os.path.join(directorio, "lotes.csv")
+            primeros = generar_datos_pacientes(1500, rng=4)
+            siguientes = generar_datos_pacientes(900, rng=5)
+            guardar_en_csv(primeros, ruta)
+            guardar_en_csv(siguientes, ruta, anexar=True)
+            guardar_lotes(iter(self.lotes[:1]), otra)
+            guardar_lotes(iter(self.lotes[1:]), otra, anexar=True)
+            # El resumen guardado corresponde al archivo completo
+            self.assertTrue(iguales(cargar_resumen(ruta, verificar=True),
+                                    resumir_lotes([primeros.a_columnas(), siguientes.a_columnas()])))
+            self.assertTrue(iguales(cargar_resumen(otra, verificar=True), self.resumen))
+
+    def test_generos_no_reconocidos(self):
+        lote = dict(self.lotes[0])
+        lote["Género"] = np.where(np.arange(700) % 2 == 0, " MASCULINO ", "otro")
+        self.assertEqual(ResumenPacientes().actualizar(lote).filas, 350)
+
+
+if __name__ == '__main__':
+    unittest.main()
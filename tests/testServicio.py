@@ -0,0 +1,94 @@
+import asyncio
+import csv
+import http.client
+import io
+import json
+import socket
+import threading
+import unittest
+from medicDataGenerator.servicio import ServicioPacientes, dividir_lotes, leer_parametros, SolicitudInvalida
+from medicDataGenerator.vectorizado import columnas_pacientes
+
+
+class TestServicio(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # El servidor corre en su propio bucle de eventos, en otro hilo
+        cls.bucle = asyncio.new_event_loop()
+        cls.hilo = threading.Thread(target=cls.bucle.run_forever, daemon=True)
+        cls.hilo.start()
+        cls.servicio = ServicioPacientes(trabajadores=1, tamano_lote=700, primer_lote=50)
+        asyncio.run_coroutine_threadsafe(cls.servicio.iniciar(puerto=0), cls.bucle).result(60)
+        cls.puerto = cls.servicio.direccion[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.servicio.cerrar(), cls.bucle).result(60)
+        cls.bucle.call_soon_threadsafe(cls.bucle.stop)
+        cls.hilo.join()
+        cls.bucle.close()
+
+    def pedir(self, ruta, metodo="GET"):
+        conexion = http.client.HTTPConnection("127.0.0.1", self.puerto, timeout=60)
+        try:
+            conexion.request(metodo, ruta)
+            respuesta = conexion.getresponse()
+            return respuesta.status, respuesta.getheader("Content-Type"), respuesta.read()
+        finally:
+            conexion.close()
+
+    def test_ndjson(self):
+        estado, tipo, cuerpo = self.pedir("/pacientes?rows=1600&seed=4&date=2025-01-15")
+        self.assertEqual((estado, tipo), (200, "application/x-ndjson"))
+        filas = [json.loads(linea) for linea in cuerpo.decode("utf-8").splitlines()]
+        self.assertEqual(len(filas), 1600)
+        self.assertEqual(list(filas[0]), columnas_pacientes)
+        self.assertTrue(all(f["Fecha de Consulta"] <= "2025-01-15" for f in filas))
+        self.assertEqual(len({f["ID Paciente"] for f in filas}), 1600)
+
+    def test_csv_y_reproducible(self):
+        estado, tipo, cuerpo = self.pedir("/pacientes?rows=1000&seed=9&format=csv")
+        self.assertEqual(estado, 200)
+        self.assertTrue(tipo.startswith("text/csv"))
+        filas = list(csv.reader(io.StringIO(cuerpo.decode("utf-8"), newline='')))
+        self.assertEqual(filas[0], columnas_pacientes)
+        self.assertEqual(len(filas), 1001)
+        self.assertEqual(self.pedir("/pacientes?rows=1000&seed=9&format=csv")[2], cuerpo)
+        self.assertNotEqual(self.pedir("/pacientes?rows=1000&seed=10&format=csv")[2], cuerpo)
+        self.assertEqual(self.pedir("/pacientes?rows=0&format=csv")[2].splitlines(),
+                         [cuerpo.splitlines()[0]])
+
+    def test_errores(self):
+        self.assertEqual(self.pedir("/salud")[::2], (200, b"ok\n"))
+        self.assertEqual(self.pedir("/otra")[0], 404)
+        self.assertEqual(self.pedir("/pacientes", metodo="POST")[0], 405)
+        for consulta in ("rows=-1", "rows=x", "format=xml", "seed=-2", "date=ayer", "filas=3"):
+            self.assertEqual(self.pedir(f"/pacientes?{consulta}")[0], 400, consulta)
+
+    def test_linea_demasiado_larga(self):
+        largo = b"x" * 70000
+        for solicitud in (b"GET /pacientes?rows=1&" + largo + b" HTTP/1.1\r\n\r\n",
+                          b"GET /salud HTTP/1.1\r\nX-Largo: " + largo + b"\r\n\r\n"):
+            with socket.create_connection(("127.0.0.1", self.puerto), timeout=60) as conexion:
+                conexion.sendall(solicitud)
+                self.assertTrue(conexion.recv(4096).startswith(b"HTTP/1.1 400 Bad Request"))
+        self.assertEqual(self.pedir("/salud")[0], 200)
+
+    def test_cliente_que_se_desconecta(self):
+        with socket.create_connection(("127.0.0.1", self.puerto), timeout=60) as conexion:
+            conexion.sendall(b"GET /pacientes?rows=5000000 HTTP/1.1\r\nHost: x\r\n\r\n")
+            self.assertTrue(conexion.recv(4096).startswith(b"HTTP/1.1 200 OK"))
+        # El servidor sigue atendiendo a los demás
+        self.assertEqual(self.pedir("/pacientes?rows=10")[0], 200)
+
+    def test_parametros(self):
+        self.assertEqual(dividir_lotes(2500, 1000, 100),
+                         [(0, 100), (100, 1000), (1100, 1000), (2100, 400)])
+        self.assertEqual(dividir_lotes(0, 1000, 100), [])
+        self.assertEqual(leer_parametros("rows=5&format=csv")[:3], (5, None, "csv"))
+        with self.assertRaises(SolicitudInvalida):
+            leer_parametros("rows=1e9")
+
+
+if __name__ == '__main__':
+    unittest.main()
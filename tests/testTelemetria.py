@@ -0,0 +1,108 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from medicDataGenerator.telemetria import Telemetria, medidor, lotes_medidos
+from medicDataGenerator.medicDataGenerator import generar_datos_pacientes, guardar_en_csv
+from medicDataGenerator.vectorizado import generar_columnas_pacientes
+from medicDataGenerator.escritores import guardar_lotes
+from medicDataGenerator.paralelo import generar_en_paralelo
+
+etapas_generacion = {"demografia", "signos_vitales", "categorias", "nombres", "fechas", "uuids",
+                     "evaluaciones", "habitos", "edad_ALL"}
+
+
+class TestTelemetria(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_etapas_de_generacion(self):
+        avances = []
+        telemetria = Telemetria(progreso=lambda t: avances.append((t.filas, t.filas_por_segundo)))
+        datos = generar_datos_pacientes(250000, rng=1, telemetria=telemetria)
+        self.assertEqual(len(datos), 250000)
+        metricas = telemetria.metricas()
+        self.assertEqual((metricas["filas"], metricas["lotes"]), (250000, 3))
+        self.assertEqual(set(metricas["etapas"]), etapas_generacion)
+        self.assertEqual(metricas["etapas"]["uuids"]["llamadas"], 6)
+        self.assertEqual(metricas["etapas"]["nombres"]["filas"], 250000)
+        self.assertEqual([filas for filas, _ in avances], [100000, 200000, 250000])
+        self.assertTrue(all(velocidad > 0 for _, velocidad in avances))
+        self.assertGreater(metricas["memoria_pico"], 0)
+        # Las etapas están ordenadas de la más lenta a la más rápida
+        tiempos = [etapa["segundos"] for etapa in metricas["etapas"].values()]
+        self.assertEqual(tiempos, sorted(tiempos, reverse=True))
+        self.assertLessEqual(sum(tiempos), metricas["segundos"])
+
+    def test_mismo_resultado_con_y_sin_telemetria(self):
+        a = generar_columnas_pacientes(2000, rng=5, fecha_referencia="2025-01-15")
+        b = generar_columnas_pacientes(2000, rng=5, fecha_referencia="2025-01-15",
+                                       telemetria=Telemetria())
+        for campo in a:
+            np.testing.assert_array_equal(a[campo], b[campo])
+
+    def test_lote_directo_cuenta_filas(self):
+        telemetria = Telemetria()
+        generar_columnas_pacientes(2000, rng=5, telemetria=telemetria)
+        metricas = telemetria.metricas()
+        self.assertEqual((metricas["filas"], metricas["lotes"]), (2000, 1))
+        self.assertGreater(metricas["filas_por_segundo"], 0)
+
+    def test_escritura_y_registro(self):
+        registro = io.StringIO()
+        telemetria = Telemetria(registro=registro)
+        datos = generar_datos_pacientes(3000, rng=2, telemetria=telemetria)
+        guardar_en_csv(datos, self.ruta("datos.csv"), telemetria=telemetria)
+        guardar_lotes([generar_columnas_pacientes(500, rng=3)], self.ruta("datos.npz"), "npz",
+                      telemetria=telemetria)
+        etapas = telemetria.terminar()["etapas"]
+        for etapa in ("columnas", "resumen", "codificar", "escribir"):
+            self.assertIn(etapa, etapas)
+        self.assertEqual(etapas["codificar"]["filas"], 3000)
+        self.assertEqual(etapas["escribir"]["filas"], 3500)
+        lineas = [json.loads(linea) for linea in registro.getvalue().splitlines()]
+        self.assertEqual([linea["evento"] for linea in lineas], ["lote", "fin"])
+        self.assertEqual(lineas[0]["filas_lote"], 3000)
+        self.assertEqual(set(lineas[0]["etapas"]), etapas_generacion)
+
+    def test_varios_procesos(self):
+        avances = []
+        telemetria = Telemetria(progreso=lambda t: avances.append(t.filas))
+        generar_en_paralelo(3000, self.ruta("p.csv"), semilla=1, trabajadores=2, tamano_lote=1000,
+                            telemetria=telemetria)
+        metricas = telemetria.metricas()
+        self.assertEqual(avances, [1500, 3000])
+        self.assertEqual(metricas["etapas"]["signos_vitales"]["filas"], 3000)
+        self.assertEqual(metricas["etapas"]["codificar"]["llamadas"], 4)
+        self.assertIn("unir", metricas["etapas"])
+        # La memoria de los trabajadores se suma aparte de la del proceso principal
+        self.assertGreater(metricas["memoria_trabajadores"], 0)
+
+    def test_combinar_suma_memoria(self):
+        telemetria = Telemetria(memoria=False)
+        for pico in (100, 300):
+            telemetria.combinar({"etapas": {}, "memoria_pico": pico})
+        self.assertEqual((telemetria.memoria_pico, telemetria.memoria_trabajadores), (None, 400))
+
+    def test_sin_telemetria(self):
+        medir = medidor(None)
+        with medir("x", 10):
+            pass
+        telemetria = Telemetria(memoria=False)
+        with medidor(telemetria)("x", 10):
+            pass
+        self.assertEqual(telemetria.metricas()["etapas"]["x"]["filas"], 10)
+        self.assertIsNone(telemetria.metricas()["memoria_pico"])
+        lotes = list(lotes_medidos([{"a": np.zeros(4)}], telemetria, "y"))
+        self.assertEqual(len(lotes), 1)
+        self.assertEqual(telemetria.etapas["y"][2], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from medicDataGenerator.vectorizado import iterar_lotes_pacientes
+from medicDataGenerator.escritores import guardar_lotes
+from medicDataGenerator.resumen import resumir_lotes
+from medicDataGenerator.validacion import (
+    chi2_sf, normal_sf, ks_sf, validar_resumen, validar_tipos_sangre, validar_altura,
+    validar_peso, validar_prevalencia, main)
+
+
+class TestDistribuciones(unittest.TestCase):
+    def test_valores_criticos(self):
+        # Percentiles 95% de tablas de chi-cuadrado, normal y Kolmogorov
+        self.assertAlmostEqual(chi2_sf(3.841458820694124, 1), 0.05, places=12)
+        self.assertAlmostEqual(chi2_sf(18.307038053275146, 10), 0.05, places=12)
+        self.assertAlmostEqual(chi2_sf(124.34211340400407, 100), 0.05, places=10)
+        self.assertAlmostEqual(chi2_sf(0.0, 4), 1.0)
+        self.assertAlmostEqual(normal_sf(1.959963984540054), 0.025, places=12)
+        self.assertAlmostEqual(ks_sf(1.3580986393225505 / (1e6 ** 0.5 + 0.12 + 0.11 / 1e3), 1e6),
+                               0.05, places=6)
+        self.assertEqual(ks_sf(0, 100), 1.0)
+
+
+class TestValidacion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resumen = resumir_lotes(iterar_lotes_pacientes(200000, rng=11))
+
+    def copia(self):
+        return self.resumen.combinar(resumir_lotes([]))
+
+    def test_datos_generados_aprueban(self):
+        resultados = validar_resumen(self.resumen)
+        self.assertEqual({r["columna"] for r in resultados},
+                         {"Tipo de Sangre", "Altura (cm)", "Peso (kg)", "Fumador", "Consume Alcohol"})
+        self.assertTrue(all(r["aprobada"] for r in resultados),
+                        [r for r in resultados if not r["aprobada"]])
+
+    def test_tipos_de_sangre_alterados(self):
+        resumen = self.copia()
+        resumen.conteos["Tipo de Sangre"]["A+"] += 2000
+        self.assertFalse(validar_tipos_sangre(resumen)[0]["aprobada"])
+        resumen.conteos["Tipo de Sangre"]["Z+"] = 1
+        self.assertEqual(validar_tipos_sangre(resumen)[0]["p"], 0.0)
+
+    def test_altura_desplazada(self):
+        resumen = self.copia()
+        # Alturas femeninas 1 cm más altas
+        resumen.arreglos["hist/Altura (cm)"][1] = np.roll(resumen.arreglos["hist/Altura (cm)"][1], 10)
+        resumen.arreglos["suma/Altura (cm)"][:, 1] += resumen.arreglos["n/Altura (cm)"][:, 1]
+        fallidas = {(r["prueba"], r["grupo"]) for r in validar_altura(resumen) if not r["aprobada"]}
+        self.assertEqual(fallidas, {("media", "Femenino"), ("ks", "Femenino")})
+
+    def test_peso_y_prevalencias_alterados(self):
+        resumen = self.copia()
+        resumen.arreglos["suma/Peso (kg)"][3, 0] += 2 * resumen.arreglos["n/Peso (kg)"][3, 0]
+        self.assertFalse(validar_peso(resumen)[-1]["aprobada"])
+        resumen.arreglos["fumadores"][1, 1] += 300
+        self.assertFalse(validar_prevalencia(resumen, "fumadores", "Fumador", "prob_fumador")[0]["aprobada"])
+        # Menores de 12 años no pueden fumar
+        resumen.arreglos["fumadores"][0, 0] += 1
+        self.assertEqual(validar_prevalencia(resumen, "fumadores", "Fumador", "prob_fumador")[0]["p"], 0.0)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "datos.csv")
+            salida = os.path.join(directorio, "validacion.json")
+            guardar_lotes(iterar_lotes_pacientes(5000, rng=12), ruta)
+            with contextlib.redirect_stdout(io.StringIO()):
+                codigo = main([ruta, "--json", salida])
+            with open(salida, encoding="utf-8") as archivo:
+                resultados = json.load(archivo)
+        self.assertEqual(codigo, 0 if all(r["aprobada"] for r in resultados) else 1)
+        self.assertEqual(resultados[0]["columna"], "Tipo de Sangre")
+
+
+if __name__ == '__main__':
+    unittest.main()
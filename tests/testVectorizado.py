@@ -0,0 +1,90 @@
+import unittest
+from datetime import date
+import numpy as np
+from medicDataGenerator.medicDataGenerator import tipos_sangre
+from medicDataGenerator.vectorizado import (
+    generar_columnas_pacientes, generar_signos_vitales_lote, generar_pesos,
+    columnas_pacientes, iterar_lotes_pacientes, edad_ALL_lote, formatear_fechas)
+
+
+class TestColumnasPacientes(unittest.TestCase):
+    def test_columnas_y_rangos(self):
+        datos = generar_columnas_pacientes(500, rng=1)
+        self.assertEqual(list(datos.keys()), columnas_pacientes)
+        for columna in datos.values():
+            self.assertEqual(len(columna), 500)
+        self.assertTrue(set(datos["Género"]) <= {"Masculino", "Femenino"})
+        self.assertTrue(((datos["Edad"] >= 0) & (datos["Edad"] <= 100)).all())
+        self.assertTrue((datos["Peso (kg)"] >= 1).all())
+        self.assertTrue(((datos["Temperatura (°C)"] >= 35.1) & (datos["Temperatura (°C)"] <= 39.2)).all())
+        self.assertTrue(set(datos["Tipo de Sangre"]) <= set(tipos_sangre))
+        self.assertTrue(set(datos["Fumador"]) <= {"Sí", "No"})
+        self.assertTrue(set(datos["Consume Alcohol"]) <= {"Sí", "No"})
+        # Menores de 12 años nunca fuman
+        self.assertTrue((datos["Fumador"][datos["Edad"] < 12] == "No").all())
+
+    def test_distribuciones(self):
+        datos = generar_columnas_pacientes(20000, rng=2)
+        masculino = datos["Género"] == "Masculino"
+        self.assertAlmostEqual(datos["Altura (cm)"][masculino].mean(), 171, delta=0.5)
+        self.assertAlmostEqual(datos["Altura (cm)"][~masculino].mean(), 158, delta=0.5)
+        self.assertAlmostEqual((datos["Tipo de Sangre"] == "O+").mean(), 0.56, delta=0.02)
+        ninos = datos["Edad de diagnóstico ALL (años)"] < 20
+        self.assertAlmostEqual(ninos.mean(), 0.6, delta=0.01)
+
+    def test_signos_vitales_por_edad(self):
+        rng = np.random.default_rng(3)
+        edades = np.array([0] * 1000 + [30] * 1000)
+        temp, sis, dias, fc, fr = generar_signos_vitales_lote(edades, rng)
+        normal = (temp >= 36.0) & (temp <= 37.5)
+        bebes = normal & (edades == 0)
+        adultos = normal & (edades == 30)
+        self.assertTrue(((fc[bebes] >= 100) & (fc[bebes] <= 160)).all())
+        self.assertTrue(((fc[adultos] >= 60) & (fc[adultos] <= 100)).all())
+        self.assertTrue(((sis[adultos] >= 110) & (sis[adultos] <= 130)).all())
+        self.assertTrue(((fr[bebes] >= 30) & (fr[bebes] <= 60)).all())
+
+    def test_pesos_por_rango(self):
+        rng = np.random.default_rng(4)
+        edades = np.full(20000, 30)
+        pesos = generar_pesos(edades, np.zeros(20000, dtype=int), rng)
+        self.assertAlmostEqual(pesos.mean(), 72, delta=0.5)
+        pesos = generar_pesos(edades, np.ones(20000, dtype=int), rng)
+        self.assertAlmostEqual(pesos.mean(), 65, delta=0.5)
+
+
+class TestLotesPacientes(unittest.TestCase):
+    def test_tamano_lotes(self):
+        tamanos = [len(lote["Edad"]) for lote in iterar_lotes_pacientes(2500, tamano_lote=1000, rng=5)]
+        self.assertEqual(tamanos, [1000, 1000, 500])
+
+    def test_edad_ALL_por_lotes_conserva_proporcion(self):
+        rng = np.random.default_rng(6)
+        n, tamano = 1001, 77
+        edades = np.concatenate([edad_ALL_lote(min(tamano, n - i), rng, i)
+                                 for i in range(0, n, tamano)])
+        self.assertEqual(len(edades), n)
+        # Mismo número de casos en el pico infantil que edad_ALL(n)
+        self.assertEqual((edades < 20).sum(), int(n * 0.6))
+
+    def test_fechas(self):
+        referencia = date(2025, 3, 1)
+        datos = generar_columnas_pacientes(2000, rng=7, fecha_referencia=referencia)
+        fechas, proximas = datos["Fecha de Consulta"], datos["Próxima Cita"]
+        self.assertEqual(fechas.dtype, np.dtype("datetime64[D]"))
+        dias_atras = (np.datetime64(referencia) - fechas).astype(int)
+        self.assertTrue(((dias_atras >= 0) & (dias_atras <= 182)).all())
+        dias_cita = (proximas - fechas).astype(int)
+        self.assertEqual((dias_cita.min(), dias_cita.max()), (7, 60))
+        # La fecha de referencia admite texto ISO con el mismo resultado
+        otra = generar_columnas_pacientes(2000, rng=7, fecha_referencia="2025-03-01")
+        np.testing.assert_array_equal(otra["Fecha de Consulta"], fechas)
+        self.assertEqual(formatear_fechas(fechas[:1])[0], fechas[0].item().isoformat())
+
+    def test_tamano_lote_invalido(self):
+        with self.assertRaises(ValueError):
+            next(iterar_lotes_pacientes(10, tamano_lote=0))
+
+
+if __name__ == '__main__':
+    unittest.main()